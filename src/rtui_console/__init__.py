@@ -4,18 +4,7 @@ ROS2 Console Viewer - TUI version of rqt_console using Textual
 A professional terminal-based log viewer for ROS2 systems,
 designed with rtui-inspired interface patterns.
 """
-
-from .app import ConsoleApp
-from .events import LevelFilterChanged
-from .events import LogMessageSelected
-from .events import LogsCleared
-from .events import NodeSelected
-from .events import TestLogsGenerated
-from .events import TextFilterChanged
-from .models import LogLevel
-from .models import LogMessage
-from .ros_client import LogGenerator
-from .ros_client import ROS2Client
+import importlib
 
 __version__ = "1.0.0"
 __author__ = "ROS2 Console Viewer Team"
@@ -33,3 +22,32 @@ __all__ = [
     "ROS2Client",
     "LogGenerator",
 ]
+
+# Public names are imported on first access so that `import rtui_console`
+# (and the CLI entry point) does not pay for Textual and ROS2 up front
+_LAZY_IMPORTS = {
+    "ConsoleApp": ".app",
+    "LevelFilterChanged": ".events",
+    "LogMessageSelected": ".events",
+    "LogsCleared": ".events",
+    "NodeSelected": ".events",
+    "TestLogsGenerated": ".events",
+    "TextFilterChanged": ".events",
+    "LogLevel": ".models",
+    "LogMessage": ".models",
+    "LogGenerator": ".ros_client",
+    "ROS2Client": ".ros_client",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
@@ -0,0 +1,157 @@
+"""
+Multi-pattern alert triggers for ROS2 Console Viewer
+
+All watch patterns are compiled into one Aho-Corasick automaton, so each
+message is scanned once regardless of how many patterns are registered.
+"""
+from collections import deque
+import time
+from typing import Optional
+
+from .metrics import METRICS
+
+
+class AhoCorasick:
+    """Case-insensitive Aho-Corasick automaton over a set of literal patterns
+
+    Failure links are folded into the transition tables when the automaton
+    is built, so matching is a single dict lookup per character.
+    """
+
+    def __init__(self, patterns) -> None:
+        self.patterns = list(dict.fromkeys(p.lower() for p in patterns if p))
+        goto: list[dict] = [{}]
+        outputs: list[set] = [set()]
+
+        # Trie of all patterns
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for ch in pattern:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(index)
+
+        # Breadth-first: compute failure links and complete the transitions
+        fail = [0] * len(goto)
+        delta: list[dict] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            transitions = dict(delta[fail[state]])
+            for ch, next_state in goto[state].items():
+                transitions[ch] = next_state
+                fail[next_state] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(next_state)
+            delta[state] = transitions
+            outputs[state] |= outputs[fail[state]]
+
+        self._delta = delta
+        self._outputs = [frozenset(o) for o in outputs]
+
+    def search(self, text: str) -> set:
+        """Indexes of all patterns occurring in text"""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        found = set()
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found |= outputs[state]
+        return found
+
+
+class AlertRule:
+    """A watch pattern with its hit counter and notification state"""
+
+    def __init__(self, pattern: str, bell: bool = False) -> None:
+        self.pattern = pattern
+        self.bell = bell
+        self.hits = 0
+        self.last_notified = 0.0
+        self.suppressed = 0  # hits since the last notification
+
+
+class AlertManager:
+    """Registered alert rules evaluated once per message at ingest
+
+    Every hit is counted and pinned; notifications for a rule are limited
+    to one per ``rate_limit`` seconds, reporting how many were suppressed.
+    The automaton is rebuilt whenever the rules change, so ``matches`` can
+    be called from the receiving thread.
+    """
+
+    MAX_PINNED = 500
+
+    def __init__(self, patterns=(), rate_limit: float = 5.0) -> None:
+        self.rate_limit = rate_limit
+        self.rules: list[AlertRule] = []
+        self.pinned = deque(maxlen=self.MAX_PINNED)  # (rule, LogMessage)
+        self._automaton = AhoCorasick(())
+        self._hits_metric = METRICS.counter("alerts.hits")
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: str, bell: bool = False) -> Optional[AlertRule]:
+        """Register a pattern; returns None if empty or already registered"""
+        pattern = pattern.strip()
+        if not pattern or any(r.pattern.lower() == pattern.lower()
+                              for r in self.rules):
+            return None
+        rule = AlertRule(pattern, bell)
+        self._set_rules(self.rules + [rule])
+        return rule
+
+    def remove(self, pattern: str):
+        """Unregister a pattern"""
+        self._set_rules([r for r in self.rules if r.pattern != pattern])
+
+    def _set_rules(self, rules: list):
+        # Both replaced rather than mutated, so a reader on another thread
+        # sees either the old or the new automaton, never a half-built one
+        automaton = AhoCorasick(r.pattern for r in rules)
+        self.rules = rules
+        self._automaton = automaton
+
+    def matches(self, msg) -> bool:
+        """Whether any rule matches msg (safe from any thread)"""
+        automaton = self._automaton
+        return bool(automaton.patterns) and bool(automaton.search(msg.msg))
+
+    def scan(self, messages: list, now: Optional[float] = None) -> list:
+        """Match a batch of messages; returns (rule, message, suppressed)
+        for each notification that passes the rate limit"""
+        if not self.rules or not messages:
+            return []
+        # Rules are unique case-insensitively, so automaton pattern indexes
+        # line up with self.rules
+        search = self._automaton.search
+        rules = self.rules
+        now = time.monotonic() if now is None else now
+
+        notifications = []
+        for msg in messages:
+            for index in search(msg.msg):
+                rule = rules[index]
+                rule.hits += 1
+                self._hits_metric.inc()
+                self.pinned.append((rule, msg))
+                if now - rule.last_notified >= self.rate_limit:
+                    notifications.append((rule, msg, rule.suppressed))
+                    rule.last_notified = now
+                    rule.suppressed = 0
+                else:
+                    rule.suppressed += 1
+        return notifications
+
+    def clear_pinned(self):
+        """Drop pinned hits and reset counters"""
+        self.pinned.clear()
+        for rule in self.rules:
+            rule.hits = 0
+            rule.suppressed = 0
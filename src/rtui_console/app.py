@@ -1,8 +1,13 @@
 """
 Main application for ROS2 Console Viewer
 """
+from collections import deque
 from datetime import datetime
+import itertools
+import os
 import queue
+import threading
+from typing import Optional
 
 from textual.app import App
 from textual.app import ComposeResult
@@ -12,20 +17,39 @@ from textual.containers import Vertical
 from textual.widgets import Footer
 from textual.widgets import Header
 
+from .alerts import AlertManager
+from .events import AggregateQuerySubmitted
+from .events import AggregateRowSelected
+from .events import FilterViewChanged
 from .events import LevelFilterChanged
 from .events import LogMessageSelected
 from .events import LogsCleared
 from .events import NodeSelected
+from .events import TemplateFilterChanged
 from .events import TestLogsGenerated
 from .events import TextFilterChanged
+from .events import TimeRangeChanged
+from .ingest import OverloadSampler
+from .ingest import RepeatCollapser
+from .metrics import METRICS
+from .metrics import StartupProfile
+from .profiles import Profile
+from .profiles import ProfileError
+from .stats import LogStatistics
+from .templates import TemplateMiner
+from .views import DEFAULT_VIEWS_FILE
 from .models import LogLevel
-from .ros_client import LogGenerator
 from .ros_client import ROS2Client
+from .widgets import AlertPanel
 from .widgets import FilterTabPanel
 from .widgets import LogDetailPanel
 from .widgets import LogLevelPanel
 from .widgets import LogTablePanel
+from .widgets import MetricsPanel
 from .widgets import NodeTreePanel
+from .widgets import QueryPanel
+from .widgets import StatsPanel
+from .widgets import TemplatePanel
 from .widgets import TextFilterPanel
 
 
@@ -79,6 +103,7 @@ class ConsoleApp(App):
     }
 
     LogDetailPanel {
+        width: 1fr;
         height: 100%;
         padding: 1 2;
     }
@@ -89,30 +114,94 @@ class ConsoleApp(App):
         Binding("c", "clear", "Clear", key_display="c"),
         Binding("p", "toggle_pause", "Pause/Resume", key_display="p"),
         Binding("t", "test_logs", "Test Logs", key_display="t"),
+        Binding("r", "toggle_collapse", "Collapse Repeats", key_display="r"),
+        Binding("s", "toggle_stats", "Stats", key_display="s"),
+        Binding("m", "toggle_metrics", "Metrics", key_display="m"),
+        Binding("o", "toggle_context_scope", "Context Scope", key_display="o"),
+        Binding("d", "toggle_details", "Details", key_display="d"),
+        Binding("P", "cycle_profile", "Profile", show=False),
         Binding("q", "quit", "Quit", key_display="q"),
     ]
 
-    def __init__(self):
+    def __init__(self, metrics_file: Optional[str] = None,
+                 metrics_interval: float = 5.0,
+                 startup_profile: Optional[StartupProfile] = None,
+                 alert_patterns=(), alert_rate_limit: float = 5.0,
+                 views_file: Optional[str] = None,
+                 snapshot_file: Optional[str] = None,
+                 snapshot_interval: float = 0.0,
+                 broker_address: Optional[str] = None,
+                 profile: Optional[Profile] = None,
+                 profiles_file: Optional[str] = None):
         super().__init__()
-        self.log_queue = queue.Queue(maxsize=10000)
+        self.profile = profile or Profile()
+        self.profiles_file = profiles_file
+        self.log_queue = queue.Queue(maxsize=self.profile.queue_size)
         self.paused = False
-
-        # ROS2 client
-        self.ros_client = ROS2Client(self.log_queue)
+        # Messages received while paused, shown on resume
+        self._paused_backlog = deque(maxlen=self.log_queue.maxsize)
+        self.startup_profile = startup_profile
+        self.broker_address = broker_address
+        self.views_file = views_file or DEFAULT_VIEWS_FILE
+        # Session snapshot; None disables restoring and writing
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self._snapshot_thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self.metrics = METRICS
+        self.metrics_file = metrics_file
+        self.metrics_interval = metrics_interval
+        self._processed = self.metrics.counter("ingest.processed")
+        self._queue_depth = self.metrics.gauge("ingest.queue_depth")
+        self._dropped = self.metrics.counter("ingest.dropped")
+
+        # Ingestion pipeline
+        self.statistics = LogStatistics()
+        self.template_miner = TemplateMiner()
+        self.repeat_collapser = RepeatCollapser()
+        self.alert_manager = AlertManager(rate_limit=alert_rate_limit)
+        for pattern in alert_patterns:
+            self.alert_manager.add(pattern.lstrip("!"),
+                                   bell=pattern.startswith("!"))
+        # Alert matches are never sampled out, so every one is scanned
+        self.sampler = OverloadSampler(self.profile.sample_budget,
+                                       exempt=self.alert_manager.matches)
+
+        # ROS2 client, or a broker shared with other viewers
+        if broker_address:
+            from .broker import BrokerClient
+            self.ros_client = BrokerClient(self.log_queue, broker_address,
+                                           sampler=self.sampler)
+        else:
+            self.ros_client = ROS2Client(self.log_queue,
+                                         qos_depth=self.profile.qos_depth,
+                                         sampler=self.sampler)
 
         # UI Components
         self.node_tree_panel = NodeTreePanel(id="node_tree")
         self.log_level_panel = LogLevelPanel(id="log_level")
         self.text_filter_panel = TextFilterPanel(id="text_filter")
+        self.template_panel = TemplatePanel(id="templates")
         self.log_table_panel = LogTablePanel(id="log_table")
+        self.log_table_panel.apply_profile(self.profile)
         self.log_detail_panel = LogDetailPanel(id="log_detail")
+        self.log_detail_panel.context_provider = self.log_table_panel.get_context
+        self.stats_panel = StatsPanel(self.statistics, sampler=self.sampler,
+                                      id="stats")
+        self.metrics_panel = MetricsPanel(self.metrics, id="metrics")
+        self.alert_panel = AlertPanel(self.alert_manager, id="alerts")
+        self.query_panel = QueryPanel(id="query")
 
         # Create filter tab panel and set panels
         self.filter_tab_panel = FilterTabPanel(id="filter_tabs")
         self.filter_tab_panel.set_panels(
             self.node_tree_panel,
             self.log_level_panel,
-            self.text_filter_panel
+            self.text_filter_panel,
+            self.template_panel,
+            self.alert_panel,
+            self.query_panel
         )
 
     def compose(self) -> ComposeResult:
@@ -126,15 +215,31 @@ class ConsoleApp(App):
             with Horizontal(id="bottom_panel"):
                 yield self.filter_tab_panel
                 yield self.log_detail_panel
+                yield self.stats_panel
 
+        yield self.metrics_panel
         yield Footer()
 
     def on_mount(self) -> None:
         """Initialize the application"""
+        if self.startup_profile:
+            self.startup_profile.mark("mount")
+            self.call_after_refresh(self.startup_profile.mark, "first paint")
+
         # Check ROS2 environment
         self._check_ros_environment()
 
-        # Start ROS2 subscriber if available
+        # Saved filter views
+        self.log_table_panel.load_views(self.views_file)
+
+        # Previous session
+        if self.snapshot_file:
+            self._restore_snapshot()
+            if self.startup_profile:
+                self.startup_profile.mark("snapshot restored")
+
+        # Start ROS2 subscriber in the background; rclpy is imported there
+        # so the first frame is not blocked by the middleware
         if self.ros_client.is_available():
             success = self.ros_client.start_subscriber()
             if not success:
@@ -146,9 +251,19 @@ class ConsoleApp(App):
                 severity="warning",
                 timeout=10
             )
+        self._ros_status = None
+        self._poll_ros_status()
 
         # Start periodic update of UI
-        self.set_interval(0.1, self._update_logs)
+        self._update_timer = self.set_interval(self.profile.update_interval,
+                                               self._update_logs)
+        self.set_interval(0.5, self._poll_ros_status)
+        self.set_interval(1.0, self._update_metrics)
+        if self.metrics_file:
+            self.set_interval(self.metrics_interval, self._dump_metrics)
+        if self.snapshot_file and self.snapshot_interval > 0:
+            self.set_interval(self.snapshot_interval,
+                              self._write_snapshot_in_background)
 
     def _check_ros_environment(self):
         """Check ROS2 environment setup"""
@@ -158,37 +273,186 @@ class ConsoleApp(App):
         else:
             self.notify(message, severity="warning", timeout=5)
 
+    def _poll_ros_status(self):
+        """Show the ROS2 connection status once it changes"""
+        if self.ros_client.is_available():
+            status = self.ros_client.get_status()
+        else:
+            status = "Not available"
+        if status == self._ros_status:
+            return
+        self._ros_status = status
+        self.sub_title = f"ROS2: {status}"
+
+        if self.ros_client.connected:
+            self.notify("Connected to /rosout" if self.broker_address is None
+                        else f"Connected to broker {self.broker_address}",
+                        timeout=3)
+            if self.startup_profile:
+                for name, seconds in self.ros_client.timings.items():
+                    self.startup_profile.add(f"{name} (thread)", seconds)
+                self.startup_profile.mark("ros connected")
+        elif status.startswith("Error"):
+            self.notify(f"ROS2 {status}", severity="error")
+
     def _update_logs(self):
         """Update log display from queue"""
-        if self.paused:
-            return
+        self._queue_depth.set(self.log_queue.qsize())
 
         # Process new messages from queue
         new_messages = []
-        nodes = set()
 
         while True:
             try:
                 log_msg = self.log_queue.get_nowait()
                 new_messages.append(log_msg)
-                nodes.add(log_msg.name)
             except queue.Empty:
                 break
 
+        # Messages the sampler discarded still count in the statistics
+        discarded = self.sampler.drain()
+        if discarded:
+            self.statistics.add_discarded(discarded)
+
+        # Alerts fire at ingest, before pausing, collapsing or filtering
         if new_messages:
-            # Update node tree
-            all_nodes = set()
-            for msg in self.log_table_panel.log_messages + new_messages:
-                all_nodes.add(msg.name)
-            self.node_tree_panel.update_nodes(all_nodes)
+            self._check_alerts(new_messages)
+
+        if self.paused:
+            overflow = (len(self._paused_backlog) + len(new_messages)
+                        - self._paused_backlog.maxlen)
+            if overflow > 0:
+                self._dropped.inc(overflow)
+                # Evicted messages are discarded like sampled-out ones, so
+                # they reach the statistics with the next drain
+                self.sampler.discard(itertools.islice(
+                    itertools.chain(self._paused_backlog, new_messages), overflow))
+            self._paused_backlog.extend(new_messages)
+            return
+        if self._paused_backlog:
+            new_messages = list(self._paused_backlog) + new_messages
+            self._paused_backlog.clear()
+
+        if new_messages:
+            self._processed.inc(len(new_messages))
+            self._ingest(new_messages)
+
+    def _ingest(self, messages: list, now: Optional[float] = None):
+        """Run messages through the statistics, template and collapsing
+        stages into the store; ``now`` is their arrival time for the rates"""
+        self.statistics.add_batch(messages, now)
+        self.template_miner.process(messages)
+        new_rows = self.repeat_collapser.process(messages)
+
+        # Update node tree
+        all_nodes = set()
+        for msg in self.log_table_panel.log_messages + new_rows:
+            all_nodes.add(msg.name)
+        self.node_tree_panel.update_nodes(all_nodes)
+
+        # Add messages to table
+        self.log_table_panel.add_log_messages(new_rows)
+
+    def _check_alerts(self, messages: list):
+        """Match watch patterns and notify, subject to the rate limit"""
+        notifications = self.alert_manager.scan(messages)
+        for rule, msg, suppressed in notifications:
+            more = f" (+{suppressed} more)" if suppressed else ""
+            self.notify(f"{msg.name}: {msg.msg}{more}",
+                        title=f"Alert: {rule.pattern}",
+                        severity="error" if msg.level >= LogLevel.ERROR
+                        else "warning",
+                        markup=False)
+            if rule.bell:
+                self.bell()
+        if notifications and self.filter_tab_panel.current_tab == "alerts":
+            self.alert_panel.refresh_alerts()
+
+    def _update_metrics(self):
+        """Recompute metric rates and refresh the overlay"""
+        self.metrics.tick()
+        self.metrics_panel.refresh_metrics()
+        self.stats_panel.refresh_stats()
+        if self.filter_tab_panel.current_tab == "templates":
+            self.template_panel.update_templates(self.template_miner)
+        elif self.filter_tab_panel.current_tab == "alerts":
+            self.alert_panel.refresh_alerts()
+        elif (self.filter_tab_panel.current_tab == "query"
+                and self.query_panel.query_text):
+            self.run_aggregation(self.query_panel.query_text)
+
+    def _dump_metrics(self):
+        """Write the periodic metrics JSON file"""
+        try:
+            self.metrics.dump_json(self.metrics_file)
+        except OSError as e:
+            self.notify(f"Error writing metrics: {e}", severity="error")
+            self.metrics_file = None
+
+    def _snapshot_filters(self) -> dict:
+        """Filter state of the active view for the snapshot"""
+        view = self.log_table_panel.view
+        return {'view': view.name, **view.to_dict()}
+
+    def _restore_snapshot(self):
+        """Load the previous session's messages and filters"""
+        if not os.path.exists(os.path.expanduser(self.snapshot_file)):
+            return
+        from .snapshot import read_snapshot
+        from .snapshot import SnapshotError
+        try:
+            messages, filters = read_snapshot(
+                self.snapshot_file,
+                limit=self.log_table_panel.MAX_TOTAL_MESSAGES)
+        except (OSError, ValueError, SnapshotError) as e:
+            self.notify(f"Error restoring snapshot: {e}", severity="error")
+            return
+        if messages:
+            # Same stages as live messages; counted at their own time so
+            # they do not show up as a burst in the current rates
+            self._ingest(messages, now=messages[-1].last_seen.timestamp())
+        if filters:
+            try:
+                self.log_table_panel.restore_filters(filters.get('view'), filters)
+            except ValueError as e:
+                self.notify(f"Error restoring filters: {e}", severity="error")
+        self.notify(f"Restored {len(messages)} messages from the last session",
+                    timeout=3)
+
+    def _write_snapshot(self) -> bool:
+        """Write the store and filter state to the snapshot file"""
+        from .snapshot import write_snapshot
+        try:
+            write_snapshot(self.snapshot_file,
+                           list(self.log_table_panel.log_messages),
+                           self._snapshot_filters())
+        except OSError as e:
+            self.notify(f"Error writing snapshot: {e}", severity="error")
+            return False
+        return True
+
+    def _write_snapshot_in_background(self):
+        """Periodic snapshot; the store is copied here, written in a thread"""
+        if self._snapshot_thread and self._snapshot_thread.is_alive():
+            return
+        from .snapshot import write_snapshot
+        messages = list(self.log_table_panel.log_messages)
+        filters = self._snapshot_filters()
+
+        def write():
+            try:
+                write_snapshot(self.snapshot_file, messages, filters)
+            except OSError as e:
+                self.call_from_thread(
+                    self.notify, f"Error writing snapshot: {e}", severity="error")
 
-            # Add messages to table
-            for msg in new_messages:
-                self.log_table_panel.add_log_message(msg)
+        self._snapshot_thread = threading.Thread(target=write, daemon=True)
+        self._snapshot_thread.start()
 
     # Event Handlers (rtui pattern)
     def on_node_selected(self, event: NodeSelected) -> None:
-        """Handle node selection from tree"""
+        """Handle node selection from the tree or the stats panel"""
+        self.node_tree_panel.set_selection(event.node_names)
         self.log_table_panel.set_node_filter(event.node_names)
 
     def on_log_message_selected(self, event: LogMessageSelected) -> None:
@@ -204,6 +468,21 @@ class ConsoleApp(App):
         """Handle logs cleared event"""
         self.log_detail_panel.clear_details()
         self.node_tree_panel.update_nodes(set())
+        self.template_miner.reset_counts()
+        self.statistics.reset()
+        self.sampler.reset_counts()
+        self.stats_panel.clear_selection()
+        self.template_panel.clear_selection()
+        self.log_table_panel.set_template_filter(set())
+
+    def on_filter_view_changed(self, event: FilterViewChanged) -> None:
+        """Show the active view's filters in the filter editors"""
+        view = event.view
+        self.node_tree_panel.set_selection(view.nodes)
+        self.log_level_panel.set_selection(view.levels)
+        self.text_filter_panel.set_filters(
+            view.text, view.time_from, view.time_to)
+        self.template_panel.set_selection(view.templates)
 
     def on_test_logs_generated(self, event: TestLogsGenerated) -> None:
         """Handle test logs generated event"""
@@ -217,10 +496,69 @@ class ConsoleApp(App):
         """Handle text filter change"""
         self.log_table_panel.set_text_filter(event.text)
 
+    def on_time_range_changed(self, event: TimeRangeChanged) -> None:
+        """Handle time range filter change"""
+        self.log_table_panel.set_time_range(event.start, event.end)
+
+    def on_template_filter_changed(self, event: TemplateFilterChanged) -> None:
+        """Handle template filter change"""
+        self.log_table_panel.set_template_filter(event.template_ids)
+
+    def on_aggregate_query_submitted(self, event: AggregateQuerySubmitted) -> None:
+        """Run an aggregation query from the query panel"""
+        self.run_aggregation(event.text)
+
+    def run_aggregation(self, text: str):
+        """Run an aggregation query over the store and show the result"""
+        from .aggregate import parse_aggregation
+        from .aggregate import QueryError
+        try:
+            query = parse_aggregation(text)
+        except QueryError as e:
+            self.query_panel.show_error(str(e))
+            return
+        result = self.log_table_panel.aggregate(query, self._template_text)
+        self.query_panel.show_result(result)
+
+    def _template_text(self, template_id: int) -> str:
+        cluster = self.template_miner.get(template_id)
+        return cluster.template.text if cluster is not None else str(template_id)
+
+    def on_aggregate_row_selected(self, event: AggregateRowSelected) -> None:
+        """Filter the log table to an aggregation group"""
+        if event.column == "node":
+            self.node_tree_panel.set_selection([event.value])
+            self.log_table_panel.set_node_filter([event.value])
+        elif event.column == "level":
+            levels = [str(event.value)]
+            self.log_level_panel.set_selection(levels)
+            self.log_table_panel.set_level_filter(levels)
+        elif event.column == "template":
+            templates = {event.value} if event.value >= 0 else set()
+            self.template_panel.set_selection(templates)
+            self.log_table_panel.set_template_filter(templates)
+        elif event.column == "time":
+            # The time range filter includes its end
+            start, end = event.value
+            start = datetime.fromtimestamp(start).isoformat()
+            end = datetime.fromtimestamp(end - 0.001).isoformat()
+            self.text_filter_panel.set_filters(
+                self.log_table_panel.filter_text, start, end)
+            self.log_table_panel.set_time_range(start, end)
+
     # Actions (rtui pattern)
+    async def action_quit(self) -> None:
+        """Write the session snapshot and quit"""
+        if self.snapshot_file:
+            if self._snapshot_thread:
+                self._snapshot_thread.join()
+            self._write_snapshot()
+        self.exit()
+
     def action_clear(self) -> None:
         """Clear all logs"""
         self.log_table_panel.clear_logs()
+        self.repeat_collapser.reset()
         self.post_message(LogsCleared())
         self.notify("Logs cleared")
 
@@ -230,8 +568,61 @@ class ConsoleApp(App):
         status = "paused" if self.paused else "resumed"
         self.notify(f"Log reception {status}")
 
+    def action_toggle_collapse(self) -> None:
+        """Toggle folding of repeated messages"""
+        self.repeat_collapser.enabled = not self.repeat_collapser.enabled
+        self.repeat_collapser.reset()
+        status = "on" if self.repeat_collapser.enabled else "off"
+        self.notify(f"Repeat collapsing {status}")
+
+    def action_toggle_stats(self) -> None:
+        """Toggle the statistics panel"""
+        self.stats_panel.toggle()
+
+    def action_toggle_metrics(self) -> None:
+        """Toggle the metrics overlay"""
+        self.metrics_panel.toggle()
+
+    def action_toggle_details(self) -> None:
+        """Toggle the detail panel; hidden, it skips rendering and context lookups"""
+        self.log_detail_panel.toggle()
+
+    def action_toggle_context_scope(self) -> None:
+        """Toggle the detail context between the same node and all nodes"""
+        all_nodes = not self.log_detail_panel.context_all_nodes
+        self.log_detail_panel.set_context_scope(all_nodes)
+        scope = "all nodes" if all_nodes else "same node"
+        self.notify(f"Context: {scope}", timeout=2)
+
+    def action_cycle_profile(self) -> None:
+        """Switch to the next performance profile, applying live settings"""
+        from .profiles import available_profiles
+        try:
+            profiles = available_profiles(self.profiles_file)
+        except (OSError, ProfileError) as e:
+            self.notify(f"Error loading profiles: {e}", severity="error")
+            return
+        names = list(profiles)
+        index = names.index(self.profile.name) if self.profile.name in names else -1
+        self.apply_profile(profiles[names[(index + 1) % len(names)]])
+
+    def apply_profile(self, profile: Profile):
+        """Apply the live settings of a profile"""
+        pending = profile.restart_required(self.profile)
+        self.profile = profile
+        self.log_table_panel.apply_profile(profile)
+        self.sampler.budget = profile.sample_budget
+        self._update_timer.stop()
+        self._update_timer = self.set_interval(profile.update_interval,
+                                               self._update_logs)
+        message = f"Profile {profile.name}: {profile.summary()}"
+        if pending:
+            message += f" ({', '.join(pending)} after restart)"
+        self.notify(message, timeout=5)
+
     def action_test_logs(self) -> None:
         """Generate test logs"""
+        from .ros_client import LogGenerator
         count = LogGenerator.generate_test_logs(self.log_queue)
         self.post_message(TestLogsGenerated(count))
 
@@ -242,7 +633,10 @@ class ConsoleApp(App):
 
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                for msg in self.log_table_panel.filtered_messages:
+                messages = itertools.chain(
+                    self.log_table_panel.history_messages(),
+                    self.log_table_panel.filtered_messages)
+                for msg in messages:
                     level_name = LogLevel.NAMES.get(msg.level, "UNKNOWN")
                     f.write(
                         f"{msg.timestamp.isoformat()} [{level_name}] {msg.name}: {msg.msg}\n")
@@ -0,0 +1,265 @@
+"""
+Headless benchmark harness for ROS2 Console Viewer
+
+Drives ConsoleApp through Textual's headless pilot while a synthetic log
+storm is fed into its queue, and writes the results as JSON so runs of
+different versions can be compared:
+
+    python -m rtui_console.benchmark --rate 2000 --duration 10 -o bench.json
+    python -m rtui_console.benchmark --baseline bench.json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Optional
+
+from . import __version__
+from .app import ConsoleApp
+from .metrics import METRICS
+from .profiles import get_profile
+from .profiles import Profile
+from .synthetic import SHAPES
+from .synthetic import SyntheticLogGenerator
+from .templates import TemplateMiner
+from .views import FilterView
+
+
+def _percentile(values: list, q: float) -> float:
+    """Exact percentile (0-100) of a list of samples"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure_memory_per_message(generator: SyntheticLogGenerator,
+                               count: int = 20000) -> float:
+    """Average bytes retained per message after the ingestion stages"""
+    messages = generator.generate(10)  # warm up caches before tracing
+    tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        messages = generator.generate(count)
+        miner = TemplateMiner()
+        miner.process(messages)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del messages, miner
+    return (after - before) / count
+
+
+async def run_benchmark(generator: SyntheticLogGenerator,
+                        duration: float = 10.0,
+                        filter_query: str = "timeout",
+                        drain_timeout: float = 10.0,
+                        size: tuple = (160, 50),
+                        profile: Optional[Profile] = None) -> dict:
+    """Run one benchmark against a headless ConsoleApp"""
+    app = ConsoleApp(profile=profile)
+    frame_times = []
+    update_logs = app._update_logs
+
+    def timed_update_logs():
+        start = time.perf_counter()
+        update_logs()
+        frame_times.append(time.perf_counter() - start)
+
+    # set_interval picks this up in on_mount
+    app._update_logs = timed_update_logs
+
+    async with app.run_test(headless=True, size=size) as pilot:
+        METRICS.reset()
+        processed = METRICS.counter("ingest.processed")
+
+        # Ingest phase
+        start = time.perf_counter()
+        thread = generator.start(app.log_queue, duration, sampler=app.sampler)
+        while thread.is_alive():
+            await asyncio.sleep(0.05)
+        feed_elapsed = time.perf_counter() - start
+
+        # Let the UI drain whatever is still queued
+        deadline = time.perf_counter() + drain_timeout
+        while not app.log_queue.empty() and time.perf_counter() < deadline:
+            await asyncio.sleep(0.05)
+        await pilot.pause()
+        ingest_elapsed = time.perf_counter() - start
+        feed = generator.last_feed or {}
+
+        # One full text-filter pass over the store, packed messages included
+        store = app.log_table_panel.log_messages
+        pass_view = FilterView("benchmark", text=filter_query)
+        pass_start = time.perf_counter()
+        pass_view.select(store)
+        filter_pass = time.perf_counter() - pass_start
+
+        # Filter phase: type the query one keystroke at a time
+        app.filter_tab_panel.switch_to_tab("text")
+        app.set_focus(app.text_filter_panel.filter_input)
+        await pilot.pause()
+        keystroke_latencies = []
+        for char in filter_query:
+            key_start = time.perf_counter()
+            await pilot.press(char)
+            await pilot.pause()
+            keystroke_latencies.append(time.perf_counter() - key_start)
+
+        filter_hist = METRICS.histogram("filter.apply_seconds")
+        render_hist = METRICS.histogram("table.update_seconds")
+        results = {
+            'sent': feed.get('sent', 0),
+            'dropped': METRICS.counter("ingest.dropped").value,
+            'sampled': METRICS.counter("ingest.sampled").value,
+            'processed': processed.value,
+            'left_in_queue': app.log_queue.qsize(),
+            'stored': app.log_table_panel.get_total_count(),
+            'feed_seconds': feed_elapsed,
+            'ingest_seconds': ingest_elapsed,
+            'target_rate': generator.rate,
+            'offered_rate': feed.get('sent', 0) / max(feed_elapsed, 1e-9),
+            'sustained_ingest_rate': processed.value / max(ingest_elapsed, 1e-9),
+            'frame_count': len(frame_times),
+            'frame_time_p50': _percentile(frame_times, 50),
+            'frame_time_p99': _percentile(frame_times, 99),
+            'frame_time_max': max(frame_times, default=0.0),
+            'keystroke_latency_mean': (statistics.fmean(keystroke_latencies)
+                                       if keystroke_latencies else 0.0),
+            'keystroke_latency_p99': _percentile(keystroke_latencies, 99),
+            'filter_pass': filter_pass,
+            'filter_apply_p50': filter_hist.percentile(50),
+            'filter_apply_p99': filter_hist.percentile(99),
+            'table_update_p50': render_hist.percentile(50),
+            'table_update_p99': render_hist.percentile(99),
+        }
+
+    # Both shapes, so runs stay comparable whichever one fed the app
+    for shape in SHAPES:
+        key = ('memory_per_message_bytes' if shape == "random"
+               else f'memory_per_message_bytes_{shape}')
+        results[key] = measure_memory_per_message(generator.with_shape(shape))
+    # ru_maxrss is in KiB on Linux
+    results['peak_rss_bytes'] = resource.getrusage(
+        resource.RUSAGE_SELF).ru_maxrss * 1024
+    return results
+
+
+def build_report(generator: SyntheticLogGenerator, results: dict,
+                 duration: float, filter_query: str,
+                 profile: Optional[Profile] = None) -> dict:
+    """Wrap results with the environment and configuration"""
+    return {
+        'version': __version__,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'config': {
+            'generator': generator.config(),
+            'duration': duration,
+            'filter_query': filter_query,
+            'profile': profile.name if profile else "default",
+        },
+        'results': results,
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> str:
+    """Human-readable comparison of two benchmark reports"""
+    lines = [f"{'metric':<28} {'baseline':>14} {'current':>14} {'change':>9}"]
+    for key, value in current['results'].items():
+        old = baseline.get('results', {}).get(key)
+        if not isinstance(value, (int, float)) or not isinstance(old, (int, float)):
+            continue
+        change = f"{(value - old) / old * 100:+.1f}%" if old else "-"
+        lines.append(f"{key:<28} {old:>14.6g} {value:>14.6g} {change:>9}")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="python -m rtui_console.benchmark",
+        description="Headless ConsoleApp benchmark with synthetic log storms")
+    parser.add_argument("--rate", type=float, default=1000.0,
+                        help="target messages per second (default: 1000)")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="seconds of synthetic traffic (default: 10)")
+    parser.add_argument("--nodes", type=int, default=50,
+                        help="number of synthetic nodes (default: 50)")
+    parser.add_argument("--zipf", type=float, default=1.1,
+                        help="Zipf exponent of node popularity (default: 1.1)")
+    parser.add_argument("--burst-factor", type=float, default=1.0,
+                        help="rate multiplier during bursts (default: 1, off)")
+    parser.add_argument("--burst-period", type=float, default=10.0,
+                        help="seconds between burst starts (default: 10)")
+    parser.add_argument("--burst-duration", type=float, default=1.0,
+                        help="seconds each burst lasts (default: 1)")
+    parser.add_argument("--filter", default="timeout", dest="filter_query",
+                        help="text typed into the filter (default: timeout)")
+    parser.add_argument("--profile", metavar="NAME",
+                        help="performance profile to run with (default: default)")
+    parser.add_argument("--profiles", metavar="PATH",
+                        help="YAML file of extra performance profiles")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed (default: 0)")
+    parser.add_argument("--shape", choices=SHAPES, default="random",
+                        help="message bodies fed to the app: random filler words "
+                             "or a fixed tail per template (default: random); "
+                             "memory per message is reported for both")
+    parser.add_argument("-o", "--output", metavar="PATH",
+                        help="write the JSON report to this file")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="compare against a previous JSON report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Benchmark entry point"""
+    args = parse_args(argv)
+    generator = SyntheticLogGenerator(
+        rate=args.rate,
+        num_nodes=args.nodes,
+        zipf_s=args.zipf,
+        burst_factor=args.burst_factor,
+        burst_period=args.burst_period,
+        burst_duration=args.burst_duration,
+        seed=args.seed,
+        shape=args.shape,
+    )
+    profile = get_profile(args.profile, args.profiles)
+    results = asyncio.run(run_benchmark(
+        generator, duration=args.duration, filter_query=args.filter_query,
+        profile=profile))
+    report = build_report(generator, results, args.duration, args.filter_query,
+                          profile)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        baseline: Optional[dict] = None
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading baseline: {e}", file=sys.stderr)
+        if baseline is not None:
+            print(compare_reports(baseline, report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,534 @@
+"""
+Local fan-out broker for ROS2 Console Viewer
+
+One process subscribes to /rosout and serves the messages to any number
+of viewers over a Unix-domain or TCP socket:
+
+    rtui-console --broker                       # /tmp/rtui_console.sock
+    rtui-console --broker :7450 --synthetic 5000
+    rtui-console --connect /tmp/rtui_console.sock
+
+The stream is a sequence of frames ``length (u32) | type (u8) | payload``.
+A batch frame holds a sequence number (u64) and a batch in the codec
+module's format; it is encoded once and shared by all clients.
+
+On connect the broker sends a hello with its session id, and the client
+answers with a hello naming the last sequence number it received from
+that session. Only newer backlog batches are replayed, so a viewer that
+reconnects does not get the same messages twice.
+
+Every client has its own send thread and a bounded queue of pending
+frames. When a client falls behind, its oldest batches are dropped and
+reported to it in a dropped frame, so a slow viewer never stalls the
+broker or the other viewers.
+"""
+from collections import deque
+import json
+import os
+import queue
+import socket
+import stat
+import struct
+import sys
+import threading
+import time
+import uuid
+from typing import Optional
+
+from .codec import decode_messages
+from .codec import encode_messages
+from .defaults import DEFAULT_BROKER_ADDRESS
+from .ingest import OverloadSampler
+from .metrics import METRICS
+
+PROTOCOL_VERSION = 2
+
+FRAME_HEADER = struct.Struct("<IB")
+FRAME_HELLO = 0
+FRAME_BATCH = 1
+FRAME_DROPPED = 2
+
+DROPPED = struct.Struct("<Q")
+SEQUENCE = struct.Struct("<Q")
+
+# How long the broker waits for the client hello
+HELLO_TIMEOUT = 2.0
+
+# Messages per batch frame
+MAX_BATCH = 5000
+
+
+def parse_address(address: str):
+    """Socket family and address for 'host:port', ':port' or a Unix path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    return socket.AF_UNIX, os.path.expanduser(address)
+
+
+def encode_batch(messages: list, seq: int = 0) -> bytes:
+    """Batch frame for messages; seq is the broker's message count
+    including this batch"""
+    return encode_frame(FRAME_BATCH,
+                        SEQUENCE.pack(seq) + encode_messages(messages))
+
+
+def encode_frame(frame_type: int, payload: bytes) -> bytes:
+    """Frame with header"""
+    return FRAME_HEADER.pack(len(payload), frame_type) + payload
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    """size bytes from sock, or fewer if the peer closed the connection"""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+def _read_hello(sock: socket.socket) -> dict:
+    """Client hello, or an empty dict if it is missing or malformed"""
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return {}
+    length, frame_type = FRAME_HEADER.unpack(header)
+    if frame_type != FRAME_HELLO or length > 4096:
+        return {}
+    try:
+        hello = json.loads(_recv_exact(sock, length))
+    except ValueError:
+        return {}
+    return hello if isinstance(hello, dict) else {}
+
+
+def _drain(log_queue: queue.Queue, timeout: float, limit: int) -> list:
+    """Up to limit messages, waiting at most timeout for the first"""
+    batch = []
+    try:
+        batch.append(log_queue.get(timeout=timeout))
+        while len(batch) < limit:
+            batch.append(log_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+
+class ClientConnection:
+    """One attached viewer with its own send thread and pending frames"""
+
+    def __init__(self, sock: socket.socket, peer: str,
+                 max_pending_bytes: int) -> None:
+        self.sock = sock
+        self.peer = peer
+        self.max_pending_bytes = max_pending_bytes
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self._frames = deque()  # (frame, message count)
+        self._pending_bytes = 0
+        self._unreported_drops = 0
+        self._cond = threading.Condition()
+        self.thread = threading.Thread(target=self._send_loop, daemon=True)
+
+    def enqueue(self, frame: bytes, count: int) -> int:
+        """Queue a frame, dropping the oldest ones when over the limit;
+        returns the number of messages dropped"""
+        with self._cond:
+            if self.closed:
+                return 0
+            self._frames.append((frame, count))
+            self._pending_bytes += len(frame)
+            dropped = 0
+            while (self._pending_bytes > self.max_pending_bytes
+                   and len(self._frames) > 1):
+                old_frame, old_count = self._frames.popleft()
+                self._pending_bytes -= len(old_frame)
+                dropped += old_count
+            if dropped:
+                self.dropped += dropped
+                self._unreported_drops += dropped
+            self._cond.notify()
+        return dropped
+
+    def _send_loop(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._frames and not self.closed:
+                        self._cond.wait()
+                    if self.closed:
+                        return
+                    frames = list(self._frames)
+                    self._frames.clear()
+                    self._pending_bytes = 0
+                    drops = self._unreported_drops
+                    self._unreported_drops = 0
+                if drops:
+                    self.sock.sendall(
+                        encode_frame(FRAME_DROPPED, DROPPED.pack(drops)))
+                for frame, count in frames:
+                    self.sock.sendall(frame)
+                    self.sent += count
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes queued but not yet handed to the socket"""
+        return self._pending_bytes
+
+    def close(self):
+        """Stop the send thread and close the socket"""
+        with self._cond:
+            if self.closed:
+                return
+            self.closed = True
+            self._frames.clear()
+            self._pending_bytes = 0
+            self._cond.notify()
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+class LogBroker:
+    """Serve messages from a log queue to socket clients
+
+    The newest ``backlog`` messages (rounded up to whole batches) are kept
+    as encoded frames and replayed to every client on connect, except the
+    batches a reconnecting client already has.
+    """
+
+    def __init__(self, log_queue: queue.Queue,
+                 address: str = DEFAULT_BROKER_ADDRESS,
+                 backlog: int = 10000,
+                 max_pending_bytes: int = 16 << 20) -> None:
+        self.log_queue = log_queue
+        self.address = address
+        self.backlog = backlog
+        self.max_pending_bytes = max_pending_bytes
+        self.clients: list[ClientConnection] = []
+        self.published = 0
+        # Lets a reconnecting client tell whether its sequence numbers
+        # came from this broker
+        self.session = uuid.uuid4().hex
+        self._backlog_frames = deque()  # (seq, frame, message count)
+        self._backlog_count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._listener: Optional[socket.socket] = None
+        self._threads: list[threading.Thread] = []
+        self._clients_gauge = METRICS.gauge("broker.clients")
+        self._published = METRICS.counter("broker.published")
+        self._dropped = METRICS.counter("broker.dropped")
+
+    def start(self):
+        """Bind the socket and start the accept and publish threads"""
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX:
+            # Remove a socket left behind by a previous broker
+            try:
+                if stat.S_ISSOCK(os.stat(address).st_mode):
+                    os.unlink(address)
+            except FileNotFoundError:
+                pass
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(address)
+        listener.listen()
+        listener.settimeout(0.5)
+        self._listener = listener
+        for target in (self._accept_loop, self._publish_loop):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Close the listener and all clients"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        if self._listener is not None:
+            family, address = parse_address(self.address)
+            self._listener.close()
+            if family == socket.AF_UNIX:
+                try:
+                    os.unlink(address)
+                except OSError:
+                    pass
+        with self._lock:
+            for client in self.clients:
+                client.close()
+            self.clients = []
+        self._clients_gauge.set(0)
+
+    def publish(self, messages: list):
+        """Encode messages once and queue them for every client"""
+        count = len(messages)
+        with self._lock:
+            # Numbered under the lock so batches are queued in seq order
+            self.published += count
+            seq = self.published
+            frame = encode_batch(messages, seq)
+            self._backlog_frames.append((seq, frame, count))
+            self._backlog_count += count
+            while (self._backlog_frames and self._backlog_count
+                   - self._backlog_frames[0][2] >= self.backlog):
+                self._backlog_count -= self._backlog_frames.popleft()[2]
+            if any(client.closed for client in self.clients):
+                self.clients = [c for c in self.clients if not c.closed]
+                self._clients_gauge.set(len(self.clients))
+            for client in self.clients:
+                dropped = client.enqueue(frame, count)
+                if dropped:
+                    self._dropped.inc(dropped)
+        self._published.inc(count)
+
+    def _publish_loop(self):
+        while not self._stop.is_set():
+            batch = _drain(self.log_queue, 0.05, MAX_BATCH)
+            if batch:
+                self.publish(batch)
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                sock, peer = self._listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            # The hello exchange runs in its own thread so a client that
+            # never answers does not hold up the others
+            threading.Thread(target=self._attach,
+                             args=(sock, str(peer or "local")),
+                             daemon=True).start()
+
+    def _attach(self, sock: socket.socket, peer: str):
+        client = ClientConnection(sock, peer, self.max_pending_bytes)
+        with self._lock:
+            hello = json.dumps({
+                'version': PROTOCOL_VERSION,
+                'session': self.session,
+                'backlog': self._backlog_count,
+            }).encode('utf-8')
+        try:
+            # Sent directly so it can never be dropped; a fresh socket
+            # buffer always has room for it
+            sock.sendall(encode_frame(FRAME_HELLO, hello))
+            sock.settimeout(HELLO_TIMEOUT)
+            client_hello = _read_hello(sock)
+            sock.settimeout(None)
+        except OSError:
+            client.close()
+            return
+        since = 0
+        if client_hello.get('session') == self.session:
+            since = client_hello.get('seq', 0)
+            if not isinstance(since, int):
+                since = 0
+        with self._lock:
+            if self._stop.is_set():
+                client.close()
+                return
+            # Replay under the lock so no batch is missed or sent twice
+            for seq, frame, count in self._backlog_frames:
+                if seq > since:
+                    client.enqueue(frame, count)
+            self.clients.append(client)
+            self._clients_gauge.set(len(self.clients))
+        client.thread.start()
+
+    def report(self) -> str:
+        """Per-client sent and dropped counts"""
+        with self._lock:
+            clients = list(self.clients)
+        lines = [f"published {self.published}, {len(clients)} client(s)"]
+        for client in clients:
+            lines.append(f"  {client.peer}: sent {client.sent}, "
+                         f"dropped {client.dropped}, "
+                         f"pending {client.pending_bytes} bytes")
+        return "\n".join(lines)
+
+
+class BrokerClient:
+    """Viewer side of the broker; used in place of ROS2Client
+
+    Reconnects every ``retry_interval`` seconds while the broker is down,
+    resuming after the last batch received from the same broker.
+    Messages the broker dropped for this client are added to
+    ingest.dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue,
+                 address: str = DEFAULT_BROKER_ADDRESS,
+                 retry_interval: float = 1.0,
+                 sampler: Optional[OverloadSampler] = None) -> None:
+        self.log_queue = log_queue
+        self.sampler = sampler or OverloadSampler(enabled=False)
+        self.address = address
+        self.retry_interval = retry_interval
+        self.thread: Optional[threading.Thread] = None
+        self.status = "Disconnected"
+        self.connected = False
+        self.timings: dict[str, float] = {}
+        self.broker_dropped = 0
+        # Broker session and the last sequence number received from it
+        self.session: Optional[str] = None
+        self.last_seq = 0
+        self._sock: Optional[socket.socket] = None
+        self._stop = threading.Event()
+        self._dropped = METRICS.counter("ingest.dropped")
+
+    def is_available(self) -> bool:
+        """The broker is reached over a socket, so always available"""
+        return True
+
+    def check_environment(self) -> tuple[bool, str]:
+        """Report the broker address"""
+        return True, f"Using log broker at {self.address}"
+
+    def start_subscriber(self) -> bool:
+        """Connect to the broker in a separate thread"""
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop_subscriber(self):
+        """Disconnect from the broker"""
+        self._stop.set()
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self.status = "Disconnected"
+
+    def get_status(self) -> str:
+        """Get current connection status"""
+        return self.status
+
+    def _receive_loop(self):
+        family, address = parse_address(self.address)
+        while not self._stop.is_set():
+            self.status = "Connecting..."
+            start = time.perf_counter()
+            try:
+                with socket.socket(family, socket.SOCK_STREAM) as sock:
+                    sock.connect(address)
+                    self._sock = sock
+                    self.timings['broker_connect'] = time.perf_counter() - start
+                    self.connected = True
+                    self.status = "Connected"
+                    with sock.makefile('rb', buffering=1 << 20) as stream:
+                        self._read_frames(stream, sock)
+            except OSError as e:
+                if not self._stop.is_set():
+                    self.status = f"Broker unavailable: {e.strerror or e}"
+            except (ValueError, struct.error) as e:
+                # Drop the connection and resync from last_seq on reconnect
+                self.status = f"Broker sent a malformed frame: {e}"
+            finally:
+                self.connected = False
+                self._sock = None
+            if self.status == "Connected":
+                self.status = "Broker closed the connection"
+            self._stop.wait(self.retry_interval)
+        self.status = "Disconnected"
+
+    def _read_frames(self, stream, sock: socket.socket):
+        while not self._stop.is_set():
+            header = stream.read(FRAME_HEADER.size)
+            if len(header) < FRAME_HEADER.size:
+                return
+            length, frame_type = FRAME_HEADER.unpack(header)
+            payload = stream.read(length)
+            if len(payload) < length:
+                return
+            if frame_type == FRAME_BATCH:
+                (seq,) = SEQUENCE.unpack_from(payload)
+                self._put(decode_messages(payload[SEQUENCE.size:]))
+                self.last_seq = seq
+            elif frame_type == FRAME_DROPPED:
+                (count,) = DROPPED.unpack(payload)
+                self.broker_dropped += count
+                self._dropped.inc(count)
+            elif frame_type == FRAME_HELLO:
+                hello = json.loads(payload)
+                if not isinstance(hello, dict):
+                    raise ValueError("hello is not a JSON object")
+                if hello.get('version') != PROTOCOL_VERSION:
+                    self.status = (f"Error: broker protocol "
+                                   f"{hello.get('version')} is not supported")
+                    self._stop.set()
+                    return
+                if hello.get('session') != self.session:
+                    # A new broker numbers from zero again
+                    self.session = hello.get('session')
+                    self.last_seq = 0
+                sock.sendall(encode_frame(FRAME_HELLO, json.dumps({
+                    'version': PROTOCOL_VERSION,
+                    'session': self.session,
+                    'seq': self.last_seq,
+                }).encode('utf-8')))
+
+    def _put(self, messages: list):
+        """Queue messages through the sampler like ROS2LogSubscriber"""
+        offer = self.sampler.offer
+        for log_msg in messages:
+            offer(self.log_queue, log_msg)
+
+
+def run_broker(args, profile=None) -> int:
+    """Broker entry point; returns the exit status"""
+    from .profiles import Profile
+    from .ros_client import ROS2Client
+    from .synthetic import SyntheticLogGenerator
+
+    profile = profile or Profile()
+    log_queue = queue.Queue(maxsize=max(profile.queue_size, MAX_BATCH * 4))
+    broker = LogBroker(log_queue, args.broker, backlog=args.broker_backlog)
+    try:
+        broker.start()
+    except OSError as e:
+        print(f"rtui-console: cannot listen on {args.broker}: {e}",
+              file=sys.stderr)
+        return 1
+
+    stop_event = threading.Event()
+    source = None
+    if args.synthetic:
+        generator = SyntheticLogGenerator(rate=args.synthetic)
+        source = generator.start(log_queue, args.duration or float("inf"),
+                                 stop_event)
+    else:
+        ros_client = ROS2Client(log_queue, qos_depth=profile.qos_depth)
+        if not ros_client.start_subscriber():
+            broker.stop()
+            print("rtui-console: ROS2 packages not found "
+                  "(use --synthetic RATE to test)", file=sys.stderr)
+            return 1
+    print(f"rtui-console: broker listening on {args.broker}", file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        while args.duration is None or time.perf_counter() - start < args.duration:
+            if source is not None and not source.is_alive():
+                break
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    stop_event.set()
+    report = broker.report()
+    broker.stop()
+    print(report, file=sys.stderr)
+    return 0
@@ -0,0 +1,108 @@
+"""
+Compact binary encoding of message batches
+
+Shared by the broker stream and cold storage. A batch is::
+
+    count (u32) | string table length (u32) | NUL-separated strings
+    | fixed-size records | UTF-8 text blob
+
+Node, file and function names are stored once per batch in the string
+table and referenced by index.
+"""
+from datetime import datetime
+import math
+import struct
+
+import numpy as np
+
+from .models import LogMessage
+
+BATCH_HEADER = struct.Struct("<II")
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('last_timestamp', '<f8'),  # NaN unless the message folds repeats
+    ('text_len', '<u4'),  # characters
+    ('node', '<u4'),
+    ('file', '<u4'),
+    ('function', '<u4'),
+    ('line', '<i4'),
+    ('repeat_count', '<u4'),
+    ('level', '<u1'),
+])
+
+
+def encode_messages(messages: list) -> bytes:
+    """Encoded batch of messages"""
+    count = len(messages)
+    strings: dict[str, int] = {}
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['timestamp'] = np.fromiter(
+        (m.timestamp.timestamp() for m in messages), dtype=np.float64, count=count)
+    records['last_timestamp'] = np.fromiter(
+        (m.last_timestamp.timestamp() if m.last_timestamp else math.nan
+         for m in messages), dtype=np.float64, count=count)
+    records['node'] = np.fromiter(
+        (strings.setdefault(m.name, len(strings)) for m in messages),
+        dtype=np.uint32, count=count)
+    records['file'] = np.fromiter(
+        (strings.setdefault(m.file or "", len(strings)) for m in messages),
+        dtype=np.uint32, count=count)
+    records['function'] = np.fromiter(
+        (strings.setdefault(m.function or "", len(strings)) for m in messages),
+        dtype=np.uint32, count=count)
+    records['line'] = np.fromiter(
+        (m.line or 0 for m in messages), dtype=np.int32, count=count)
+    records['repeat_count'] = np.fromiter(
+        (m.repeat_count for m in messages), dtype=np.uint32, count=count)
+    records['level'] = np.fromiter(
+        (m.level for m in messages), dtype=np.uint8, count=count)
+    texts = [m.msg for m in messages]
+    records['text_len'] = np.fromiter(map(len, texts), dtype=np.uint32, count=count)
+
+    table = "\0".join(strings).encode('utf-8', 'replace')
+    # 'replace' keeps one character per unencodable one, so text_len holds
+    blob = "".join(texts).encode('utf-8', 'replace')
+    return b"".join((BATCH_HEADER.pack(count, len(table)), table,
+                     records.tobytes(), blob))
+
+
+def decode_messages(data: bytes) -> list:
+    """Messages of an encoded batch; ValueError if it is corrupt"""
+    try:
+        count, table_len = BATCH_HEADER.unpack_from(data)
+    except struct.error as e:
+        raise ValueError(f"corrupt batch: {e}") from e
+    offset = BATCH_HEADER.size
+    table = data[offset:offset + table_len].decode('utf-8', 'replace')
+    strings = table.split("\0")
+    offset += table_len
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=count,
+                            offset=offset)
+    columns = {name: records[name].tolist() for name in RECORD_DTYPE.names}
+    blob = data[offset + records.nbytes:].decode('utf-8', 'replace')
+    for name in ('node', 'file', 'function'):
+        if count and max(columns[name]) >= len(strings):
+            raise ValueError(f"corrupt batch: bad {name} index")
+
+    messages = []
+    start = 0
+    fromtimestamp = datetime.fromtimestamp
+    for timestamp, text_len, node, file, function, line, level in zip(
+            columns['timestamp'], columns['text_len'], columns['node'],
+            columns['file'], columns['function'], columns['line'],
+            columns['level']):
+        end = start + text_len
+        messages.append(LogMessage(
+            timestamp=fromtimestamp(timestamp), level=level,
+            name=strings[node], text=blob[start:end], file=strings[file],
+            function=strings[function], line=line))
+        start = end
+    for i, repeat_count in enumerate(columns['repeat_count']):
+        if repeat_count > 1:
+            msg = messages[i]
+            msg.repeat_count = repeat_count
+            last_timestamp = columns['last_timestamp'][i]
+            if not math.isnan(last_timestamp):
+                msg.last_timestamp = fromtimestamp(last_timestamp)
+    return messages
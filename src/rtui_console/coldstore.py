@@ -0,0 +1,189 @@
+"""
+Block-compressed cold storage for ROS2 Console Viewer
+
+Messages trimmed from the in-memory store are packed into fixed-size
+blocks (codec module format) and compressed with zlib or lzma. Each block
+keeps a small summary - time range, levels and nodes present - so a
+filter can skip whole blocks without decompressing them. Blocks that are
+read are kept decompressed in a small LRU.
+
+A compressed message takes 15-20 bytes against roughly 300 bytes as a
+LogMessage, so the same memory budget holds well over 10x more history.
+"""
+from collections import OrderedDict
+import itertools
+import lzma
+import zlib
+
+from .codec import decode_messages
+from .codec import encode_messages
+from .metrics import METRICS
+
+CODECS = {
+    'zlib': (lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (lambda data: lzma.compress(data, preset=0), lzma.decompress),
+}
+
+
+class ColdBlock:
+    """Compressed messages and their summary"""
+
+    __slots__ = ("id", "data", "count", "time_range", "levels", "nodes")
+
+    def __init__(self, block_id: int, data: bytes, messages: list) -> None:
+        self.id = block_id
+        self.data = data
+        self.count = len(messages)
+        self.time_range = (min(msg.timestamp for msg in messages),
+                           max(msg.last_seen for msg in messages))
+        self.levels = frozenset(msg.level for msg in messages)
+        self.nodes = frozenset(msg.name for msg in messages)
+
+    def may_match(self, view) -> bool:
+        """Whether any message could pass the view's filters"""
+        # Cold messages carry no template, so a template filter never matches
+        if view.templates:
+            return False
+        start, end = view.time_range
+        if start is not None and self.time_range[1] < start:
+            return False
+        if end is not None and self.time_range[0] > end:
+            return False
+        levels = view.level_values()
+        if levels and self.levels.isdisjoint(levels):
+            return False
+        if view.nodes and "ALL" not in view.nodes and self.nodes.isdisjoint(view.nodes):
+            return False
+        return True
+
+
+class ColdStore:
+    """Compressed blocks of older messages within a byte budget
+
+    Messages are added oldest first; once ``max_bytes`` of compressed
+    data is exceeded, the oldest blocks are dropped. A budget of 0
+    disables cold storage.
+    """
+
+    BLOCK_SIZE = 4096
+    CACHE_BLOCKS = 8
+
+    def __init__(self, max_bytes: int = 0, codec: str = "zlib",
+                 block_size: int = BLOCK_SIZE,
+                 cache_blocks: int = CACHE_BLOCKS) -> None:
+        self.max_bytes = max_bytes
+        self.compress, self.decompress = CODECS[codec]
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.blocks: list[ColdBlock] = []  # oldest first
+        self.size_bytes = 0
+        # Bumped whenever the stored messages change
+        self.version = 0
+        self._pending: list = []
+        self._cache: OrderedDict[int, list] = OrderedDict()
+        self._block_ids = itertools.count()
+        self._messages = METRICS.gauge("store.cold_messages")
+        self._bytes = METRICS.gauge("store.cold_bytes")
+        self._evicted = METRICS.counter("store.cold_evicted")
+        self._decompressed = METRICS.counter("store.cold_decompressed")
+
+    @property
+    def enabled(self) -> bool:
+        """Whether trimmed messages are kept"""
+        return self.max_bytes > 0
+
+    def __len__(self) -> int:
+        return sum(block.count for block in self.blocks) + len(self._pending)
+
+    def extend(self, messages: list):
+        """Add messages newer than everything stored"""
+        if not self.enabled or not messages:
+            return
+        self._pending.extend(messages)
+        while len(self._pending) >= self.block_size:
+            self._pack(self._pending[:self.block_size])
+            del self._pending[:self.block_size]
+        self._evict()
+        self.version += 1
+        self._update_gauges()
+
+    def _pack(self, messages: list):
+        data = self.compress(encode_messages(messages))
+        self.blocks.append(ColdBlock(next(self._block_ids), data, messages))
+        self.size_bytes += len(data)
+
+    def _evict(self):
+        """Drop the oldest blocks until within the budget"""
+        drop = 0
+        size = self.size_bytes
+        while drop < len(self.blocks) and size > self.max_bytes:
+            size -= len(self.blocks[drop].data)
+            drop += 1
+        if drop:
+            for block in self.blocks[:drop]:
+                self._evicted.inc(block.count)
+                self._cache.pop(block.id, None)
+            del self.blocks[:drop]
+            self.size_bytes = size
+
+    def set_max_bytes(self, max_bytes: int):
+        """Change the budget, dropping blocks if it shrank"""
+        self.max_bytes = max_bytes
+        if not self.enabled:
+            self.clear()
+            return
+        self._evict()
+        self.version += 1
+        self._update_gauges()
+
+    def block_messages(self, block: ColdBlock) -> list:
+        """Decompressed messages of a block, through the LRU"""
+        messages = self._cache.get(block.id)
+        if messages is not None:
+            self._cache.move_to_end(block.id)
+            return messages
+        messages = decode_messages(self.decompress(block.data))
+        self._decompressed.inc()
+        self._cache[block.id] = messages
+        while len(self._cache) > self.cache_blocks:
+            self._cache.popitem(last=False)
+        return messages
+
+    def select(self, view, newest_first: bool = False):
+        """Yield the stored messages passing the view's filters
+
+        Blocks whose summary rules out every message are not decompressed.
+        """
+        # Snapshot, so messages trimmed meanwhile do not shift the iteration
+        blocks = list(self.blocks)
+        pending = view.select(self._pending) if self._pending else []
+        if newest_first:
+            yield from reversed(pending)
+            for block in reversed(blocks):
+                if block.may_match(view):
+                    yield from reversed(view.select(self.block_messages(block)))
+        else:
+            for block in blocks:
+                if block.may_match(view):
+                    yield from view.select(self.block_messages(block))
+            yield from pending
+
+    def search(self, view, query: str):
+        """Yield messages passing the view that contain query, newest first"""
+        query = query.lower()
+        for msg in self.select(view, newest_first=True):
+            if query in msg.lower_msg or query in msg.name.lower():
+                yield msg
+
+    def clear(self):
+        """Drop everything"""
+        self.blocks = []
+        self.size_bytes = 0
+        self._pending = []
+        self._cache.clear()
+        self.version += 1
+        self._update_gauges()
+
+    def _update_gauges(self):
+        self._messages.set(len(self))
+        self._bytes.set(self.size_bytes)
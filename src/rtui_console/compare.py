@@ -0,0 +1,290 @@
+"""
+Run-to-run comparison of recorded logs
+
+Each recording (a JSONL export or a rosbag2 ``.db3`` bag of /rosout) is
+streamed once and reduced to a frequency table of (node, normalized
+message) keys: tokens containing digits become ``<*>`` and the pair is
+hashed, so memory grows with the number of distinct templates, not with
+the size of the recording. The two tables are then diffed and ranked by
+how much a template's share of the run changed:
+
+    rtui-console --compare good_run.jsonl new_run/
+
+Rows behind a diff entry are found by streaming the recordings again.
+"""
+from datetime import datetime
+import glob
+import gzip
+import json
+import math
+import os
+import re
+import sqlite3
+import struct
+from typing import Callable, Iterator, Optional
+
+from .models import LogLevel
+from .models import LogMessage
+
+# Distinct templates tracked per run; further ones are only counted
+MAX_TEMPLATES = 200_000
+# Characters of a message used for its template
+MAX_TEMPLATE_LENGTH = 300
+
+# A template whose share of the run changed by at least this factor
+CHANGE_FACTOR = 2.0
+
+_VARIABLE_RE = re.compile(r"\S*\d\S*")
+
+LOG_TOPIC = "/rosout"
+LOG_TYPES = ("rcl_interfaces/msg/Log", "rcl_interfaces/msg/Log_")
+
+
+def normalize(text: str) -> str:
+    """Message text with variable tokens (containing digits) masked"""
+    return _VARIABLE_RE.sub("<*>", text[:MAX_TEMPLATE_LENGTH])
+
+
+def template_key(node: str, text: str) -> int:
+    """Hash of a node and its normalized message"""
+    return hash((node, normalize(text)))
+
+
+def _level(value) -> Optional[int]:
+    """Level number for a JSONL level (20, "20", "INFO"), or None"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        name = value.strip().upper()
+        if name == "WARNING":
+            name = "WARN"
+        for level, level_name in LogLevel.NAMES.items():
+            if level_name == name:
+                return level
+        if name.isdigit():
+            return int(name)
+    return None
+
+
+def read_jsonl(path: str) -> Iterator[tuple]:
+    """(timestamp, level, node, message, file, function, line) per line
+
+    Lines that are not JSON objects or have an unknown level are skipped.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            level = _level(data.get('level', LogLevel.INFO))
+            if level is None:
+                continue
+            yield (data.get('timestamp', ""), level,
+                   str(data.get('node', "unknown")), str(data.get('message', "")),
+                   data.get('file', ""), data.get('function', ""),
+                   data.get('line', 0))
+
+
+def _cdr_string(data: bytes, pos: int, endian: str) -> tuple[str, int]:
+    pos += -pos % 4
+    (length,) = struct.unpack_from(endian + "I", data, pos)
+    pos += 4
+    # The length includes the terminating NUL
+    text = data[pos:pos + max(length - 1, 0)].decode('utf-8', 'replace')
+    return text, pos + length
+
+
+def parse_log_cdr(data: bytes) -> tuple:
+    """Fields of a CDR-serialized rcl_interfaces/msg/Log"""
+    endian = "<" if data[1] == 1 else ">"
+    body = data[4:]  # after the encapsulation header
+    sec, nanosec, level = struct.unpack_from(endian + "iIB", body, 0)
+    pos = 9
+    name, pos = _cdr_string(body, pos, endian)
+    msg, pos = _cdr_string(body, pos, endian)
+    file, pos = _cdr_string(body, pos, endian)
+    function, pos = _cdr_string(body, pos, endian)
+    pos += -pos % 4
+    (line,) = struct.unpack_from(endian + "I", body, pos)
+    return sec + nanosec * 1e-9, level, name, msg, file, function, line
+
+
+def read_db3(path: str) -> Iterator[tuple]:
+    """/rosout messages of a rosbag2 SQLite bag, in storage order
+
+    Raises ValueError for files that are not rosbag2 databases.
+    """
+    uri = f"file:{os.path.abspath(path)}?mode=ro"
+    try:
+        connection = sqlite3.connect(uri, uri=True)
+    except sqlite3.Error as e:
+        raise ValueError(f"{path}: {e}") from e
+    try:
+        topic_ids = [
+            topic_id for topic_id, name, topic_type in connection.execute(
+                "SELECT id, name, type FROM topics")
+            if name == LOG_TOPIC or topic_type in LOG_TYPES]
+        for topic_id in topic_ids:
+            rows = connection.execute(
+                "SELECT data FROM messages WHERE topic_id = ?", (topic_id,))
+            for (data,) in rows:
+                try:
+                    yield parse_log_cdr(data)
+                except (struct.error, IndexError):
+                    continue
+    except sqlite3.Error as e:
+        raise ValueError(f"{path}: not a rosbag2 database ({e})") from e
+    finally:
+        connection.close()
+
+
+def recording_files(path: str) -> list:
+    """Files of a recording: a file, or the .db3 files of a bag directory"""
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "*.db3")))
+        if not files:
+            raise ValueError(f"{path}: no .db3 files in bag directory")
+        return files
+    if not os.path.exists(path):
+        raise ValueError(f"{path}: no such file")
+    return [path]
+
+
+def read_recording(path: str) -> Iterator[tuple]:
+    """Stream the messages of a recording as field tuples"""
+    for file in recording_files(path):
+        reader = read_db3 if file.endswith(".db3") else read_jsonl
+        yield from reader(file)
+
+
+def to_message(record: tuple) -> LogMessage:
+    """LogMessage for a field tuple"""
+    timestamp, level, node, text, file, function, line = record
+    if isinstance(timestamp, (int, float)):
+        timestamp = datetime.fromtimestamp(timestamp)
+    else:
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except (TypeError, ValueError):
+            timestamp = None
+    return LogMessage(timestamp=timestamp, level=level, name=node, text=text,
+                      file=file, function=function, line=line)
+
+
+class TemplateTable:
+    """Per-node template frequencies of one recording"""
+
+    def __init__(self, path: str, max_templates: int = MAX_TEMPLATES) -> None:
+        self.path = path
+        self.max_templates = max_templates
+        self.total = 0
+        # Messages whose template was not tracked because the table was full
+        self.untracked = 0
+        self.counts: dict[int, int] = {}
+        # key -> (node, template, max level, example message)
+        self.info: dict[int, tuple] = {}
+
+    def add(self, node: str, text: str, level: int):
+        """Count one message"""
+        self.total += 1
+        template = normalize(text)
+        key = hash((node, template))
+        count = self.counts.get(key)
+        if count is not None:
+            self.counts[key] = count + 1
+            info = self.info[key]
+            if level > info[2]:
+                self.info[key] = (info[0], info[1], level, info[3])
+        elif len(self.counts) < self.max_templates:
+            self.counts[key] = 1
+            self.info[key] = (node, template, level, text[:MAX_TEMPLATE_LENGTH])
+        else:
+            self.untracked += 1
+
+    @classmethod
+    def load(cls, path: str, progress: Optional[Callable] = None,
+             every: int = 100_000) -> 'TemplateTable':
+        """Stream a recording into a table"""
+        table = cls(path)
+        add = table.add
+        for record in read_recording(path):
+            add(record[2], record[3], record[1])
+            if progress is not None and table.total % every == 0:
+                progress(table)
+        return table
+
+
+class DiffEntry:
+    """One template's change between two runs"""
+
+    __slots__ = ("key", "node", "template", "level", "example",
+                 "baseline", "current", "change", "status", "score")
+
+    def __init__(self, key: int, info: tuple, baseline: int, current: int,
+                 change: float, status: str, score: float) -> None:
+        self.key = key
+        self.node, self.template, self.level, self.example = info
+        self.baseline = baseline
+        self.current = current
+        self.change = change
+        self.status = status
+        self.score = score
+
+
+def diff_tables(baseline: TemplateTable, current: TemplateTable,
+                include_same: bool = False) -> list:
+    """Ranked entries for templates that are new, gone or changed
+
+    A template's share of each run is compared, so runs of different
+    lengths can be diffed. The score weighs the log2 change in share by
+    the log of the number of messages involved.
+    """
+    entries = []
+    base_total = baseline.total + 1
+    current_total = current.total + 1
+    threshold = math.log2(CHANGE_FACTOR)
+    for key in baseline.counts.keys() | current.counts.keys():
+        a = baseline.counts.get(key, 0)
+        b = current.counts.get(key, 0)
+        change = math.log2(((b + 1) / current_total) / ((a + 1) / base_total))
+        if a == 0:
+            status = "new"
+        elif b == 0:
+            status = "gone"
+        elif abs(change) >= threshold:
+            status = "more" if change > 0 else "less"
+        elif include_same:
+            status = "same"
+        else:
+            continue
+        info = current.info.get(key) or baseline.info[key]
+        score = abs(change) * math.log2(a + b + 1)
+        entries.append(DiffEntry(key, info, a, b, change, status, score))
+    entries.sort(key=lambda entry: entry.score, reverse=True)
+    return entries
+
+
+def find_rows(path: str, key: int, limit: int = 500) -> list:
+    """Up to limit messages of a recording with the given template key"""
+    rows = []
+    for record in read_recording(path):
+        if template_key(record[2], record[3]) == key:
+            rows.append(to_message(record))
+            if len(rows) >= limit:
+                break
+    return rows
+
+
+def format_diff(entries: list, limit: int = 50) -> str:
+    """Plain-text ranked diff"""
+    lines = [f"{'status':<6} {'baseline':>9} {'current':>9} {'change':>8}  node: template"]
+    for entry in entries[:limit]:
+        change = entry.status if entry.status in ("new", "gone") else \
+            f"x{2 ** entry.change:.2g}"
+        lines.append(f"{entry.status:<6} {entry.baseline:>9} {entry.current:>9} "
+                     f"{change:>8}  {entry.node}: {entry.template}")
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+"""
+Run comparison application for ROS2 Console Viewer
+"""
+import threading
+
+from textual.app import App
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.widgets import Footer
+from textual.widgets import Header
+
+from .compare import diff_tables
+from .compare import find_rows
+from .compare import TemplateTable
+from .events import CompareEntrySelected
+from .widgets import ComparePanel
+
+
+class CompareApp(App):
+    """Ranked template diff of a baseline and a current recording"""
+
+    TITLE = "ROS2 Console Viewer - Compare"
+    BINDINGS = [
+        Binding("a", "toggle_same", "Show Unchanged", key_display="a"),
+        Binding("q", "quit", "Quit", key_display="q"),
+    ]
+
+    # Rows loaded per run when an entry is opened
+    MAX_ROWS = 200
+
+    def __init__(self, baseline: str, current: str):
+        super().__init__()
+        self.baseline_path = baseline
+        self.current_path = current
+        self.baseline = None
+        self.current = None
+        self.include_same = False
+        self.compare_panel = ComparePanel(id="compare")
+        self._rows_thread = None
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        yield self.compare_panel
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.sub_title = f"{self.baseline_path} → {self.current_path}"
+        self.compare_panel.set_title("⚖ Reading recordings ...")
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _load(self):
+        """Build both template tables (thread)"""
+        def progress(table):
+            self.call_from_thread(self.compare_panel.set_title,
+                                  f"⚖ Reading {table.path}: {table.total:,} messages")
+        try:
+            baseline = TemplateTable.load(self.baseline_path, progress)
+            current = TemplateTable.load(self.current_path, progress)
+        except (OSError, ValueError) as e:
+            self.call_from_thread(self.compare_panel.set_title, f"⚖ {e}")
+            self.call_from_thread(self.notify, str(e), severity="error")
+            return
+        self.call_from_thread(self._loaded, baseline, current)
+
+    def _loaded(self, baseline: TemplateTable, current: TemplateTable):
+        self.baseline = baseline
+        self.current = current
+        self._refresh_entries()
+        for table in (baseline, current):
+            if table.untracked:
+                self.notify(f"{table.path}: {table.untracked:,} messages beyond "
+                            f"{table.max_templates:,} templates not compared",
+                            severity="warning")
+
+    def _refresh_entries(self):
+        entries = diff_tables(self.baseline, self.current, self.include_same)
+        self.compare_panel.set_title(
+            f"⚖ {len(entries):,} templates changed - baseline "
+            f"{self.baseline.total:,} messages, {len(self.baseline.counts):,} "
+            f"templates; current {self.current.total:,} messages, "
+            f"{len(self.current.counts):,} templates")
+        self.compare_panel.set_entries(entries)
+
+    def on_compare_entry_selected(self, event: CompareEntrySelected) -> None:
+        """Stream both recordings for the rows of the selected entry"""
+        if self._rows_thread and self._rows_thread.is_alive():
+            self.notify("Still loading rows", timeout=2)
+            return
+        entry = event.entry
+
+        def load():
+            rows = []
+            try:
+                for run, path in (("baseline", self.baseline_path),
+                                  ("current", self.current_path)):
+                    rows.extend((run, msg) for msg in
+                                find_rows(path, entry.key, self.MAX_ROWS))
+            except (OSError, ValueError) as e:
+                self.call_from_thread(self.notify, str(e), severity="error")
+            self.call_from_thread(self.compare_panel.show_rows, entry, rows)
+
+        self._rows_thread = threading.Thread(target=load, daemon=True)
+        self._rows_thread.start()
+
+    def action_toggle_same(self) -> None:
+        """Also list templates whose frequency did not change"""
+        if self.baseline is None:
+            return
+        self.include_same = not self.include_same
+        self._refresh_entries()
@@ -0,0 +1,12 @@
+"""
+Default paths shared by the CLI and the modules that use them
+
+Kept free of heavy imports so main.py can build its argument parser
+without loading numpy.
+"""
+
+# Used by --broker and --connect when no address is given
+DEFAULT_BROKER_ADDRESS = "/tmp/rtui_console.sock"
+
+# Snapshot written on quit and restored on startup unless --snapshot is given
+DEFAULT_SNAPSHOT_FILE = "~/.cache/rtui_console/session.snap"
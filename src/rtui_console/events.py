@@ -58,3 +58,53 @@ class TextFilterChanged(Message):
     def __init__(self, text: str) -> None:
         super().__init__()
         self.text = text
+
+
+class TemplateFilterChanged(Message):
+    """Event when the template filter is changed"""
+
+    def __init__(self, template_ids) -> None:
+        super().__init__()
+        self.template_ids = set(template_ids) if template_ids else set()
+
+
+class TimeRangeChanged(Message):
+    """Event when the time range filter is changed"""
+
+    def __init__(self, start: str, end: str) -> None:
+        super().__init__()
+        self.start = start
+        self.end = end
+
+
+class FilterViewChanged(Message):
+    """Event when another filter view becomes active"""
+
+    def __init__(self, view) -> None:
+        super().__init__()
+        self.view = view
+
+
+class CompareEntrySelected(Message):
+    """Event when a run comparison entry is selected"""
+
+    def __init__(self, entry) -> None:
+        super().__init__()
+        self.entry = entry
+
+
+class AggregateQuerySubmitted(Message):
+    """Event when an aggregation query is entered"""
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+
+
+class AggregateRowSelected(Message):
+    """Event when an aggregation result row is selected to filter on"""
+
+    def __init__(self, column: str, value) -> None:
+        super().__init__()
+        self.column = column
+        self.value = value
@@ -0,0 +1,262 @@
+"""
+Structured fields extracted from message text
+
+Nodes often log ``key=value`` pairs or inline JSON (``battery=11.8 v``,
+``{"latency_ms": 37}``). A text filter token like ``@latency_ms>50`` or
+``@mode=auto`` is a field predicate; without the ``@`` a token such as
+``timeout>5s`` or ``a=b`` stays a plain substring. The field is parsed out of every
+stored message the first time a predicate references it and kept as a
+typed column (float, NaN when missing or not numeric, plus the string
+value), so predicates and summaries are evaluated vectorized.
+"""
+import functools
+import operator
+import re
+from typing import Optional
+
+import numpy as np
+
+# Text filter tokens that are predicates; tokens without the @ prefix or
+# with spaces around the operator stay plain substrings ("a=b", "x = 5")
+PREDICATE_RE = re.compile(r"^@([A-Za-z_][\w.]*)(>=|<=|!=|==|=|>|<)(\S+)$")
+NUMBER_RE = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '=': operator.eq,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+
+class Predicate:
+    """Comparison of one field with a value"""
+
+    __slots__ = ("field", "op", "value", "number")
+
+    def __init__(self, field: str, op: str, value: str) -> None:
+        self.field = field.lower()
+        self.op = op
+        self.value = value.lower()
+        self.number = parse_number(value)
+
+    def __repr__(self) -> str:
+        return f"{self.field}{self.op}{self.value}"
+
+    def evaluate(self, numbers: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Boolean mask over a column slice; missing fields never match"""
+        compare = OPERATORS[self.op]
+        if self.number is not None:
+            present = ~np.isnan(numbers)
+            with np.errstate(invalid='ignore'):
+                return compare(numbers, self.number) & present
+        present = values != None  # noqa: E711 - elementwise on object arrays
+        return compare(values, self.value) & present
+
+
+def parse_query(text: str) -> tuple[str, list]:
+    """Split a text filter into its substring part and field predicates"""
+    predicates = []
+    rest = []
+    for token in text.split():
+        match = PREDICATE_RE.match(token)
+        if match:
+            predicate = Predicate(*match.groups())
+            # Only numbers can be ordered
+            if predicate.number is not None or predicate.op in ('=', '==', '!='):
+                predicates.append(predicate)
+                continue
+        rest.append(token)
+    if not predicates:
+        return text, []
+    return " ".join(rest), predicates
+
+
+def parse_number(value: str) -> Optional[float]:
+    """Leading number of a value ("37", "11.8v"), or None"""
+    match = NUMBER_RE.match(value)
+    return float(match.group()) if match else None
+
+
+@functools.lru_cache(maxsize=256)
+def _field_pattern(field: str) -> re.Pattern:
+    # key=value, key: value, "key": value and "key": "value"
+    return re.compile(
+        rf'(?<![\w.]){re.escape(field)}"?\s*[=:]\s*(?:"([^"]*)"|([^\s,;}}\]]+))',
+        re.IGNORECASE)
+
+
+def parse_column(messages: list, field: str) -> tuple[np.ndarray, np.ndarray]:
+    """Numeric and string columns of a field for messages"""
+    search = _field_pattern(field).search
+    count = len(messages)
+    values = np.empty(count, dtype=object)
+    numbers = np.full(count, np.nan)
+    for i, msg in enumerate(messages):
+        match = search(msg.msg)
+        if match is None:
+            continue
+        value = match.group(1)
+        if value is None:
+            value = match.group(2)
+        values[i] = value.lower()
+        number = NUMBER_RE.match(value)
+        if number:
+            numbers[i] = float(number.group())
+    return numbers, values
+
+
+class FieldStore:
+    """Typed field columns indexed by sequence ID, built on first use
+
+    ``source`` returns the stored messages in sequence order; a field's
+    column is parsed from it when a predicate first references the field
+    and extended for new messages from then on.
+    """
+
+    def __init__(self, source, capacity: int = 1024) -> None:
+        self.source = source
+        self._capacity = capacity
+        self.clear()
+
+    def clear(self):
+        """Drop all columns"""
+        self._base = 0  # sequence ID of array index 0
+        self._size = 0
+        self.numbers: dict[str, np.ndarray] = {}
+        self.values: dict[str, np.ndarray] = {}
+
+    @property
+    def fields(self) -> list:
+        """Fields parsed so far"""
+        return list(self.numbers)
+
+    def add(self, messages: list):
+        """Extend the parsed columns for messages with consecutive IDs"""
+        if not messages:
+            return
+        if not self._size:
+            self._base = messages[0].seq
+        end = self._size + len(messages)
+        for field in self.numbers:
+            numbers, values = parse_column(messages, field)
+            self._store(field, numbers, values, end)
+        self._size = end
+
+    def _store(self, field: str, numbers: np.ndarray, values: np.ndarray,
+               end: int):
+        column = self.numbers[field]
+        if end > len(column):
+            capacity = len(column)
+            while capacity < end:
+                capacity *= 2
+            grown = np.full(capacity, np.nan)
+            grown[:self._size] = column[:self._size]
+            self.numbers[field] = column = grown
+            grown_values = np.empty(capacity, dtype=object)
+            grown_values[:self._size] = self.values[field][:self._size]
+            self.values[field] = grown_values
+        column[self._size:end] = numbers
+        self.values[field][self._size:end] = values
+
+    def discard_before(self, min_seq: int):
+        """Drop values of messages trimmed from the store"""
+        drop = min(max(0, min_seq - self._base), self._size)
+        if not drop:
+            return
+        keep = self._size - drop
+        for columns in (self.numbers, self.values):
+            for column in columns.values():
+                column[:keep] = column[drop:self._size]
+                column[keep:self._size] = None if column.dtype == object else np.nan
+        self._size = keep
+        self._base += drop
+
+    def column(self, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """Numeric and string columns of a field, parsing it if needed"""
+        field = field.lower()
+        if field not in self.numbers:
+            messages = self.source()
+            if messages and not self._size:
+                self._base = messages[0].seq
+                self._size = len(messages)
+            numbers, values = parse_column(messages, field)
+            capacity = max(self._capacity, self._size)
+            self.numbers[field] = np.full(capacity, np.nan)
+            self.values[field] = np.empty(capacity, dtype=object)
+            self.numbers[field][:len(numbers)] = numbers
+            self.values[field][:len(values)] = values
+        return (self.numbers[field][:self._size],
+                self.values[field][:self._size])
+
+    def _indexes(self, messages: list) -> Optional[np.ndarray]:
+        """Column indexes of messages, or None if any is not stored"""
+        seqs = np.fromiter((-1 if m.seq is None else m.seq for m in messages),
+                           dtype=np.int64, count=len(messages))
+        index = seqs - self._base
+        if len(index) and (index.min() < 0 or index.max() >= self._size):
+            return None
+        return index
+
+    def columns_for(self, field: str, messages: list) -> tuple[np.ndarray, np.ndarray]:
+        """Numeric and string values of a field for messages"""
+        index = self._indexes(messages)
+        if index is None:
+            return parse_column(messages, field)
+        numbers, values = self.column(field)
+        return numbers[index], values[index]
+
+    def summary(self, field: str, messages: list, top: int = 10) -> dict:
+        """Presence, numeric statistics and most common values of a field"""
+        numbers, values = self.columns_for(field, messages)
+        present = values != None  # noqa: E711
+        result = {'field': field, 'messages': len(messages),
+                  'present': int(present.sum())}
+        numeric = numbers[~np.isnan(numbers)]
+        if len(numeric):
+            result.update(count=len(numeric), min=float(numeric.min()),
+                          mean=float(numeric.mean()),
+                          p50=float(np.median(numeric)),
+                          max=float(numeric.max()))
+        if result['present']:
+            unique, counts = np.unique(values[present].astype(str),
+                                       return_counts=True)
+            order = np.argsort(-counts, kind='stable')[:top]
+            result['top'] = [(str(unique[i]), int(counts[i])) for i in order]
+        else:
+            result['top'] = []
+        return result
+
+
+def filter_by_fields(predicates: list, messages: list,
+                     fields: Optional[FieldStore] = None) -> list:
+    """Messages satisfying every predicate
+
+    Stored messages are evaluated on the cached columns of ``fields``;
+    others (cold storage, headless mode) are parsed on the fly.
+    """
+    if not predicates or not messages:
+        return messages
+    mask = np.ones(len(messages), dtype=bool)
+    for predicate in predicates:
+        if fields is not None:
+            numbers, values = fields.columns_for(predicate.field, messages)
+        else:
+            numbers, values = parse_column(messages, predicate.field)
+        mask &= predicate.evaluate(numbers, values)
+    return [messages[i] for i in np.flatnonzero(mask)]
+
+
+def format_summary(summary: dict) -> str:
+    """Multi-line text of a field summary"""
+    lines = [f"{summary['field']}: in {summary['present']} of "
+             f"{summary['messages']} messages"]
+    if 'count' in summary:
+        lines.append(f"min {summary['min']:g}  mean {summary['mean']:g}  "
+                     f"p50 {summary['p50']:g}  max {summary['max']:g}")
+    for value, count in summary['top']:
+        lines.append(f"{count:>7}  {value}")
+    return "\n".join(lines)
@@ -0,0 +1,218 @@
+"""
+Headless streaming filter mode for ROS2 Console Viewer
+
+Runs the ingestion pipeline and the filter engine of the log table
+without the Textual UI and streams matching messages to stdout:
+
+    rtui-console --headless --level ERROR --level FATAL
+    rtui-console --headless --text timeout --format jsonl > timeouts.jsonl
+    rtui-console --headless --view "Nav errors" --count
+
+Output goes through a large buffer that is flushed per batch interval,
+never per line.
+"""
+import io
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from typing import Optional
+
+from .broker import BrokerClient
+from .ingest import RepeatCollapser
+from .models import LogLevel
+from .profiles import Profile
+from .ros_client import ROS2Client
+from .stats import LEVELS
+from .stats import LogStatistics
+from .synthetic import SyntheticLogGenerator
+from .views import DEFAULT_VIEWS_FILE
+from .views import FilterView
+from .views import load_views
+
+# Bytes buffered before stdout is written
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def parse_level(value: str) -> int:
+    """Level name (DEBUG, INFO, WARN, ERROR, FATAL) or number"""
+    names = {name: level for level, name in LogLevel.NAMES.items()}
+    names['WARNING'] = LogLevel.WARN
+    level = names.get(value.upper())
+    if level is not None:
+        return level
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"unknown log level: {value}") from None
+
+
+def format_text(msg) -> str:
+    """One line in the same format as ConsoleApp.save_logs"""
+    level_name = LogLevel.NAMES.get(msg.level, "UNKNOWN")
+    return f"{msg.timestamp.isoformat()} [{level_name}] {msg.name}: {msg.msg}\n"
+
+
+def format_jsonl(msg) -> str:
+    """One JSON object per line, as in LogMessage.to_dict"""
+    return json.dumps(msg.to_dict(), ensure_ascii=False) + "\n"
+
+
+FORMATTERS = {'text': format_text, 'jsonl': format_jsonl}
+
+
+class HeadlessRunner:
+    """Drain a log queue through the pipeline and the view's filters"""
+
+    def __init__(self, view: FilterView, output, output_format: str = "text",
+                 count_only: bool = False, collapse: bool = False,
+                 flush_interval: float = 0.5) -> None:
+        self.view = view
+        self.output = output
+        self.format = FORMATTERS[output_format]
+        self.count_only = count_only
+        self.flush_interval = flush_interval
+        self.statistics = LogStatistics()
+        self.repeat_collapser = RepeatCollapser(enabled=collapse)
+        self.received = 0
+        self.matched = 0
+        self.elapsed = 0.0
+
+    def process(self, messages: list):
+        """Run one batch through the pipeline and write the matches"""
+        self.received += len(messages)
+        self.statistics.add_batch(messages)
+        rows = self.repeat_collapser.process(messages)
+        matched = self.view.select(rows)
+        self.matched += len(matched)
+        if matched and not self.count_only:
+            self.output.write("".join(map(self.format, matched)))
+
+    def run(self, log_queue: queue.Queue, duration: Optional[float] = None,
+            stop_event: Optional[threading.Event] = None,
+            source: Optional[threading.Thread] = None):
+        """Process until duration passes, stop_event is set or the source
+        thread has finished and the queue is empty"""
+        start = time.perf_counter()
+        last_flush = start
+        try:
+            while True:
+                batch = []
+                try:
+                    batch.append(log_queue.get(timeout=0.1))
+                    while True:
+                        batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if batch:
+                    self.process(batch)
+
+                now = time.perf_counter()
+                if now - last_flush >= self.flush_interval:
+                    self.output.flush()
+                    last_flush = now
+                if duration is not None and now - start >= duration:
+                    break
+                if stop_event is not None and stop_event.is_set():
+                    break
+                if (not batch and source is not None
+                        and not source.is_alive() and log_queue.empty()):
+                    break
+        finally:
+            self.elapsed = time.perf_counter() - start
+
+    def stats_report(self) -> str:
+        """Per-node, per-level counts and throughput"""
+        rate = self.received / self.elapsed if self.elapsed > 0 else 0.0
+        level_names = [LogLevel.NAMES[level] for level in LEVELS]
+        rows = self.statistics.node_rows()
+        width = max([len("Node")] + [len(row[0]) for row in rows])
+        lines = [
+            f"received {self.received}, matched {self.matched} "
+            f"in {self.elapsed:.2f} s ({rate:.0f} msg/s)",
+            f"{'Node':<{width}} " + " ".join(f"{n:>7}" for n in level_names)
+            + f" {'Total':>8}",
+        ]
+        for node, counts, total, _rate, _discarded in rows:
+            lines.append(f"{node:<{width}} "
+                         + " ".join(f"{c:>7}" for c in counts)
+                         + f" {total:>8}")
+        return "\n".join(lines)
+
+
+def build_view(args) -> FilterView:
+    """Filter view from --view and the filter options"""
+    view = FilterView("headless")
+    if args.view:
+        views = load_views(args.views or DEFAULT_VIEWS_FILE)
+        view = next((v for v in views if v.name == args.view), None)
+        if view is None:
+            raise ValueError(f"no saved view named {args.view!r}")
+    if args.node:
+        view.nodes = list(args.node)
+    if args.level:
+        view.levels = [str(parse_level(level)) for level in args.level]
+    if args.min_level:
+        threshold = parse_level(args.min_level)
+        view.levels = [str(level) for level in LEVELS if level >= threshold]
+    if args.text:
+        view.text = args.text.lower()
+    if args.time_from or args.time_to:
+        view.set_time_range(args.time_from or view.time_from,
+                            args.time_to or view.time_to)
+    return view
+
+
+def run_headless(args, profile: Optional[Profile] = None) -> int:
+    """Headless entry point; returns the exit status"""
+    try:
+        view = build_view(args)
+    except (OSError, ValueError) as e:
+        print(f"rtui-console: {e}", file=sys.stderr)
+        return 2
+
+    output = io.TextIOWrapper(
+        io.BufferedWriter(io.FileIO(os.dup(sys.stdout.fileno()), 'w'),
+                          buffer_size=OUTPUT_BUFFER_SIZE),
+        encoding='utf-8', errors='replace', write_through=False)
+    runner = HeadlessRunner(view, output, output_format=args.format,
+                            count_only=args.count, collapse=args.collapse)
+    profile = profile or Profile()
+    log_queue = queue.Queue(maxsize=profile.queue_size)
+
+    source = None
+    if args.synthetic:
+        generator = SyntheticLogGenerator(rate=args.synthetic)
+        source = generator.start(log_queue, args.duration or float("inf"))
+    elif args.connect:
+        BrokerClient(log_queue, args.connect).start_subscriber()
+    else:
+        ros_client = ROS2Client(log_queue, qos_depth=profile.qos_depth)
+        if not ros_client.start_subscriber():
+            print("rtui-console: ROS2 packages not found "
+                  "(use --synthetic RATE to test)", file=sys.stderr)
+            return 1
+
+    status = 0
+    try:
+        runner.run(log_queue, duration=args.duration, source=source)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        status = 1
+    try:
+        if args.count:
+            output.write(f"{runner.matched}\n")
+        output.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head)
+        status = 1
+    if args.stats:
+        print(runner.stats_report(), file=sys.stderr)
+    try:
+        output.close()
+    except BrokenPipeError:
+        pass
+    return status
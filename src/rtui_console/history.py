@@ -0,0 +1,261 @@
+"""
+Parallel search of log files on disk
+
+Exported logs and ROS log directories (``~/.ros/log``) are split into
+byte-range chunks that worker processes scan over mmap, so a search uses
+every core. Each chunk owns the lines that start inside it; hits come
+back per chunk and are merged in timestamp order as chunks finish:
+
+    rtui-console --search "lidar timeout" --search-path ~/.ros/log
+"""
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import gzip
+import heapq
+import itertools
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+DEFAULT_SEARCH_PATH = "~/.ros/log"
+
+# Files searched when a directory is given
+LOG_SUFFIXES = (".log", ".txt", ".jsonl", ".gz")
+
+CHUNK_SIZE = 8 * 1024 * 1024
+# Hits kept in total and returned per chunk; matches are always counted
+MAX_HITS = 100_000
+# Characters of a hit line kept
+MAX_LINE_LENGTH = 1000
+
+# ISO time (save_logs, JSONL) or seconds since the epoch (ROS console
+# output "[INFO] [1700000000.123456789] [node]: ..." and launch.log)
+_TIME_RE = re.compile(
+    rb'(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?)|(?<![\d.])(\d{10}\.\d+)')
+
+
+def line_timestamp(line: bytes) -> float:
+    """Seconds since the epoch of the first timestamp in a line, 0 if none"""
+    match = _TIME_RE.search(line, 0, 200)
+    if match is None:
+        return 0.0
+    if match.group(2):
+        return float(match.group(2))
+    try:
+        return datetime.fromisoformat(match.group(1).decode()).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def search_files(paths: list) -> list:
+    """Files to search: given files, and log files under given directories"""
+    files = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            for root, _dirs, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names)
+                             if name.endswith(LOG_SUFFIXES))
+        elif os.path.isfile(path):
+            files.append(path)
+        else:
+            raise ValueError(f"{path}: no such file or directory")
+    return files
+
+
+def plan_chunks(files: list, chunk_size: int = CHUNK_SIZE) -> list:
+    """(path, start, end) byte ranges covering the files
+
+    Compressed files cannot be split and are one chunk (end -1).
+    """
+    chunks = []
+    for path in files:
+        size = os.path.getsize(path)
+        if path.endswith(".gz"):
+            chunks.append((path, 0, -1))
+            continue
+        for start in range(0, size, chunk_size):
+            chunks.append((path, start, min(start + chunk_size, size)))
+    return chunks
+
+
+def compile_query(query: str, regex: bool = False,
+                  ignore_case: bool = True) -> re.Pattern:
+    """Bytes pattern for a search string or regular expression"""
+    flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+    source = query if regex else re.escape(query)
+    return re.compile(source.encode('utf-8'), flags)
+
+
+def _hit(path: str, offset: int, line: bytes) -> tuple:
+    text = line[:MAX_LINE_LENGTH].decode('utf-8', 'replace').rstrip("\r")
+    return (line_timestamp(line), path, offset, text)
+
+
+def _search_gzip(path: str, pattern: re.Pattern, max_hits: int) -> tuple[int, list]:
+    matches = 0
+    hits = []
+    offset = 0
+    with gzip.open(path, 'rb') as f:
+        for line in f:
+            if pattern.search(line):
+                matches += 1
+                if len(hits) < max_hits:
+                    hits.append(_hit(path, offset, line.rstrip(b"\n")))
+            offset += len(line)
+    return matches, hits
+
+
+def search_chunk(path: str, start: int, end: int, pattern: re.Pattern,
+                 max_hits: int = MAX_HITS) -> tuple[int, list]:
+    """(match count, hits) for the lines starting in [start, end)
+
+    Runs in a worker process. A line counts once however often it
+    matches; hits are (timestamp, path, offset, line) in file order.
+    """
+    if end < 0:
+        return _search_gzip(path, pattern, max_hits)
+    matches = 0
+    hits = []
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or start >= size:
+            return 0, []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Lines that started in the previous chunk are its own
+            if start > 0 and mm[start - 1] != 0x0A:
+                newline = mm.find(b"\n", start, end)
+                if newline < 0:
+                    return 0, []
+                start = newline + 1
+            # Finish the last line even past the chunk end
+            if end < size and mm[end - 1] != 0x0A:
+                newline = mm.find(b"\n", end)
+                end = size if newline < 0 else newline + 1
+            search = pattern.search
+            pos = start
+            while pos < end:
+                match = search(mm, pos, end)
+                if match is None:
+                    break
+                line_start = mm.rfind(b"\n", 0, match.start()) + 1
+                line_end = mm.find(b"\n", match.start(), end)
+                if line_end < 0:
+                    line_end = end
+                matches += 1
+                if len(hits) < max_hits:
+                    hits.append(_hit(path, line_start, mm[line_start:line_end]))
+                pos = line_end + 1
+    return matches, hits
+
+
+def create_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool for searches, with its workers started
+
+    Workers are spawned so they do not inherit the UI and ROS threads.
+    Spawning needs the real stderr (for multiprocessing's resource
+    tracker), so a pool used from the UI is created before it starts.
+    """
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+    # Workers are spawned on demand, one per task without an idle worker
+    for future in [executor.submit(int) for _ in range(workers)]:
+        future.result()
+    return executor
+
+
+class HistorySearch:
+    """A search over log files, run chunk by chunk in a process pool
+
+    ``hits`` holds up to ``max_hits`` hit tuples in timestamp order (the
+    earliest ones once there are more) and is replaced, never mutated,
+    so other threads can read it while the search runs.
+    """
+
+    def __init__(self, paths: list, query: str, regex: bool = False,
+                 ignore_case: bool = True, workers: Optional[int] = None,
+                 chunk_size: int = CHUNK_SIZE, max_hits: int = MAX_HITS) -> None:
+        self.query = query
+        self.pattern = compile_query(query, regex, ignore_case)
+        self.files = search_files(paths)
+        self.chunks = plan_chunks(self.files, chunk_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_hits = max_hits
+        self.total_bytes = sum(os.path.getsize(path) for path in self.files)
+        self.hits = []
+        self.matches = 0
+        self.bytes_done = 0
+        self.chunks_done = 0
+        self.elapsed = 0.0
+        self.finished = False
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop after the chunks being scanned; queued chunks are dropped"""
+        self._cancelled.set()
+
+    def run(self, progress: Optional[Callable] = None,
+            executor: Optional[ProcessPoolExecutor] = None):
+        """Scan all chunks, calling progress(self) as each one finishes
+
+        A search without an executor runs in its own pool of ``workers``.
+        """
+        started = time.perf_counter()
+        own_executor = executor is None
+        if own_executor:
+            executor = create_executor(self.workers)
+        futures = {}
+        try:
+            for path, start, end in self.chunks:
+                future = executor.submit(search_chunk, path, start, end,
+                                         self.pattern, self.max_hits)
+                futures[future] = (end - start) if end >= 0 else os.path.getsize(path)
+            for future in as_completed(futures):
+                if self.cancelled:
+                    break
+                matches, hits = future.result()
+                self.matches += matches
+                if hits:
+                    hits.sort()
+                    merged = heapq.merge(self.hits, hits)
+                    self.hits = list(itertools.islice(merged, self.max_hits))
+                self.bytes_done += futures[future]
+                self.chunks_done += 1
+                self.elapsed = time.perf_counter() - started
+                if progress is not None:
+                    progress(self)
+        finally:
+            for future in futures:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            self.elapsed = time.perf_counter() - started
+            self.finished = True
+        return self
+
+    def status(self) -> str:
+        """One-line progress"""
+        state = "cancelled" if self.cancelled else (
+            "done" if self.finished else "searching")
+        rate = self.bytes_done / self.elapsed / 1e6 if self.elapsed else 0.0
+        return (f"{state}: {self.matches:,} matching lines, "
+                f"{self.chunks_done}/{len(self.chunks)} chunks of "
+                f"{len(self.files)} files, {self.bytes_done / 1e6:,.0f}/"
+                f"{self.total_bytes / 1e6:,.0f} MB, {rate:,.0f} MB/s, "
+                f"{self.workers} workers")
+
+
+def format_hit(hit: tuple) -> str:
+    """One line for a hit: file and line"""
+    _timestamp, path, _offset, line = hit
+    return f"{path}: {line}"
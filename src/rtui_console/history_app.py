@@ -0,0 +1,131 @@
+"""
+History search application for ROS2 Console Viewer
+"""
+import threading
+from typing import Optional
+
+from textual import on
+from textual.app import App
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.widgets import Footer
+from textual.widgets import Header
+from textual.widgets import Input
+
+from .history import create_executor
+from .history import HistorySearch
+from .widgets import HistoryPanel
+
+
+class HistorySearchApp(App):
+    """Search log files in parallel, listing hits as chunks finish"""
+
+    CSS = """
+    #history_query {
+        dock: top;
+        display: none;
+    }
+
+    #history_query.visible {
+        display: block;
+    }
+    """
+
+    TITLE = "ROS2 Console Viewer - History Search"
+    BINDINGS = [
+        Binding("slash", "new_search", "Search", key_display="/"),
+        Binding("c", "cancel", "Cancel", key_display="c"),
+        Binding("escape", "close_prompt", "Close", show=False),
+        Binding("q", "quit", "Quit", key_display="q"),
+    ]
+
+    # Interval of table refreshes while a search runs
+    REFRESH_INTERVAL = 0.3
+
+    def __init__(self, paths: list, query: Optional[str] = None,
+                 regex: bool = False, ignore_case: bool = True,
+                 workers: Optional[int] = None):
+        super().__init__()
+        self.paths = paths
+        self.initial_query = query
+        self.regex = regex
+        self.ignore_case = ignore_case
+        self.jobs = workers
+        # Started here, before the UI takes over stderr
+        self.executor = create_executor(workers)
+        self.search = None
+        self.history_panel = HistoryPanel(id="history")
+        self.query_input = Input(
+            placeholder="Search log files (regex)" if regex else
+            "Search log files, Esc to cancel",
+            id="history_query")
+
+    def compose(self) -> ComposeResult:
+        yield Header()
+        yield self.query_input
+        yield self.history_panel
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.sub_title = ", ".join(self.paths)
+        self.set_interval(self.REFRESH_INTERVAL, self._refresh_results)
+        if self.initial_query:
+            self.history_panel.table.focus()
+            self.start_search(self.initial_query)
+        else:
+            self.action_new_search()
+
+    def start_search(self, query: str):
+        """Cancel a running search and start one for query"""
+        if self.search is not None:
+            self.search.cancel()
+        try:
+            search = HistorySearch(self.paths, query, self.regex,
+                                   self.ignore_case, self.jobs)
+        except (OSError, ValueError) as e:  # re.error is a ValueError
+            self.notify(f"Search error: {e}", severity="error")
+            return
+        self.search = search
+
+        def run():
+            try:
+                search.run(executor=self.executor)
+            except Exception as e:  # worker process failures
+                self.call_from_thread(
+                    self.notify, f"Search error: {e}", severity="error")
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _refresh_results(self):
+        if self.search is None:
+            return
+        self.history_panel.set_status(f"{self.search.query!r} {self.search.status()}")
+        self.history_panel.update_hits(self.search.hits)
+
+    def action_new_search(self) -> None:
+        """Show the search prompt"""
+        self.query_input.add_class("visible")
+        self.query_input.focus()
+
+    def action_close_prompt(self) -> None:
+        """Hide the search prompt"""
+        self.query_input.remove_class("visible")
+        self.history_panel.table.focus()
+
+    @on(Input.Submitted, "#history_query")
+    def on_query_submitted(self, event: Input.Submitted) -> None:
+        """Search for the entered text"""
+        self.action_close_prompt()
+        if event.value:
+            self.start_search(event.value)
+
+    def action_cancel(self) -> None:
+        """Stop the running search, keeping the hits so far"""
+        if self.search is not None and not self.search.finished:
+            self.search.cancel()
+            self.notify("Search cancelled", timeout=2)
+
+    def on_unmount(self) -> None:
+        if self.search is not None:
+            self.search.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,289 @@
+"""
+Secondary indexes over the log store
+"""
+from bisect import bisect_left
+from bisect import bisect_right
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+# Accepted time-of-day formats for jump-to-time and time range filters
+_TIME_FORMATS = ("%H:%M:%S.%f", "%H:%M:%S", "%H:%M")
+
+
+def parse_timestamp(text: str,
+                    reference: Optional[datetime] = None) -> Optional[datetime]:
+    """Parse an ISO datetime or a time of day like 14:03:21.500
+
+    A bare time of day is placed on the date of ``reference`` (today if
+    not given). Returns None for empty or unparseable text.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    for fmt in _TIME_FORMATS:
+        try:
+            time_of_day = datetime.strptime(text, fmt).time()
+        except ValueError:
+            continue
+        day = (reference or datetime.now()).date()
+        return datetime.combine(day, time_of_day)
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return None
+
+
+class TimeIndex:
+    """Messages' sequence IDs sorted by timestamp
+
+    /rosout delivers stamps slightly out of order, so late arrivals are
+    inserted at their sorted position; in-order arrivals are appended.
+    """
+
+    def __init__(self) -> None:
+        self._keys: list[float] = []
+        self._seqs: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, timestamp: datetime, seq: int):
+        """Index one message"""
+        key = timestamp.timestamp()
+        if not self._keys or key >= self._keys[-1]:
+            self._keys.append(key)
+            self._seqs.append(seq)
+        else:
+            i = bisect_right(self._keys, key)
+            self._keys.insert(i, key)
+            self._seqs.insert(i, seq)
+
+    def discard_before(self, min_seq: int):
+        """Drop entries for messages trimmed from the store"""
+        kept = [(key, seq) for key, seq in zip(self._keys, self._seqs)
+                if seq >= min_seq]
+        self._keys = [key for key, _ in kept]
+        self._seqs = [seq for _, seq in kept]
+
+    def clear(self):
+        """Drop all entries"""
+        self._keys.clear()
+        self._seqs.clear()
+
+    def seek(self, timestamp: datetime) -> int:
+        """Index position of the first message at or after timestamp"""
+        return bisect_left(self._keys, timestamp.timestamp())
+
+    def seq_at(self, position: int) -> int:
+        """Sequence ID at an index position"""
+        return self._seqs[position]
+
+    def seqs_between(self, start: Optional[datetime],
+                     end: Optional[datetime]) -> list:
+        """Sequence IDs with start <= timestamp <= end (open ends allowed)"""
+        lo = 0 if start is None else bisect_left(
+            self._keys, start.timestamp())
+        hi = len(self._keys) if end is None else bisect_right(
+            self._keys, end.timestamp())
+        return self._seqs[lo:hi]
+
+
+class NodeIndex:
+    """Messages' sequence IDs per node, in arrival order
+
+    Used to find a message's neighbors from the same node in
+    O(log n + N) instead of scanning the store.
+    """
+
+    def __init__(self) -> None:
+        self._seqs: dict[str, list] = {}
+
+    def add(self, messages: list):
+        """Index messages appended to the store"""
+        seqs = self._seqs
+        for msg in messages:
+            node_seqs = seqs.get(msg.name)
+            if node_seqs is None:
+                node_seqs = seqs[msg.name] = []
+            node_seqs.append(msg.seq)
+
+    def discard_before(self, min_seq: int):
+        """Drop entries for messages trimmed from the store"""
+        for name, node_seqs in list(self._seqs.items()):
+            cut = bisect_left(node_seqs, min_seq)
+            if cut == len(node_seqs):
+                del self._seqs[name]
+            elif cut:
+                del node_seqs[:cut]
+
+    def clear(self):
+        """Drop all entries"""
+        self._seqs.clear()
+
+    def neighbors(self, name: str, seq: int, before: int,
+                  after: int) -> tuple[list, list]:
+        """Sequence IDs of up to ``before``/``after`` messages from the
+        same node around seq, oldest first"""
+        node_seqs = self._seqs.get(name)
+        if not node_seqs:
+            return [], []
+        i = bisect_left(node_seqs, seq)
+        j = i + 1 if i < len(node_seqs) and node_seqs[i] == seq else i
+        return node_seqs[max(0, i - before):i], node_seqs[j:j + after]
+
+
+class SortKeys:
+    """Per-message sort keys in NumPy arrays, indexed by sequence ID
+
+    Node names are interned to IDs in arrival order; ``node_rank`` maps an
+    ID to the rank of its name so sorting by node sorts by name. The
+    template ID column (-1 for none) is only used by aggregation queries.
+    """
+
+    COLUMNS = ("time", "level", "node")
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = capacity
+        self.clear()
+
+    def clear(self):
+        """Drop all keys"""
+        self.node_names: list[str] = []
+        self._node_ids: dict[str, int] = {}
+        self._node_rank: Optional[np.ndarray] = None
+        self._base = 0  # sequence ID of array index 0
+        self._size = 0
+        self.node = np.zeros(self._capacity, dtype=np.int32)
+        self.level = np.zeros(self._capacity, dtype=np.int16)
+        self.time = np.zeros(self._capacity, dtype=np.float64)
+        self.template = np.zeros(self._capacity, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int):
+        capacity = len(self.node)
+        while capacity < needed:
+            capacity *= 2
+        for name in ("node", "level", "time", "template"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _intern(self, name: str) -> int:
+        node_id = self._node_ids.get(name)
+        if node_id is None:
+            node_id = self._node_ids[name] = len(self.node_names)
+            self.node_names.append(name)
+            self._node_rank = None
+        return node_id
+
+    def add(self, messages: list):
+        """Append keys for messages with consecutive sequence IDs"""
+        if not messages:
+            return
+        if not self._size:
+            self._base = messages[0].seq
+        count = len(messages)
+        end = self._size + count
+        if end > len(self.node):
+            self._grow(end)
+        intern = self._intern
+        self.node[self._size:end] = np.fromiter(
+            (intern(m.name) for m in messages), dtype=np.int32, count=count)
+        self.level[self._size:end] = np.fromiter(
+            (m.level for m in messages), dtype=np.int16, count=count)
+        self.time[self._size:end] = np.fromiter(
+            (m.timestamp.timestamp() for m in messages),
+            dtype=np.float64, count=count)
+        self.template[self._size:end] = np.fromiter(
+            (-1 if m.template is None else m.template.id for m in messages),
+            dtype=np.int32, count=count)
+        self._size = end
+
+    def discard_before(self, min_seq: int):
+        """Drop keys of messages trimmed from the store"""
+        drop = min(max(0, min_seq - self._base), self._size)
+        if not drop:
+            return
+        keep = self._size - drop
+        for array in (self.node, self.level, self.time, self.template):
+            array[:keep] = array[drop:self._size]
+        self._size = keep
+        self._base += drop
+
+    def node_rank(self) -> np.ndarray:
+        """Rank of each node ID's name in sorted name order"""
+        if self._node_rank is None:
+            order = sorted(range(len(self.node_names)),
+                           key=self.node_names.__getitem__)
+            rank = np.empty(len(order), dtype=np.int32)
+            rank[order] = np.arange(len(order), dtype=np.int32)
+            self._node_rank = rank
+        return self._node_rank
+
+    def column(self, name: str, seqs: Optional[np.ndarray] = None) -> np.ndarray:
+        """Values of a column for all stored messages, or for seqs"""
+        array = getattr(self, name)
+        if seqs is None:
+            return array[:self._size]
+        return array[seqs - self._base]
+
+    def keys(self, column: str, seqs: np.ndarray) -> np.ndarray:
+        """Sort keys of one column for the given sequence IDs"""
+        index = seqs - self._base
+        if column == "node":
+            return self.node_rank()[self.node[index]]
+        if column == "level":
+            return self.level[index]
+        return self.time[index]
+
+
+class SortedOrder:
+    """Stable sort permutation of a view's result set for one column
+
+    Kept up to date incrementally: rows trimmed from the front of the view
+    are dropped from the permutation and appended rows are merged in, so
+    only a full rebuild of the view triggers a complete sort.
+    """
+
+    def __init__(self, column: str) -> None:
+        self.column = column
+        self.order = np.empty(0, dtype=np.intp)  # positions, ascending keys
+        self._keys = np.empty(0)  # keys in that order
+        self._epoch = None
+        self._trimmed = 0
+        self._count = 0
+
+    def update(self, view, key_func) -> np.ndarray:
+        """Bring the permutation up to date with view and return it
+
+        ``key_func(messages)`` returns a key array for a list of messages.
+        """
+        messages = view.messages
+        if self._epoch != view.epoch:
+            keys = key_func(messages)
+            order = np.argsort(keys, kind="stable")
+            self.order, self._keys = order, keys[order]
+        else:
+            cut = view.trimmed - self._trimmed
+            if cut:
+                keep = self.order >= cut
+                self.order = self.order[keep] - cut
+                self._keys = self._keys[keep]
+                self._count -= cut
+            if len(messages) > self._count:
+                # Merge: later arrivals go after equal keys, keeping it stable
+                new_keys = key_func(messages[self._count:])
+                new_order = np.argsort(new_keys, kind="stable")
+                new_keys = new_keys[new_order]
+                at = np.searchsorted(self._keys, new_keys, side="right")
+                self.order = np.insert(self.order, at, new_order + self._count)
+                self._keys = np.insert(self._keys, at, new_keys)
+        self._epoch = view.epoch
+        self._trimmed = view.trimmed
+        self._count = len(messages)
+        return self.order
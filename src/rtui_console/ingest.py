@@ -0,0 +1,294 @@
+"""
+Ingestion pipeline stages for ROS2 Console Viewer
+
+OverloadSampler runs on the receiving thread in front of the log queue.
+The other stages run on the UI thread on each batch drained from the log
+queue, before messages are added to the table store.
+"""
+from collections import deque
+import math
+import queue
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from .metrics import METRICS
+from .models import LogLevel
+from .models import LogMessage
+
+# Numbers (integers, decimals, hex) are treated as template parameters
+_NUMBER_RE = re.compile(r'0x[0-9a-fA-F]+|\d+(?:\.\d+)?')
+
+
+def message_template(text: str) -> str:
+    """Normalize a message so lines differing only in numbers compare equal"""
+    return _NUMBER_RE.sub('#', text)
+
+
+class RepeatCollapser:
+    """Fold repeated messages into a single row with a counter
+
+    Messages with the same (node, level, template) key, where the template
+    is the mined template ID when available, that arrive within
+    ``window`` seconds of the previous repeat are folded into the first
+    message instead of becoming new rows. The window slides with each
+    repeat, so a storm stays one row for as long as it lasts; a repeat
+    after a gap longer than the window starts a new row.
+    """
+
+    # Number of individual repeats kept per row for LogDetailPanel
+    MAX_KEPT_REPEATS = 100
+
+    def __init__(self, window: float = 1.0, enabled: bool = True) -> None:
+        self.window = window
+        self.enabled = enabled
+        self._groups: dict[tuple, LogMessage] = {}
+        self._collapsed = METRICS.counter("ingest.collapsed")
+
+    def process(self, messages: list) -> list:
+        """Fold repeats in a batch and return the messages that need new rows"""
+        if not self.enabled or not messages:
+            return messages
+
+        groups = self._groups
+        window = self.window
+        new_rows = []
+        for msg in messages:
+            template = msg.template
+            key = (msg.name, msg.level,
+                   template.id if template is not None
+                   else message_template(msg.msg))
+            head = groups.get(key)
+            # Within the window of the group's span, either side of it
+            if (head is not None and
+                    (msg.timestamp - head.last_seen).total_seconds() <= window and
+                    (head.timestamp - msg.timestamp).total_seconds() <= window):
+                self._fold(head, msg)
+                continue
+            groups[key] = msg
+            new_rows.append(msg)
+
+        self._collapsed.inc(len(messages) - len(new_rows))
+        self._expire(messages[-1].timestamp)
+        return new_rows
+
+    def _fold(self, head: LogMessage, msg: LogMessage):
+        """Record msg as a repeat of head"""
+        if head.repeats is None:
+            head.repeats = deque(maxlen=self.MAX_KEPT_REPEATS)
+        head.repeat_count += msg.repeat_count
+        head.repeats.append((msg.timestamp, msg.msg))
+        if msg.last_seen > head.last_seen:
+            head.last_timestamp = msg.last_seen
+
+    def _expire(self, latest):
+        """Forget groups whose window has closed"""
+        window = self.window
+        expired = [key for key, head in self._groups.items()
+                   if (latest - head.last_seen).total_seconds() > window]
+        for key in expired:
+            del self._groups[key]
+
+    def reset(self):
+        """Forget all open groups (e.g. after the store was cleared)"""
+        self._groups.clear()
+
+
+class OverloadSampler:
+    """Sample DEBUG/INFO per node when ingest exceeds what the viewer keeps
+
+    Every message received goes through ``offer``, which puts it on the log
+    queue or discards it. Once per ``window`` seconds the arrivals of the
+    last window are compared with the current limit (messages/s): while
+    over it, DEBUG and INFO of each node are kept 1 in N, with N chosen so
+    the heaviest producers give up the most and light nodes are kept in
+    full. WARN and above are never sampled, nor are messages for which
+    ``exempt(msg)`` is true (e.g. alert matches); it is only called for
+    messages that would otherwise be discarded.
+
+    The limit is ``budget`` when set. It is halved whenever the log queue
+    is more than half full at the end of a window and grows back once the
+    queue has drained, so sampling also starts when the UI falls behind a
+    rate below the budget (budget 0 relies on the queue alone).
+
+    Received and discarded counts per (node, level) are exact; discards
+    since the last ``drain`` are handed to LogStatistics so its totals
+    stay those of the received stream.
+    """
+
+    # Queue fill (fraction of maxsize) that lowers and raises the limit
+    HIGH_WATER = 0.5
+    LOW_WATER = 0.1
+    # Lowest limit the queue can push the sampler down to, in messages/s
+    MIN_LIMIT = 100
+
+    def __init__(self, budget: int = 0, enabled: bool = True,
+                 window: float = 1.0,
+                 exempt: Optional[Callable[[LogMessage], bool]] = None) -> None:
+        self.budget = budget
+        self.enabled = enabled
+        self.window = window
+        self.exempt = exempt
+        # Current limit in messages/s; None while not sampling
+        self.limit: Optional[float] = None
+        self.received: dict[tuple, int] = {}  # (node, level) -> count
+        self.discarded: dict[tuple, int] = {}
+        self._pending: dict[tuple, int] = {}  # discards not yet drained
+        self._strides: dict[str, int] = {}  # node -> keep 1 in N of DEBUG/INFO
+        self._phase: dict[tuple, int] = {}  # (node, level) -> DEBUG/INFO seen
+        self._arrivals: dict[str, list] = {}  # node -> [DEBUG/INFO, WARN+]
+        self._window_start = time.monotonic()
+        self._lock = threading.Lock()
+        self._received = METRICS.counter("ingest.received")
+        self._dropped = METRICS.counter("ingest.dropped")
+        self._sampled = METRICS.counter("ingest.sampled")
+        self._limit_gauge = METRICS.gauge("ingest.sample_limit")
+
+    def offer(self, log_queue: queue.Queue, msg: LogMessage) -> bool:
+        """Queue msg unless it is sampled out; returns whether it was queued
+
+        On a full queue a DEBUG/INFO message is discarded itself, while
+        WARN and above (and exempt messages) replace the oldest queued
+        message.
+        """
+        key = (msg.name, msg.level)
+        low = msg.level < LogLevel.WARN
+        exempt = self.exempt
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window:
+                self._update_limit(log_queue, now)
+            self._received.inc()
+            self.received[key] = self.received.get(key, 0) + 1
+            arrivals = self._arrivals.get(msg.name)
+            if arrivals is None:
+                arrivals = self._arrivals[msg.name] = [0, 0]
+            arrivals[0 if low else 1] += 1
+            if low and self._strides:
+                stride = self._strides.get(msg.name, 1)
+                if stride > 1:
+                    phase = self._phase.get(key, 0)
+                    self._phase[key] = phase + 1
+                    if phase % stride and not (exempt and exempt(msg)):
+                        self._sampled.inc()
+                        self._discard(key)
+                        return False
+
+        try:
+            log_queue.put(msg, block=False)
+            return True
+        except queue.Full:
+            pass
+        with self._lock:
+            self._dropped.inc()
+            if low and not (exempt and exempt(msg)):
+                self._discard(key)
+                return False
+            try:
+                oldest = log_queue.get_nowait()
+                self._discard((oldest.name, oldest.level))
+                log_queue.put(msg, block=False)
+                return True
+            except (queue.Empty, queue.Full):
+                self._discard(key)
+                return False
+
+    def discard(self, messages):
+        """Record queued messages the viewer dropped afterwards
+        (e.g. evicted from the paused backlog)"""
+        with self._lock:
+            for msg in messages:
+                self._discard((msg.name, msg.level))
+
+    def _discard(self, key: tuple):
+        self.discarded[key] = self.discarded.get(key, 0) + 1
+        self._pending[key] = self._pending.get(key, 0) + 1
+
+    def _update_limit(self, log_queue: queue.Queue, now: float):
+        """Adjust the limit from the closed window and set per-node strides"""
+        elapsed = now - self._window_start
+        arrivals = self._arrivals
+        self._arrivals = {}
+        self._window_start = now
+        if not self.enabled:
+            return
+        rate = sum(low + high for low, high in arrivals.values()) / elapsed
+        fill = log_queue.qsize() / log_queue.maxsize if log_queue.maxsize > 0 else 0.0
+        limit = self.limit
+        if fill >= self.HIGH_WATER:
+            limit = max(min(limit or rate, rate) / 2, self.MIN_LIMIT)
+        elif limit is not None and fill <= self.LOW_WATER:
+            limit *= 1.25
+        if self.budget:
+            limit = min(limit or self.budget, self.budget)
+        elif limit is not None and limit >= 2 * rate:
+            limit = None  # well below what the viewer kept up with
+        self.limit = limit
+        self._limit_gauge.set(int(limit or 0))
+
+        if limit is None or rate <= limit:
+            self._strides = {}
+            return
+        self._strides = self._fair_strides(arrivals, limit * elapsed)
+
+    @staticmethod
+    def _fair_strides(arrivals: dict, capacity: float) -> dict:
+        """Strides keeping at most capacity messages, heaviest nodes first
+
+        WARN and above are kept in full; the rest of the capacity is split
+        so every node keeps min(its DEBUG/INFO, cap) for the largest cap
+        that fits (at least one message per node).
+        """
+        counts = sorted((low, node) for node, (low, _high) in arrivals.items() if low)
+        if not counts:
+            return {}
+        remaining = max(capacity - sum(high for _low, high in arrivals.values()),
+                        len(counts))
+        cap = None
+        for i, (low, _node) in enumerate(counts):
+            share = remaining / (len(counts) - i)
+            if low > share:
+                cap = share
+                break
+            remaining -= low
+        if cap is None:
+            return {}
+        return {node: math.ceil(low / cap) for low, node in counts if low > cap}
+
+    def strides(self) -> dict:
+        """Current 1-in-N stride of each sampled node"""
+        with self._lock:
+            # Strides are only updated by arriving messages
+            if time.monotonic() - self._window_start >= 2 * self.window:
+                return {}
+            return dict(self._strides)
+
+    def drain(self) -> dict:
+        """Discards per (node, level) since the previous drain"""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        return pending
+
+    def totals(self) -> tuple[int, int]:
+        """(received, kept) since the last reset"""
+        with self._lock:
+            received = sum(self.received.values())
+            return received, received - sum(self.discarded.values())
+
+    def summary(self) -> str:
+        """One-line sampling state"""
+        received, kept = self.totals()
+        strides = self.strides()
+        limit = self.limit
+        state = (f"sampling DEBUG/INFO of {len(strides)} nodes at "
+                 f"{limit:,.0f} msg/s" if strides and limit else "not sampling")
+        return f"{state}, kept {kept:,} of {received:,}"
+
+    def reset_counts(self):
+        """Forget received and discarded counts (e.g. after a clear)"""
+        with self._lock:
+            self.received.clear()
+            self.discarded.clear()
+            self._pending.clear()
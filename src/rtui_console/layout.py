@@ -0,0 +1,101 @@
+"""
+Multi-line row layout for the log table
+
+Tracebacks and long payloads can be expanded into multi-line rows. The
+wrapped lines of a message depend only on its text and the width of the
+Message column, so they are computed once per message and cached until
+the width changes. Row positions are looked up in a prefix sum of row
+heights instead of walking every row above.
+"""
+import re
+
+import numpy as np
+from rich.cells import chop_cells
+
+# Control characters other than newline and tab are dropped
+_CONTROL_RE = re.compile(r'[^\x20-\x7E\u00A0-\uFFFF\n\t]')
+
+
+def is_multiline(text: str) -> bool:
+    """Whether a message has more than one line"""
+    return "\n" in text.rstrip("\n")
+
+
+def wrap_lines(text: str, width: int, max_lines: int) -> list:
+    """Lines of text wrapped to width cells, at most max_lines
+
+    A message cut off at max_lines ends with a line giving the count of
+    lines left out.
+    """
+    width = max(width, 1)
+    text = _CONTROL_RE.sub('', text.rstrip("\n")).expandtabs(4)
+    lines = []
+    source = text.split("\n")
+    for i, line in enumerate(source):
+        chunks = chop_cells(line, width) if line else [""]
+        lines.extend(chunks)
+        if len(lines) > max_lines:
+            rest = len(source) - i - 1
+            del lines[max_lines - 1:]
+            lines.append(f"… ({rest} more lines)" if rest else "…")
+            break
+    return lines
+
+
+class LayoutCache:
+    """Wrapped lines of expanded messages by sequence ID, for one width"""
+
+    def __init__(self, max_lines: int = 200, max_entries: int = 10000) -> None:
+        self.max_lines = max_lines
+        self.max_entries = max_entries
+        self.width = 0
+        self._lines: dict[int, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def set_width(self, width: int) -> bool:
+        """Use a new wrap width; returns whether the cache was invalidated"""
+        if width == self.width:
+            return False
+        self.width = width
+        self._lines.clear()
+        return True
+
+    def lines(self, seq: int, text: str) -> list:
+        """Wrapped lines of a message, computed on first use"""
+        lines = self._lines.get(seq)
+        if lines is None:
+            if len(self._lines) >= self.max_entries:
+                self._lines.clear()
+            lines = self._lines[seq] = wrap_lines(text, self.width, self.max_lines)
+        return lines
+
+    def clear(self):
+        """Drop all layouts"""
+        self._lines.clear()
+
+
+class RowOffsets:
+    """Prefix sum of row heights: y offset of a row and row at a y offset"""
+
+    def __init__(self, heights=()) -> None:
+        self.heights = np.asarray(heights, dtype=np.int64)
+        # ends[i] is the y just below row i
+        self.ends = np.cumsum(self.heights)
+
+    @property
+    def total(self) -> int:
+        """Height of all rows"""
+        return int(self.ends[-1]) if len(self.ends) else 0
+
+    def offset(self, row: int) -> int:
+        """y offset of the top of a row"""
+        return int(self.ends[row] - self.heights[row])
+
+    def locate(self, y: int) -> tuple[int, int]:
+        """(row, line within the row) at a y offset"""
+        if not 0 <= y < self.total:
+            raise LookupError(f"y {y} outside 0..{self.total}")
+        row = int(np.searchsorted(self.ends, y, side='right'))
+        return row, y - self.offset(row)
@@ -3,14 +3,246 @@
 ROS2 Console Viewer - TUI version of rqt_console using Textual
 Entry point for the application
 """
-from .app import ConsoleApp
+import time
+
+_LAUNCH_TIME = time.perf_counter()
+
+import argparse
+import sys
+
+from .defaults import DEFAULT_BROKER_ADDRESS
+from .defaults import DEFAULT_SNAPSHOT_FILE
+from .metrics import StartupProfile
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        prog="rtui-console",
+        description="ROS2 console viewer with TUI interface")
+    parser.add_argument(
+        "--metrics-file", metavar="PATH",
+        help="periodically write runtime metrics to this JSON file")
+    parser.add_argument(
+        "--metrics-interval", type=float, default=5.0, metavar="SECONDS",
+        help="interval between metrics file writes (default: 5.0)")
+    parser.add_argument(
+        "--startup-profile", action="store_true",
+        help="print import and first-paint timings on exit")
+    parser.add_argument(
+        "--views", metavar="PATH",
+        help="YAML file of saved filter views "
+             "(default: ~/.config/rtui_console/views.yaml)")
+    parser.add_argument(
+        "--snapshot", metavar="PATH",
+        help="session snapshot written on quit and restored on startup "
+             "(default: ~/.cache/rtui_console/session.snap)")
+    parser.add_argument(
+        "--snapshot-interval", type=float, default=0.0, metavar="SECONDS",
+        help="also write the snapshot every SECONDS in the background (default: off)")
+    parser.add_argument(
+        "--no-snapshot", action="store_true",
+        help="neither restore nor write a session snapshot")
+    parser.add_argument(
+        "--profile", metavar="NAME",
+        help="performance profile: laptop, robot-onboard-lowmem, "
+             "post-mortem-bigbuffer or one from --profiles")
+    parser.add_argument(
+        "--profiles", metavar="PATH",
+        help="YAML file of extra performance profiles "
+             "(default: ~/.config/rtui_console/profiles.yaml)")
+    parser.add_argument(
+        "--alert", action="append", default=[], metavar="PATTERN",
+        help="watch for PATTERN in messages (repeatable, '!PATTERN' rings the bell)")
+    parser.add_argument(
+        "--alert-rate-limit", type=float, default=5.0, metavar="SECONDS",
+        help="minimum interval between notifications per pattern (default: 5.0)")
+
+    broker = parser.add_argument_group(
+        "broker", "share one /rosout subscription between several viewers")
+    broker.add_argument(
+        "--broker", nargs="?", const=DEFAULT_BROKER_ADDRESS, metavar="ADDRESS",
+        help="serve /rosout on a Unix socket path or [HOST]:PORT "
+             f"(default: {DEFAULT_BROKER_ADDRESS})")
+    broker.add_argument(
+        "--connect", nargs="?", const=DEFAULT_BROKER_ADDRESS, metavar="ADDRESS",
+        help="read messages from a broker instead of subscribing to /rosout")
+    broker.add_argument(
+        "--broker-backlog", type=int, default=10000, metavar="COUNT",
+        help="messages replayed to each viewer on connect (default: 10000)")
+
+    compare = parser.add_argument_group(
+        "run comparison", "diff the message templates of two recordings")
+    compare.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+        help="compare two recordings (JSONL exports, .db3 files or bag "
+             "directories); with --headless the diff is printed")
+    compare.add_argument(
+        "--compare-limit", type=int, default=50, metavar="COUNT",
+        help="entries printed with --compare --headless (default: 50)")
+
+    history = parser.add_argument_group(
+        "history search", "search log files on disk in parallel")
+    history.add_argument(
+        "--search", metavar="PATTERN",
+        help="search log files for PATTERN (case-insensitive); with "
+             "--headless the matching lines are printed in timestamp order")
+    history.add_argument(
+        "--search-path", action="append", metavar="PATH",
+        help="file or directory to search (repeatable, default: ~/.ros/log)")
+    history.add_argument(
+        "--regex", action="store_true",
+        help="treat PATTERN as a regular expression")
+    history.add_argument(
+        "--case-sensitive", action="store_true",
+        help="match PATTERN case-sensitively")
+    history.add_argument(
+        "--jobs", type=int, metavar="COUNT",
+        help="worker processes (default: number of CPUs)")
+
+    headless = parser.add_argument_group(
+        "headless mode", "stream matching messages to stdout without the UI")
+    headless.add_argument(
+        "--headless", action="store_true",
+        help="run without the UI, writing matching messages to stdout")
+    headless.add_argument(
+        "--format", choices=["text", "jsonl"], default="text",
+        help="output format (default: text)")
+    headless.add_argument(
+        "--view", metavar="NAME", help="use the filters of a saved view")
+    headless.add_argument(
+        "--node", action="append", metavar="NAME",
+        help="only messages from this node (repeatable)")
+    headless.add_argument(
+        "--level", action="append", metavar="LEVEL",
+        help="only messages at this level (repeatable)")
+    headless.add_argument(
+        "--min-level", metavar="LEVEL",
+        help="only messages at or above this level")
+    headless.add_argument(
+        "--text", metavar="TEXT",
+        help="only messages whose text or node contains TEXT (case-insensitive)")
+    headless.add_argument("--from", dest="time_from", metavar="TIME",
+                          help="only messages at or after TIME")
+    headless.add_argument("--to", dest="time_to", metavar="TIME",
+                          help="only messages at or before TIME")
+    headless.add_argument(
+        "--collapse", action="store_true",
+        help="drop repeats of a message at most 1 s apart")
+    headless.add_argument(
+        "--count", action="store_true",
+        help="print only the number of matching messages")
+    headless.add_argument(
+        "--stats", action="store_true",
+        help="print per-node/level counts and throughput to stderr on exit")
+    headless.add_argument(
+        "--duration", type=float, metavar="SECONDS",
+        help="stop after SECONDS (default: until interrupted)")
+    headless.add_argument(
+        "--synthetic", type=float, metavar="RATE",
+        help="read synthetic logs at RATE msg/s instead of /rosout "
+             "(headless and broker modes)")
+    return parser.parse_args(argv)
+
+
+def run_compare(args) -> int:
+    """Compare two recordings in the UI, or print the diff with --headless"""
+    if not args.headless:
+        from .compare_app import CompareApp
+        CompareApp(*args.compare).run()
+        return 0
+    from .compare import diff_tables
+    from .compare import format_diff
+    from .compare import TemplateTable
+    try:
+        baseline, current = (TemplateTable.load(path) for path in args.compare)
+    except (OSError, ValueError) as e:
+        print(f"rtui-console: {e}", file=sys.stderr)
+        return 2
+    print(f"baseline {baseline.total} messages, {len(baseline.counts)} templates; "
+          f"current {current.total} messages, {len(current.counts)} templates")
+    print(format_diff(diff_tables(baseline, current), args.compare_limit))
+    return 0
+
+
+def run_history_search(args) -> int:
+    """Search log files in the UI, or print the hits with --headless"""
+    from .history import DEFAULT_SEARCH_PATH
+    paths = args.search_path or [DEFAULT_SEARCH_PATH]
+    if not args.headless:
+        from .history_app import HistorySearchApp
+        HistorySearchApp(paths, args.search, args.regex,
+                         not args.case_sensitive, args.jobs).run()
+        return 0
+    from .history import format_hit
+    from .history import HistorySearch
+    try:
+        search = HistorySearch(paths, args.search, args.regex,
+                               not args.case_sensitive, args.jobs)
+        search.run()
+    except (OSError, ValueError) as e:
+        print(f"rtui-console: {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        return 130
+    sys.stdout.writelines(format_hit(hit) + "\n" for hit in search.hits)
+    print(search.status(), file=sys.stderr)
+    return 0
 
 
 def main():
     """Main entry point"""
-    app = ConsoleApp()
+    args = parse_args()
+    from .profiles import get_profile
+    from .profiles import ProfileError
+    try:
+        profile = get_profile(args.profile, args.profiles)
+    except (OSError, ProfileError) as e:
+        print(f"rtui-console: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    if args.compare:
+        sys.exit(run_compare(args))
+    if args.search is not None:
+        sys.exit(run_history_search(args))
+    if args.broker:
+        from .broker import run_broker
+        sys.exit(run_broker(args, profile))
+    if args.headless:
+        from .headless import run_headless
+        sys.exit(run_headless(args, profile))
+
+    startup_profile = StartupProfile(_LAUNCH_TIME) if args.startup_profile else None
+
+    # Imported here so --startup-profile can time them separately
+    import textual.app  # noqa: F401
+    if startup_profile:
+        startup_profile.mark("import textual")
+    import numpy  # noqa: F401
+    if startup_profile:
+        startup_profile.mark("import numpy")
+    from .app import ConsoleApp
+    if startup_profile:
+        startup_profile.mark("import app")
+    snapshot_file = None if args.no_snapshot else (
+        args.snapshot or DEFAULT_SNAPSHOT_FILE)
+
+    app = ConsoleApp(metrics_file=args.metrics_file,
+                     metrics_interval=args.metrics_interval,
+                     startup_profile=startup_profile,
+                     alert_patterns=args.alert,
+                     alert_rate_limit=args.alert_rate_limit,
+                     views_file=args.views,
+                     snapshot_file=snapshot_file,
+                     snapshot_interval=args.snapshot_interval,
+                     broker_address=args.connect,
+                     profile=profile,
+                     profiles_file=args.profiles)
     app.run()
 
+    if startup_profile:
+        print(startup_profile.report())
+
 
 if __name__ == "__main__":
     main()
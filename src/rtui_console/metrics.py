@@ -0,0 +1,251 @@
+"""
+Lightweight runtime metrics for ROS2 Console Viewer
+
+Counters, gauges and fixed-bucket histograms cheap enough to update on the
+ingestion, filter and render hot paths. Counters may be incremented from
+several threads (e.g. ingest.dropped from the receiving and UI threads)
+and take a lock; gauges and histograms have a single writer thread, so
+plain attribute updates are used for them.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+class Counter:
+    """Monotonically increasing event counter, safe to increment from any thread"""
+
+    __slots__ = ("name", "value", "_lock")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        """Increment the counter"""
+        with self._lock:
+            self.value += amount
+
+    def reset(self):
+        """Reset the counter to zero"""
+        with self._lock:
+            self.value = 0
+
+
+class Gauge:
+    """Last observed value of a quantity (e.g. queue depth)"""
+
+    __slots__ = ("name", "value", "max_value")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.value = 0
+        self.max_value = 0
+
+    def set(self, value):
+        """Record the current value"""
+        self.value = value
+        if value > self.max_value:
+            self.max_value = value
+
+    def reset(self):
+        """Reset the gauge to zero"""
+        self.value = 0
+        self.max_value = 0
+
+
+class Histogram:
+    """Fixed-bucket histogram for durations in seconds"""
+
+    # Upper bounds of each bucket; the last bucket is open-ended
+    BOUNDS = (
+        0.0001, 0.00025, 0.0005,
+        0.001, 0.0025, 0.005,
+        0.01, 0.025, 0.05,
+        0.1, 0.25, 0.5,
+        1.0, 2.5, 5.0,
+    )
+
+    __slots__ = ("name", "counts", "count", "total", "max_value")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max_value = 0.0
+
+    def observe(self, value: float):
+        """Record a single observation"""
+        self.counts[bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max_value:
+            self.max_value = value
+
+    @contextmanager
+    def time(self):
+        """Context manager recording the elapsed wall time of its block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def percentile(self, q: float) -> float:
+        """Approximate percentile (0-100) as the upper bound of its bucket"""
+        if self.count == 0:
+            return 0.0
+        target = self.count * q / 100.0
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if i < len(self.BOUNDS):
+                    return min(self.BOUNDS[i], self.max_value)
+                return self.max_value
+        return self.max_value
+
+    @property
+    def mean(self) -> float:
+        """Mean of all observations"""
+        return self.total / self.count if self.count else 0.0
+
+    def reset(self):
+        """Drop all observations"""
+        self.counts = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max_value = 0.0
+
+    def summary(self) -> dict:
+        """Summary statistics for display and serialization"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max_value,
+        }
+
+
+class Metrics:
+    """Registry of named metrics with rate tracking and JSON export"""
+
+    def __init__(self) -> None:
+        self.counters: dict[str, Counter] = {}
+        self.gauges: dict[str, Gauge] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self.rates: dict[str, float] = {}
+        self.started_at = time.time()
+        self._last_tick = time.perf_counter()
+        self._last_counts: dict[str, int] = {}
+
+    def counter(self, name: str) -> Counter:
+        """Get or create a counter"""
+        metric = self.counters.get(name)
+        if metric is None:
+            metric = self.counters[name] = Counter(name)
+        return metric
+
+    def gauge(self, name: str) -> Gauge:
+        """Get or create a gauge"""
+        metric = self.gauges.get(name)
+        if metric is None:
+            metric = self.gauges[name] = Gauge(name)
+        return metric
+
+    def histogram(self, name: str) -> Histogram:
+        """Get or create a histogram"""
+        metric = self.histograms.get(name)
+        if metric is None:
+            metric = self.histograms[name] = Histogram(name)
+        return metric
+
+    def tick(self):
+        """Recompute per-second counter rates since the previous tick"""
+        now = time.perf_counter()
+        elapsed = now - self._last_tick
+        if elapsed <= 0:
+            return
+        for name, counter in list(self.counters.items()):
+            previous = self._last_counts.get(name, 0)
+            self.rates[name] = (counter.value - previous) / elapsed
+            self._last_counts[name] = counter.value
+        self._last_tick = now
+
+    def snapshot(self) -> dict:
+        """Current values of all metrics"""
+        return {
+            'timestamp': time.time(),
+            'uptime': time.time() - self.started_at,
+            'counters': {name: c.value for name, c in self.counters.items()},
+            'rates': dict(self.rates),
+            'gauges': {
+                name: {'value': g.value, 'max': g.max_value}
+                for name, g in self.gauges.items()
+            },
+            'histograms': {
+                name: h.summary() for name, h in self.histograms.items()
+            },
+        }
+
+    def dump_json(self, path: str):
+        """Atomically write a snapshot to a JSON file"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        """Reset all metrics"""
+        for metric in (*self.counters.values(), *self.gauges.values(),
+                       *self.histograms.values()):
+            metric.reset()
+        self.rates.clear()
+        self._last_counts.clear()
+        self._last_tick = time.perf_counter()
+        self.started_at = time.time()
+
+
+# Process-wide registry shared by the ROS thread and the UI
+METRICS = Metrics()
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Format a duration in seconds for compact display"""
+    if seconds is None:
+        return "-"
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}µs"
+    if seconds < 1.0:
+        return f"{seconds * 1e3:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+class StartupProfile:
+    """Wall-clock timeline of startup phases for --startup-profile"""
+
+    def __init__(self, origin: Optional[float] = None) -> None:
+        self.origin = time.perf_counter() if origin is None else origin
+        self.marks: list[tuple[str, float]] = []
+
+    def mark(self, name: str):
+        """Record that a phase finished now"""
+        self.marks.append((name, time.perf_counter() - self.origin))
+
+    def add(self, name: str, seconds: float):
+        """Record a phase measured elsewhere (e.g. in the ROS thread)"""
+        self.marks.append((name, seconds))
+
+    def report(self) -> str:
+        """Format the recorded phases as a text report"""
+        lines = ["Startup profile (seconds since launch):"]
+        for name, seconds in self.marks:
+            lines.append(f"  {name:<24} {seconds:8.3f}")
+        return "\n".join(lines)
@@ -33,15 +33,13 @@ class LogLevel:
 class LogMessage:
     """Represents a single log message"""
 
+    # Repeat-collapsing state; class defaults keep uncollapsed messages small
+    repeat_count = 1
+    last_timestamp: Optional[datetime] = None
+    repeats = None  # deque of (timestamp, text) for the most recent repeats
+
     def __init__(self, msg=None, timestamp=None, level=None, name=None, text=None, file=None, function=None, line=None):
-        # Check if ROS2 imports are available
-        try:
-            from rcl_interfaces.msg import Log
-            ros2_available = True
-        except ImportError:
-            ros2_available = False
-
-        if msg is not None and ros2_available:
+        if msg is not None:
             # From ROS2 Log message
             self.timestamp = datetime.fromtimestamp(
                 msg.stamp.sec + msg.stamp.nanosec * 1e-9
@@ -62,6 +60,56 @@ class LogMessage:
             self.function = function or ""
             self.line = line or 0
 
+        # Monotonic sequence ID, assigned when the message enters the store
+        self.seq: Optional[int] = None
+        # Set here rather than lazily so instances keep a compact layout
+        self.template = None
+        self._params: Optional[str] = None
+
+    @property
+    def msg(self) -> str:
+        """Message text, rebuilt from the template when stored compactly"""
+        text = self._msg
+        if text.__class__ is str:
+            return text
+        return text.render(self._params)
+
+    @msg.setter
+    def msg(self, text: str):
+        self._msg = text
+
+    @property
+    def lower_msg(self) -> str:
+        """Lowercased message text for filters and searches"""
+        text = self._msg
+        if text.__class__ is str:
+            return text.lower()
+        return text.render_lower(self._params)
+
+    def set_packed_text(self, template, params: str):
+        """Drop the message text, keeping its template version and parameters"""
+        self._msg = template
+        self._params = params
+
+    @property
+    def template_id(self) -> Optional[int]:
+        """ID of the mined template, if any"""
+        template = self.template
+        return template.id if template is not None else None
+
+    @property
+    def last_seen(self) -> datetime:
+        """Timestamp of the most recent repeat (or of the message itself)"""
+        return self.last_timestamp or self.timestamp
+
+    @property
+    def repeat_rate(self) -> float:
+        """Repeats per second between the first and last occurrence"""
+        span = (self.last_seen - self.timestamp).total_seconds()
+        if self.repeat_count < 2 or span <= 0:
+            return 0.0
+        return (self.repeat_count - 1) / span
+
     def to_dict(self) -> dict:
         """Convert to dictionary for serialization"""
         return {
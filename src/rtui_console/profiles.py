@@ -0,0 +1,158 @@
+"""
+Performance profiles for ROS2 Console Viewer
+
+A profile sets the buffer sizes, refresh rate and QoS depth in one go.
+Built-in profiles ship in profiles.yaml next to this module; profiles in
+the user's file (``--profiles PATH``) are added to them or replace them
+by name. A profile only needs the settings it changes:
+
+    profiles:
+      my-robot:
+        max_total_messages: 20000
+        update_interval: 0.2
+
+Settings marked live can be changed while the viewer runs; the others
+only take effect on the next start.
+"""
+import os
+from typing import Optional
+
+import yaml
+
+# Shipped with the package
+BUILTIN_PROFILES_FILE = os.path.join(os.path.dirname(__file__), "profiles.yaml")
+
+# User profiles are loaded from this file unless --profiles is given
+DEFAULT_PROFILES_FILE = "~/.config/rtui_console/profiles.yaml"
+
+# name -> (type, minimum, maximum, live)
+SETTINGS = {
+    'max_total_messages': (int, 2000, 10_000_000, True),
+    'max_display_messages': (int, 100, 1_000_000, True),
+    'max_message_length': (int, 80, 100_000, True),
+    'update_interval': (float, 0.02, 5.0, True),
+    'queue_size': (int, 100, 10_000_000, False),
+    'qos_depth': (int, 1, 100_000, False),
+    'cold_storage_mb': (float, 0, 100_000, True),
+    'sample_budget': (int, 0, 10_000_000, True),
+}
+
+# Values used when no profile is selected; match the previous constants
+DEFAULTS = {
+    'max_total_messages': 10000,
+    'max_display_messages': 5000,
+    'max_message_length': 500,
+    'update_interval': 0.1,
+    'queue_size': 10000,
+    'qos_depth': 1000,
+    'cold_storage_mb': 0,
+    # msg/s kept before DEBUG/INFO are sampled; 0 samples only when the
+    # log queue backs up
+    'sample_budget': 0,
+}
+
+
+class ProfileError(ValueError):
+    """Raised for invalid profile files or settings"""
+
+
+class Profile:
+    """Validated performance settings"""
+
+    def __init__(self, name: str = "default", description: str = "",
+                 measured: Optional[dict] = None, **settings) -> None:
+        self.name = name
+        self.description = description
+        # Benchmark numbers recorded for the profile, for display only
+        self.measured = dict(measured or {})
+        values = dict(DEFAULTS)
+        for key, value in settings.items():
+            values[key] = validate_setting(name, key, value)
+        if values['max_display_messages'] > values['max_total_messages']:
+            raise ProfileError(
+                f"profile {name!r}: max_display_messages "
+                f"({values['max_display_messages']}) exceeds "
+                f"max_total_messages ({values['max_total_messages']})")
+        self.values = values
+
+    def __getattr__(self, key):
+        try:
+            return self.__dict__['values'][key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def restart_required(self, other: 'Profile') -> list:
+        """Settings that differ from other but cannot be changed live"""
+        return [key for key, (_type, _min, _max, live) in SETTINGS.items()
+                if not live and self.values[key] != other.values[key]]
+
+    def summary(self) -> str:
+        """One-line description of the settings"""
+        return (f"store {self.max_total_messages}, "
+                f"display {self.max_display_messages}, "
+                f"text {self.max_message_length}, "
+                f"refresh {self.update_interval:g} s, "
+                f"queue {self.queue_size}, QoS depth {self.qos_depth}, "
+                f"cold {self.cold_storage_mb:g} MB, "
+                f"sample budget {self.sample_budget or 'auto'}")
+
+
+def validate_setting(profile: str, key: str, value):
+    """Checked and converted value of one setting"""
+    if key not in SETTINGS:
+        raise ProfileError(f"profile {profile!r}: unknown setting {key!r} "
+                           f"(expected one of {', '.join(SETTINGS)})")
+    value_type, minimum, maximum, _live = SETTINGS[key]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ProfileError(f"profile {profile!r}: {key} must be a number, "
+                           f"got {value!r}")
+    if value_type is int and value != int(value):
+        raise ProfileError(f"profile {profile!r}: {key} must be an integer, "
+                           f"got {value!r}")
+    value = value_type(value)
+    if not minimum <= value <= maximum:
+        raise ProfileError(f"profile {profile!r}: {key} must be between "
+                           f"{minimum} and {maximum}, got {value}")
+    return value
+
+
+def load_profiles(path: str) -> dict:
+    """Profiles in a YAML file by name; a missing file yields none"""
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ProfileError(f"{path}: {e}") from e
+    entries = data.get('profiles', {}) if isinstance(data, dict) else None
+    if not isinstance(entries, dict):
+        raise ProfileError(f"{path}: 'profiles' must be a mapping of names")
+    profiles = {}
+    for name, entry in entries.items():
+        if not isinstance(entry, dict):
+            raise ProfileError(f"{path}: profile {name!r} must be a mapping")
+        try:
+            profiles[str(name)] = Profile(name=str(name), **entry)
+        except TypeError as e:
+            raise ProfileError(f"{path}: profile {name!r}: {e}") from e
+    return profiles
+
+
+def available_profiles(user_path: Optional[str] = None) -> dict:
+    """Built-in profiles updated with the user's"""
+    profiles = {'default': Profile()}
+    profiles.update(load_profiles(BUILTIN_PROFILES_FILE))
+    profiles.update(load_profiles(user_path or DEFAULT_PROFILES_FILE))
+    return profiles
+
+
+def get_profile(name: Optional[str], user_path: Optional[str] = None) -> Profile:
+    """Profile by name (default settings for None)"""
+    profiles = available_profiles(user_path)
+    name = name or 'default'
+    if name not in profiles:
+        raise ProfileError(f"unknown profile {name!r} "
+                           f"(available: {', '.join(profiles)})")
+    return profiles[name]
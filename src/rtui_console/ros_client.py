@@ -2,47 +2,62 @@
 ROS2 client and log generation utilities
 """
 from datetime import datetime
+import functools
+import importlib.util
 import os
 import queue
 import random
 import threading
+import time
 from typing import Callable, Optional
 
+from .ingest import OverloadSampler
+from .metrics import METRICS
 from .models import LogLevel
 from .models import LogMessage
 
-# Check ROS2 availability
-try:
+
+@functools.lru_cache(maxsize=None)
+def ros2_available() -> bool:
+    """Check if ROS2 Python packages are installed without importing them"""
+    try:
+        return (importlib.util.find_spec("rclpy") is not None and
+                importlib.util.find_spec("rcl_interfaces") is not None)
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def load_subscriber_class():
+    """Import rclpy and define ROS2LogSubscriber on first use
+
+    Importing rclpy on a sourced workspace takes seconds, so this is only
+    called from the ROS thread after the UI is already up.
+    """
     from rcl_interfaces.msg import Log
-    import rclpy
     from rclpy.node import Node
     from rclpy.qos import DurabilityPolicy
     from rclpy.qos import HistoryPolicy
     from rclpy.qos import QoSProfile
     from rclpy.qos import ReliabilityPolicy
-    ROS2_AVAILABLE = True
-except ImportError:
-    ROS2_AVAILABLE = False
-    Log = None
-    Node = None
-
 
-# Define ROS2LogSubscriber based on availability
-if ROS2_AVAILABLE and Node:
     class ROS2LogSubscriber(Node):
         """ROS2 node that subscribes to rosout topic"""
 
-        def __init__(self, log_queue: queue.Queue, status_callback: Optional[Callable] = None):
+        def __init__(self, log_queue: queue.Queue, status_callback: Optional[Callable] = None,
+                     qos_depth: int = 1000, sampler: Optional[OverloadSampler] = None):
             super().__init__('rtui_console_subscriber')
             self.log_queue = log_queue
             self.status_callback = status_callback
+            # Queues messages, sampling DEBUG/INFO under overload
+            self.sampler = sampler or OverloadSampler(enabled=False)
             self.message_count = 0
             self.last_message_time = None
 
             # QoS profile for rosout topic
             qos_profile = QoSProfile(
                 history=HistoryPolicy.KEEP_LAST,
-                depth=1000,
+                depth=qos_depth,
                 reliability=ReliabilityPolicy.RELIABLE,
                 durability=DurabilityPolicy.VOLATILE
             )
@@ -65,8 +80,7 @@ if ROS2_AVAILABLE and Node:
         def log_callback(self, msg):
             """Callback for receiving log messages"""
             try:
-                log_msg = LogMessage(msg)
-                self.log_queue.put(log_msg, block=False)
+                self.sampler.offer(self.log_queue, LogMessage(msg))
                 self.message_count += 1
                 self.last_message_time = datetime.now()
 
@@ -75,43 +89,43 @@ if ROS2_AVAILABLE and Node:
                     self.status_callback(
                         f"Received {self.message_count} messages")
 
-            except queue.Full:
-                # Queue is full, drop oldest messages
-                try:
-                    self.log_queue.get_nowait()
-                    self.log_queue.put(log_msg, block=False)
-                except queue.Empty:
-                    pass
             except Exception as e:
                 self.get_logger().error(f"Error in log callback: {e}")
 
-else:
-    class ROS2LogSubscriber:
-        """Dummy ROS2 subscriber for when ROS2 is not available"""
+    return ROS2LogSubscriber
 
-        def __init__(self, log_queue: queue.Queue, status_callback: Optional[Callable] = None):
-            raise ImportError("ROS2 packages not available")
 
-        def destroy_node(self):
-            pass
+def __getattr__(name):
+    # Keep `from .ros_client import ROS2LogSubscriber` working lazily
+    if name == "ROS2LogSubscriber":
+        if not ros2_available():
+            raise ImportError("ROS2 packages not available")
+        return load_subscriber_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ROS2Client:
     """ROS2 client manager"""
 
-    def __init__(self, log_queue: queue.Queue):
+    def __init__(self, log_queue: queue.Queue, qos_depth: int = 1000,
+                 sampler: Optional[OverloadSampler] = None):
         self.log_queue = log_queue
-        self.node: Optional[ROS2LogSubscriber] = None
+        self.qos_depth = qos_depth
+        self.sampler = sampler
+        self.node = None
         self.thread: Optional[threading.Thread] = None
         self.status = "Disconnected"
+        self.connected = False
+        # Seconds spent in each startup phase of the ROS thread
+        self.timings: dict[str, float] = {}
 
     def is_available(self) -> bool:
         """Check if ROS2 is available"""
-        return ROS2_AVAILABLE
+        return ros2_available()
 
     def check_environment(self) -> tuple[bool, str]:
         """Check ROS2 environment setup"""
-        if not ROS2_AVAILABLE:
+        if not ros2_available():
             return False, "ROS2 packages not installed"
 
         ros_distro = os.getenv('ROS_DISTRO')
@@ -121,26 +135,43 @@ class ROS2Client:
         return True, f"ROS2 {ros_distro} environment detected"
 
     def start_subscriber(self) -> bool:
-        """Start ROS2 subscriber in a separate thread"""
-        if not ROS2_AVAILABLE:
+        """Import rclpy and start the ROS2 subscriber in a separate thread"""
+        if not ros2_available():
             return False
 
         def ros_thread_func():
+            rclpy = None
             try:
+                self.status = "Loading ROS2..."
+                start = time.perf_counter()
+                import rclpy
+                subscriber_class = load_subscriber_class()
+                self.timings['rclpy_import'] = time.perf_counter() - start
+
+                self.status = "Connecting..."
+                start = time.perf_counter()
                 rclpy.init()
-                self.node = ROS2LogSubscriber(self.log_queue)
+                self.node = subscriber_class(self.log_queue,
+                                             qos_depth=self.qos_depth,
+                                             sampler=self.sampler)
+                self.timings['rclpy_init'] = time.perf_counter() - start
+
+                self.connected = True
                 self.status = "Connected"
                 rclpy.spin(self.node)
             except Exception as e:
                 self.status = f"Error: {e}"
             finally:
+                self.connected = False
                 if self.node:
                     self.node.destroy_node()
-                try:
-                    rclpy.shutdown()
-                except:
-                    pass
-                self.status = "Disconnected"
+                if rclpy is not None:
+                    try:
+                        rclpy.shutdown()
+                    except:
+                        pass
+                if not self.status.startswith("Error"):
+                    self.status = "Disconnected"
 
         self.thread = threading.Thread(target=ros_thread_func, daemon=True)
         self.thread.start()
@@ -188,6 +219,8 @@ class LogGenerator:
         """Generate test log messages"""
         levels = [LogLevel.DEBUG, LogLevel.INFO,
                   LogLevel.WARN, LogLevel.ERROR, LogLevel.FATAL]
+        received = METRICS.counter("ingest.received")
+        dropped = METRICS.counter("ingest.dropped")
 
         for i in range(count):
             node = random.choice(cls.TEST_NODES)
@@ -204,9 +237,11 @@ class LogGenerator:
                 line=42 + i
             )
 
+            received.inc()
             try:
                 log_queue.put(log_msg, block=False)
             except queue.Full:
+                dropped.inc(count - i)
                 break
 
         return count
@@ -0,0 +1,233 @@
+"""
+Session snapshots for ROS2 Console Viewer
+
+A snapshot is a compact binary dump of the message store plus the filter
+state, written on quit (and optionally periodically) and memory-mapped on
+startup. Layout::
+
+    MAGIC | header length (u32) | JSON header | padding to 8 bytes
+    | fixed-size records | UTF-8 text blob
+
+The header holds the string tables (node, file and function names) and
+the filter state; records reference strings by index and store the
+cumulative byte and character offsets of each message's text, so the
+newest N messages can be loaded by touching only the tail of the file.
+"""
+from datetime import datetime
+from datetime import timezone
+import gc
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Optional
+
+import numpy as np
+
+from .defaults import DEFAULT_SNAPSHOT_FILE  # noqa: F401 (re-exported)
+from .models import LogMessage
+
+MAGIC = b"RTUISNP1"
+VERSION = 1
+
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('last_timestamp', '<f8'),  # NaN unless the message folds repeats
+    ('byte_end', '<i8'),
+    ('char_end', '<i8'),
+    ('node', '<i4'),
+    ('file', '<i4'),
+    ('function', '<i4'),
+    ('line', '<i4'),
+    ('repeat_count', '<i4'),
+    ('level', '<u1'),
+])
+
+
+class SnapshotError(Exception):
+    """Raised for unreadable or incompatible snapshot files"""
+
+
+def write_snapshot(path: str, messages: list, filters: Optional[dict] = None):
+    """Write messages and filter state to path atomically"""
+    path = os.path.expanduser(path)
+    count = len(messages)
+    nodes: dict[str, int] = {}
+    files: dict[str, int] = {}
+    functions: dict[str, int] = {}
+
+    records = np.zeros(count, dtype=RECORD_DTYPE)
+    records['timestamp'] = np.fromiter(
+        (m.timestamp.timestamp() for m in messages), dtype=np.float64, count=count)
+    records['last_timestamp'] = np.fromiter(
+        (m.last_timestamp.timestamp() if m.last_timestamp else math.nan
+         for m in messages), dtype=np.float64, count=count)
+    records['node'] = np.fromiter(
+        (nodes.setdefault(m.name, len(nodes)) for m in messages),
+        dtype=np.int32, count=count)
+    records['file'] = np.fromiter(
+        (files.setdefault(m.file or "", len(files)) for m in messages),
+        dtype=np.int32, count=count)
+    records['function'] = np.fromiter(
+        (functions.setdefault(m.function or "", len(functions)) for m in messages),
+        dtype=np.int32, count=count)
+    records['line'] = np.fromiter(
+        (m.line or 0 for m in messages), dtype=np.int32, count=count)
+    records['repeat_count'] = np.fromiter(
+        (m.repeat_count for m in messages), dtype=np.int32, count=count)
+    records['level'] = np.fromiter(
+        (m.level for m in messages), dtype=np.uint8, count=count)
+
+    texts = [m.msg for m in messages]
+    encoded = [text.encode('utf-8', 'replace') for text in texts]
+    records['char_end'] = np.cumsum(
+        np.fromiter(map(len, texts), dtype=np.int64, count=count))
+    records['byte_end'] = np.cumsum(
+        np.fromiter(map(len, encoded), dtype=np.int64, count=count))
+
+    header = json.dumps({
+        'version': VERSION,
+        'created': time.time(),
+        'count': count,
+        'nodes': list(nodes),
+        'files': list(files),
+        'functions': list(functions),
+        'filters': filters or {},
+    }).encode('utf-8')
+    prefix = MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\0" * (-len(prefix) % 8)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(prefix)
+        f.write(records.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path: str, limit: Optional[int] = None) -> tuple[list, dict]:
+    """Load the newest ``limit`` messages (all if None) and the filter state"""
+    path = os.path.expanduser(path)
+    # Creating a million objects would otherwise trigger many GC passes
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < len(MAGIC) + 4:
+                raise SnapshotError(f"{path}: file is truncated")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _read_mapped(mm, path, limit)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _read_mapped(mm: mmap.mmap, path: str, limit: Optional[int]) -> tuple[list, dict]:
+    if mm[:len(MAGIC)] != MAGIC:
+        raise SnapshotError(f"{path}: not a snapshot file")
+    (header_len,) = struct.unpack_from("<I", mm, len(MAGIC))
+    header_start = len(MAGIC) + 4
+    try:
+        header = json.loads(mm[header_start:header_start + header_len])
+    except ValueError as e:
+        raise SnapshotError(f"{path}: corrupt header: {e}") from e
+    _check_header(header, path)
+
+    count = header['count']
+    records_offset = header_start + header_len
+    records_offset += -records_offset % 8
+    blob_offset = records_offset + count * RECORD_DTYPE.itemsize
+    if blob_offset > len(mm):
+        raise SnapshotError(f"{path}: file is truncated")
+
+    first = max(0, count - limit) if limit is not None else 0
+    # Only the tail of the mapping is touched; copy out before unmapping
+    records = np.frombuffer(mm, dtype=RECORD_DTYPE, count=count - first,
+                            offset=records_offset + first * RECORD_DTYPE.itemsize)
+    if first:
+        previous = np.frombuffer(mm, dtype=RECORD_DTYPE, count=1,
+                                 offset=records_offset + (first - 1) * RECORD_DTYPE.itemsize)
+        byte_start = int(previous['byte_end'][0])
+        char_start = int(previous['char_end'][0])
+        del previous
+    else:
+        byte_start = char_start = 0
+    columns = {name: records[name].tolist() for name in RECORD_DTYPE.names}
+    del records
+    for name in ('node', 'file', 'function'):
+        indexes = columns[name]
+        if indexes and (min(indexes) < 0
+                        or max(indexes) >= len(header[f"{name}s"])):
+            raise SnapshotError(f"{path}: corrupt records: bad {name} index")
+    byte_end = columns['byte_end'][-1] if count - first else byte_start
+    if blob_offset + byte_end > len(mm):
+        raise SnapshotError(f"{path}: file is truncated")
+    blob = mm[blob_offset + byte_start:blob_offset + byte_end].decode(
+        'utf-8', 'replace')
+
+    nodes, files, functions = header['nodes'], header['files'], header['functions']
+    timestamps = _to_datetimes(columns['timestamp'])
+    ends = [end - char_start for end in columns['char_end']]
+    texts = [blob[start:end] for start, end in zip([0] + ends[:-1], ends)]
+    messages = [
+        LogMessage(timestamp=timestamp, level=level, name=nodes[node],
+                   text=text, file=files[file], function=functions[function],
+                   line=line)
+        for timestamp, level, node, text, file, function, line in zip(
+            timestamps, columns['level'], columns['node'], texts,
+            columns['file'], columns['function'], columns['line'])
+    ]
+    for i, repeat_count in enumerate(columns['repeat_count']):
+        if repeat_count > 1:
+            msg = messages[i]
+            msg.repeat_count = repeat_count
+            last_timestamp = columns['last_timestamp'][i]
+            if not math.isnan(last_timestamp):
+                msg.last_timestamp = datetime.fromtimestamp(last_timestamp)
+    return messages, header.get('filters', {})
+
+
+def _check_header(header, path: str):
+    """Raise SnapshotError unless header has the fields _read_mapped uses"""
+    if not isinstance(header, dict):
+        raise SnapshotError(f"{path}: corrupt header: not an object")
+    if header.get('version') != VERSION:
+        raise SnapshotError(f"{path}: unsupported version {header.get('version')}")
+    count = header.get('count')
+    if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+        raise SnapshotError(f"{path}: corrupt header: bad count {count!r}")
+    for key in ('nodes', 'files', 'functions'):
+        names = header.get(key)
+        if not isinstance(names, list) or not all(
+                isinstance(name, str) for name in names):
+            raise SnapshotError(f"{path}: corrupt header: bad {key}")
+    if not isinstance(header.get('filters', {}), dict):
+        raise SnapshotError(f"{path}: corrupt header: bad filters")
+
+
+def _to_datetimes(timestamps: list) -> list:
+    """Local datetimes for POSIX timestamps, converted in bulk
+
+    NumPy converts in C but only knows UTC, so the local UTC offset is
+    added when it is the same at both ends (no DST change in between).
+    """
+    if not timestamps:
+        return []
+    first, last = timestamps[0], timestamps[-1]
+    offset = _utc_offset(first)
+    if offset != _utc_offset(last):
+        return [datetime.fromtimestamp(t) for t in timestamps]
+    micros = np.round((np.array(timestamps) + offset) * 1e6).astype(np.int64)
+    return micros.astype('datetime64[us]').tolist()
+
+
+def _utc_offset(timestamp: float) -> float:
+    """Local UTC offset in seconds at timestamp"""
+    local = datetime.fromtimestamp(timestamp)
+    utc = datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+    return (local - utc).total_seconds()
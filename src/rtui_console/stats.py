@@ -0,0 +1,152 @@
+"""
+Incremental per-node, per-level log statistics
+
+Counts are kept in NumPy arrays indexed by interned node ID and level
+code and updated once per ingested batch, so the statistics never need
+to rescan the stored messages.
+"""
+import time
+from typing import Optional
+
+import numpy as np
+
+from .models import LogLevel
+
+LEVELS = (LogLevel.DEBUG, LogLevel.INFO, LogLevel.WARN,
+          LogLevel.ERROR, LogLevel.FATAL)
+
+
+def level_codes(levels: np.ndarray) -> np.ndarray:
+    """Map ROS2 level values (10, 20, ... 50) to column indexes 0-4"""
+    return np.clip(levels // 10 - 1, 0, len(LEVELS) - 1)
+
+
+class LogStatistics:
+    """Message counts and recent rates per node and level
+
+    ``counts`` holds totals since the last reset. ``buckets`` is a ring of
+    ``history`` time buckets of ``bucket_seconds`` each per node and level,
+    keyed by arrival time, from which moving-average rates and the
+    sparkline series are derived. Messages the OverloadSampler discarded
+    are counted too, and also in ``discarded``, so the totals and rates
+    are those of the received stream.
+    """
+
+    def __init__(self, bucket_seconds: float = 1.0, history: int = 120,
+                 rate_window: int = 10) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.history = history
+        self.rate_window = rate_window
+        self.reset()
+
+    def reset(self):
+        """Drop all statistics"""
+        self.node_names: list[str] = []
+        self._node_ids: dict[str, int] = {}
+        self.counts = np.zeros((16, len(LEVELS)), dtype=np.int64)
+        self.discarded = np.zeros((16, len(LEVELS)), dtype=np.int64)
+        self.buckets = np.zeros((16, len(LEVELS), self.history), dtype=np.int32)
+        self._head: Optional[int] = None  # absolute number of newest bucket
+
+    def _intern(self, name: str) -> int:
+        """Node ID for name, growing the arrays when needed"""
+        node_id = self._node_ids.get(name)
+        if node_id is None:
+            node_id = self._node_ids[name] = len(self.node_names)
+            self.node_names.append(name)
+            if node_id >= len(self.counts):
+                grow = len(self.counts)
+                self.counts = np.concatenate(
+                    [self.counts, np.zeros_like(self.counts[:grow])])
+                self.discarded = np.concatenate(
+                    [self.discarded, np.zeros_like(self.discarded[:grow])])
+                self.buckets = np.concatenate(
+                    [self.buckets, np.zeros_like(self.buckets[:grow])])
+        return node_id
+
+    def _advance(self, now: float) -> int:
+        """Move the ring head to the bucket for now, zeroing skipped buckets"""
+        bucket = int(now // self.bucket_seconds)
+        if self._head is None:
+            self._head = bucket
+        elif bucket > self._head:
+            skipped = bucket - self._head
+            if skipped >= self.history:
+                self.buckets[:] = 0
+            else:
+                slots = np.arange(self._head + 1, bucket + 1) % self.history
+                self.buckets[:, :, slots] = 0
+            self._head = bucket
+        return self._head % self.history
+
+    def tick(self, now: Optional[float] = None):
+        """Advance the time buckets without adding messages"""
+        self._advance(time.time() if now is None else now)
+
+    def add_batch(self, messages: list, now: Optional[float] = None):
+        """Count a batch of messages arriving now"""
+        slot = self._advance(time.time() if now is None else now)
+        if not messages:
+            return
+        count = len(messages)
+        intern = self._intern
+        node_ids = np.fromiter((intern(m.name) for m in messages),
+                               dtype=np.intp, count=count)
+        codes = level_codes(np.fromiter((m.level for m in messages),
+                                        dtype=np.intp, count=count))
+        weights = np.fromiter((m.repeat_count for m in messages),
+                              dtype=np.int64, count=count)
+        np.add.at(self.counts, (node_ids, codes), weights)
+        np.add.at(self.buckets[:, :, slot], (node_ids, codes), weights)
+
+    def add_discarded(self, discarded: dict, now: Optional[float] = None):
+        """Count messages received but not kept, by (node, level)"""
+        slot = self._advance(time.time() if now is None else now)
+        for (name, level), count in discarded.items():
+            node_id = self._intern(name)
+            code = int(level_codes(np.array([level]))[0])
+            self.counts[node_id, code] += count
+            self.discarded[node_id, code] += count
+            self.buckets[node_id, code, slot] += count
+
+    def _recent_slots(self, window: int) -> np.ndarray:
+        """Ring slots of the newest ``window`` buckets, oldest first"""
+        window = min(window, self.history)
+        return (np.arange(self._head - window + 1, self._head + 1)
+                % self.history)
+
+    def rates(self, window: Optional[int] = None) -> np.ndarray:
+        """Moving-average messages/s per node and level"""
+        n = len(self.node_names)
+        if self._head is None:
+            return np.zeros((n, len(LEVELS)))
+        window = window or self.rate_window
+        recent = self.buckets[:n][:, :, self._recent_slots(window)]
+        return recent.sum(axis=2) / (window * self.bucket_seconds)
+
+    def level_series(self, level: int, window: Optional[int] = None) -> np.ndarray:
+        """Per-bucket counts of one level over all nodes, oldest first"""
+        window = window or self.history
+        if self._head is None:
+            return np.zeros(window, dtype=np.int64)
+        code = int(level_codes(np.array([level]))[0])
+        per_bucket = self.buckets[:len(self.node_names), code, :].sum(axis=0)
+        return per_bucket[self._recent_slots(window)]
+
+    def node_rows(self, limit: Optional[int] = None) -> list:
+        """(node, counts per level, total, rate/s, discarded) sorted by total,
+        busiest first"""
+        n = len(self.node_names)
+        counts = self.counts[:n]
+        totals = counts.sum(axis=1)
+        discarded = self.discarded[:n].sum(axis=1)
+        rates = self.rates().sum(axis=1)
+        order = np.argsort(-totals, kind="stable")
+        if limit:
+            order = order[:limit]
+        return [(self.node_names[i], counts[i].tolist(), int(totals[i]),
+                 float(rates[i]), int(discarded[i])) for i in order]
+
+    def total(self) -> int:
+        """Total messages counted"""
+        return int(self.counts.sum())
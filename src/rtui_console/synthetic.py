@@ -0,0 +1,236 @@
+"""
+Synthetic /rosout traffic for benchmarks and offline testing
+"""
+from datetime import datetime
+import itertools
+import math
+import queue
+import random
+import threading
+import time
+from typing import Optional
+
+from .ingest import OverloadSampler
+from .models import LogLevel
+from .models import LogMessage
+
+# Message bodies: random filler words after the template, or a fixed tail
+# per template so long messages stay format-string shaped
+SHAPES = ("random", "templated")
+
+
+class SyntheticLogGenerator:
+    """Configurable generator of realistic log storms
+
+    Node popularity follows a Zipf distribution, levels follow a weighted
+    mix and message lengths are log-normally distributed. While feeding a
+    queue, the target rate is multiplied by ``burst_factor`` for
+    ``burst_duration`` seconds out of every ``burst_period`` seconds.
+    """
+
+    DEFAULT_LEVEL_WEIGHTS = {
+        LogLevel.DEBUG: 0.30,
+        LogLevel.INFO: 0.55,
+        LogLevel.WARN: 0.10,
+        LogLevel.ERROR: 0.045,
+        LogLevel.FATAL: 0.005,
+    }
+
+    TEMPLATES = [
+        "Received callback from /sensor_data seq={n}",
+        "Published message to topic /cmd_vel #{n}",
+        "Debug: Variable x = {n}",
+        "Processing frame {n} took {f:.2f} ms",
+        "latency_ms={n} battery={f:.1f} v",
+        "Failed to connect to service /map_server (attempt {n})",
+        "Timeout waiting for transform base_link -> odom ({f:.3f} s)",
+        "Path planning in progress: {n} waypoints remaining",
+        "Emergency stop activated by /safety_monitor",
+        "Sensor calibration complete after {n} samples",
+    ]
+
+    FILLER_WORDS = [
+        "status", "nominal", "queue", "frame", "pose", "velocity", "sensor",
+        "retry", "buffer", "update", "estimate", "covariance", "map", "scan",
+    ]
+
+    def __init__(self, rate: float = 1000.0, num_nodes: int = 50,
+                 zipf_s: float = 1.1, level_weights: Optional[dict] = None,
+                 length_mu: float = 3.8, length_sigma: float = 0.6,
+                 max_length: int = 2000, burst_factor: float = 1.0,
+                 burst_period: float = 10.0, burst_duration: float = 1.0,
+                 seed: Optional[int] = None, shape: str = "random") -> None:
+        self.rate = rate
+        self.num_nodes = num_nodes
+        self.zipf_s = zipf_s
+        self.level_weights = level_weights or dict(self.DEFAULT_LEVEL_WEIGHTS)
+        self.length_mu = length_mu
+        self.length_sigma = length_sigma
+        self.max_length = max_length
+        self.burst_factor = burst_factor
+        self.burst_period = burst_period
+        self.burst_duration = burst_duration
+        self.seed = seed
+        self._random = random.Random(seed)
+        self._counter = itertools.count()
+        self.last_feed: Optional[dict] = None
+
+        self.nodes = [f"/robot/node_{i:03d}" for i in range(num_nodes)]
+        self._node_cum_weights = list(itertools.accumulate(
+            1.0 / math.pow(rank, zipf_s) for rank in range(1, num_nodes + 1)))
+        self._levels = list(self.level_weights.keys())
+        self._level_cum_weights = list(itertools.accumulate(
+            self.level_weights.values()))
+        if shape not in SHAPES:
+            raise ValueError(f"unknown message shape {shape!r} "
+                             f"(expected one of {', '.join(SHAPES)})")
+        self.shape = shape
+        # Fixed trailing text per template for the templated shape, from
+        # its own generator so the random shape's sequence is unchanged
+        fillers = random.Random(seed)
+        self._fillers = [
+            " ".join(fillers.choice(self.FILLER_WORDS)
+                     for _ in range(max_length // 4))
+            for _ in self.TEMPLATES
+        ] if shape == "templated" else None
+
+    def config(self) -> dict:
+        """Generator parameters for reporting"""
+        return {
+            'rate': self.rate,
+            'num_nodes': self.num_nodes,
+            'zipf_s': self.zipf_s,
+            'level_weights': {LogLevel.NAMES.get(k, str(k)): v
+                              for k, v in self.level_weights.items()},
+            'length_mu': self.length_mu,
+            'length_sigma': self.length_sigma,
+            'max_length': self.max_length,
+            'burst_factor': self.burst_factor,
+            'burst_period': self.burst_period,
+            'burst_duration': self.burst_duration,
+            'seed': self.seed,
+            'shape': self.shape,
+        }
+
+    def _make_text(self) -> str:
+        """Build one message body with a log-normal target length"""
+        if self._fillers is not None:
+            return self._make_templated_text()
+        rnd = self._random
+        text = rnd.choice(self.TEMPLATES).format(
+            n=rnd.randint(0, 100000), f=rnd.random() * 100)
+        target = min(int(rnd.lognormvariate(self.length_mu, self.length_sigma)),
+                     self.max_length)
+        if len(text) < target:
+            words = [text]
+            length = len(text)
+            while length < target:
+                word = rnd.choice(self.FILLER_WORDS)
+                words.append(word)
+                length += len(word) + 1
+            text = " ".join(words)
+        return text
+
+    def _make_templated_text(self) -> str:
+        """Message body padded with its template's fixed tail"""
+        rnd = self._random
+        index = rnd.randrange(len(self.TEMPLATES))
+        text = self.TEMPLATES[index].format(
+            n=rnd.randint(0, 100000), f=rnd.random() * 100)
+        target = min(int(rnd.lognormvariate(self.length_mu, self.length_sigma)),
+                     self.max_length)
+        if len(text) < target:
+            filler = self._fillers[index][:target - len(text)]
+            text = f"{text} {filler.rsplit(' ', 1)[0] or filler}"
+        return text
+
+    def with_shape(self, shape: str) -> 'SyntheticLogGenerator':
+        """Generator with the same parameters and another message shape"""
+        return SyntheticLogGenerator(
+            rate=self.rate, num_nodes=self.num_nodes, zipf_s=self.zipf_s,
+            level_weights=self.level_weights, length_mu=self.length_mu,
+            length_sigma=self.length_sigma, max_length=self.max_length,
+            burst_factor=self.burst_factor, burst_period=self.burst_period,
+            burst_duration=self.burst_duration, seed=self.seed, shape=shape)
+
+    def make_message(self) -> LogMessage:
+        """Generate a single log message"""
+        rnd = self._random
+        node = rnd.choices(self.nodes, cum_weights=self._node_cum_weights)[0]
+        level = rnd.choices(self._levels,
+                            cum_weights=self._level_cum_weights)[0]
+        n = next(self._counter)
+        return LogMessage(
+            timestamp=datetime.now(),
+            level=level,
+            name=node,
+            text=self._make_text(),
+            file="synthetic.py",
+            function="make_message",
+            line=n % 1000 + 1
+        )
+
+    def generate(self, count: int) -> list:
+        """Generate a batch of log messages"""
+        return [self.make_message() for _ in range(count)]
+
+    def rate_at(self, elapsed: float) -> float:
+        """Target rate at the given time offset, including bursts"""
+        if self.burst_factor != 1.0 and self.burst_period > 0:
+            if elapsed % self.burst_period < self.burst_duration:
+                return self.rate * self.burst_factor
+        return self.rate
+
+    def feed(self, log_queue: queue.Queue, duration: float,
+             stop_event: Optional[threading.Event] = None,
+             tick: float = 0.01,
+             sampler: Optional[OverloadSampler] = None) -> dict:
+        """Feed a queue at the target rate for ``duration`` seconds
+
+        Messages are queued through ``sampler`` like in
+        ROS2LogSubscriber.log_callback; without one, nothing is sampled and
+        only queue overflow discards messages.
+        """
+        sampler = sampler or OverloadSampler(enabled=False)
+        offer = sampler.offer
+        sent = 0
+        drops = 0
+        budget = 0.0
+        start = time.perf_counter()
+        last = start
+
+        while True:
+            now = time.perf_counter()
+            elapsed = now - start
+            if elapsed >= duration or (stop_event and stop_event.is_set()):
+                break
+            budget += self.rate_at(elapsed) * (now - last)
+            last = now
+
+            while budget >= 1.0:
+                budget -= 1.0
+                sent += 1
+                if not offer(log_queue, self.make_message()):
+                    drops += 1
+
+            time.sleep(tick)
+
+        return {
+            'sent': sent,
+            'dropped': drops,
+            'elapsed': time.perf_counter() - start,
+        }
+
+    def start(self, log_queue: queue.Queue, duration: float,
+              stop_event: Optional[threading.Event] = None,
+              sampler: Optional[OverloadSampler] = None) -> threading.Thread:
+        """Feed a queue from a daemon thread; results land in ``last_feed``"""
+        self.last_feed = None
+
+        def run():
+            self.last_feed = self.feed(log_queue, duration, stop_event,
+                                       sampler=sampler)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,214 @@
+"""
+Online log template mining for ROS2 Console Viewer
+
+A Drain-style miner: messages are routed through a fixed-depth prefix tree
+(token count, then the leading tokens) to a small set of candidate
+clusters, and joined to the most similar one, whose template turns the
+differing tokens into wildcards. Each message keeps a reference to its
+cluster; messages matching an existing template version exactly keep only
+that version plus the wildcard values, from which the text is rebuilt.
+"""
+import sys
+from typing import Optional
+
+from .metrics import METRICS
+
+WILDCARD_TEXT = "<*>"
+
+
+class _Wildcard:
+    """Template token standing for a variable
+
+    An object rather than the string "<*>", so a message that contains
+    "<*>" literally is never mistaken for a wildcard.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return WILDCARD_TEXT
+
+
+WILDCARD = _Wildcard()
+
+# Separator for packed parameter strings; messages containing it are
+# never compacted
+PARAM_SEPARATOR = "\x00"
+
+
+class Template:
+    """One version of a cluster's template
+
+    Templates only become more general over time, so every change creates
+    a new version; messages keep the version they were parsed against.
+    """
+
+    __slots__ = ("id", "tokens", "wildcards", "text", "lower_tokens")
+
+    def __init__(self, template_id: int, tokens: tuple) -> None:
+        self.id = template_id
+        self.tokens = tokens
+        self.wildcards = tuple(
+            i for i, token in enumerate(tokens) if token is WILDCARD)
+        self.text = " ".join(
+            WILDCARD_TEXT if token is WILDCARD else token for token in tokens)
+        # Lowercased once per version, so filters never lower a full message
+        self.lower_tokens = tuple(
+            token if token is WILDCARD else token.lower() for token in tokens)
+
+    def extract(self, tokens: list) -> list:
+        """Parameter values of a message parsed against this template"""
+        return [tokens[i] for i in self.wildcards]
+
+    def render(self, params: str) -> str:
+        """Rebuild the original message text from packed parameters"""
+        if not self.wildcards:
+            return self.text
+        return self._fill(self.tokens, params)
+
+    def render_lower(self, params: str) -> str:
+        """Lowercased message text, without lowering the template part"""
+        if not self.wildcards:
+            return " ".join(self.lower_tokens)
+        return self._fill(self.lower_tokens, params.lower())
+
+    def _fill(self, template_tokens: tuple, params: str) -> str:
+        tokens = list(template_tokens)
+        for i, value in zip(self.wildcards, params.split(PARAM_SEPARATOR)):
+            tokens[i] = value
+        return " ".join(tokens)
+
+
+class TemplateCluster:
+    """Group of messages sharing a template"""
+
+    __slots__ = ("id", "template", "count")
+
+    def __init__(self, template_id: int, tokens: tuple) -> None:
+        self.id = template_id
+        self.template = Template(template_id, tokens)
+        self.count = 0
+
+    def similarity(self, tokens: list) -> float:
+        """Fraction of positions where the template matches the tokens"""
+        same = 0
+        for template_token, token in zip(self.template.tokens, tokens):
+            if template_token is WILDCARD or template_token == token:
+                same += 1
+        return same / len(tokens) if tokens else 1.0
+
+    def merge(self, tokens: list) -> Template:
+        """Generalize the template to cover tokens and return its version"""
+        current = self.template.tokens
+        merged = tuple(
+            template_token
+            if template_token is not WILDCARD and template_token == token
+            else WILDCARD
+            for template_token, token in zip(current, tokens))
+        if merged != current:
+            self.template = Template(self.id, merged)
+        return self.template
+
+
+def _has_digits(token: str) -> bool:
+    """Tokens containing digits are treated as variables when routing"""
+    return any(c.isdigit() for c in token)
+
+
+class TemplateMiner:
+    """Online Drain-style template miner
+
+    ``depth`` leading tokens are used for routing, ``similarity`` is the
+    minimum fraction of matching tokens to join a cluster, and
+    ``max_children`` bounds the fan-out of each tree node. With
+    ``compact`` set, message text is dropped after parsing and rebuilt on
+    access from the template and packed parameters.
+    """
+
+    def __init__(self, depth: int = 2, similarity: float = 0.5,
+                 max_children: int = 100, compact: bool = True) -> None:
+        self.depth = depth
+        self.similarity = similarity
+        self.max_children = max_children
+        self.compact = compact
+        self.clusters: list[TemplateCluster] = []
+        self._tree: dict = {}
+        self._templates_metric = METRICS.gauge("templates.count")
+
+    def _leaf(self, tokens: list) -> list:
+        """Find (or create) the candidate cluster list for tokens"""
+        node = self._tree.setdefault(len(tokens), {})
+        for token in tokens[:self.depth]:
+            key = WILDCARD if _has_digits(token) else token
+            child = node.get(key)
+            if child is None:
+                if len(node) >= self.max_children:
+                    key = WILDCARD
+                    child = node.get(key)
+                if child is None:
+                    child = node[key] = {}
+            node = child
+        return node.setdefault(None, [])
+
+    def match(self, text: str) -> tuple[TemplateCluster, Template, list, bool]:
+        """Assign text to a cluster
+
+        Returns the cluster, the template version the text was parsed
+        against, the parameter values and whether the template changed.
+        """
+        tokens = text.split(" ")
+        leaf = self._leaf(tokens)
+
+        best: Optional[TemplateCluster] = None
+        best_similarity = -1.0
+        for cluster in leaf:
+            similarity = cluster.similarity(tokens)
+            if similarity > best_similarity:
+                best, best_similarity = cluster, similarity
+
+        if best is None or best_similarity < self.similarity:
+            # Interned so clusters sharing words don't each keep a copy
+            best = TemplateCluster(len(self.clusters),
+                                   tuple(map(sys.intern, tokens)))
+            self.clusters.append(best)
+            leaf.append(best)
+            self._templates_metric.set(len(self.clusters))
+            template, changed = best.template, True
+        else:
+            previous = best.template
+            template = best.merge(tokens)
+            changed = template is not previous
+
+        best.count += 1
+        return best, template, template.extract(tokens), changed
+
+    def process(self, messages: list) -> list:
+        """Assign templates to a batch of messages in place"""
+        compact = self.compact
+        for msg in messages:
+            text = msg.msg
+            cluster, template, params, changed = self.match(text)
+            msg.template = cluster
+            # Only pack against versions that already existed, so one-off
+            # intermediate versions are not kept alive by their messages
+            if compact and not changed and PARAM_SEPARATOR not in text:
+                packed = PARAM_SEPARATOR.join(params)
+                if len(packed) < len(text):
+                    msg.set_packed_text(template, packed)
+        return messages
+
+    def get(self, template_id: int) -> Optional[TemplateCluster]:
+        """Look up a cluster by template ID"""
+        if 0 <= template_id < len(self.clusters):
+            return self.clusters[template_id]
+        return None
+
+    def top(self, limit: Optional[int] = None) -> list:
+        """Clusters ordered by message count, most frequent first"""
+        ranked = sorted(self.clusters, key=lambda c: c.count, reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def reset_counts(self):
+        """Zero the per-template counts (e.g. after logs were cleared)"""
+        for cluster in self.clusters:
+            cluster.count = 0
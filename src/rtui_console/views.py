@@ -0,0 +1,272 @@
+"""
+Named filter views for ROS2 Console Viewer
+
+Each view keeps its own filter state and result set. New messages are
+appended to every view they match, so switching views never rescans the
+store; only editing a view's filter rebuilds its result set.
+"""
+from bisect import bisect_left
+import os
+
+import yaml
+
+from .fields import filter_by_fields
+from .fields import parse_query
+from .indexes import parse_timestamp
+from .models import LogLevel
+
+# Views are loaded from and saved to this file unless --views is given
+DEFAULT_VIEWS_FILE = "~/.config/rtui_console/views.yaml"
+
+
+class FilterView:
+    """A named filter and its incrementally maintained result set"""
+
+    def __init__(self, name: str, nodes=None, levels=None, text: str = "",
+                 templates=None, time_from: str = "", time_to: str = "") -> None:
+        self.name = name
+        self.nodes = list(nodes) if nodes else ["ALL"]
+        self.levels = [str(level) for level in levels] if levels else ["ALL"]
+        self.text = text.lower()
+        self.templates = set(templates) if templates else set()
+        self.time_from = time_from
+        self.time_to = time_to
+        self.time_range = (None, None)
+        self.set_time_range(time_from, time_to)
+        self.messages = []
+        # seq -> index in messages
+        self.positions = {}
+        # Bumped on every rebuild; rows dropped from the front since then
+        self.epoch = 0
+        self.trimmed = 0
+
+    @property
+    def text(self) -> str:
+        """Text filter as entered (lowercased)"""
+        return self._text
+
+    @text.setter
+    def text(self, text: str):
+        self._text = text
+        # Substring part and field predicates such as @latency_ms>50
+        self.substring, self.predicates = parse_query(text)
+
+    def set_time_range(self, time_from: str, time_to: str, reference=None):
+        """Set the time range from user-entered strings"""
+        self.time_from = time_from or ""
+        self.time_to = time_to or ""
+        self.time_range = (parse_timestamp(self.time_from, reference),
+                           parse_timestamp(self.time_to, reference))
+
+    def level_values(self) -> list:
+        """Selected levels as ints, empty for all levels"""
+        if not self.levels or "ALL" in self.levels:
+            return []
+        values = []
+        for level_str in self.levels:
+            try:
+                values.append(int(level_str))
+            except (ValueError, TypeError):
+                pass
+        return values
+
+    def select(self, messages: list, time_filtered: bool = False,
+               fields=None) -> list:
+        """Messages matching this view's filters (OR within a filter)
+
+        With ``time_filtered`` the time range is assumed to be applied
+        already (e.g. through the time index). Field predicates use the
+        cached columns of ``fields`` (a FieldStore) when given.
+        """
+        filtered = messages
+        start, end = self.time_range
+        if not time_filtered and (start is not None or end is not None):
+            filtered = [
+                msg for msg in filtered
+                if (start is None or msg.timestamp >= start)
+                and (end is None or msg.timestamp <= end)]
+
+        # Filter by nodes (OR logic)
+        if self.nodes and "ALL" not in self.nodes:
+            nodes = set(self.nodes)
+            filtered = [msg for msg in filtered if msg.name in nodes]
+
+        # Filter by levels (OR logic)
+        level_values = self.level_values()
+        if level_values:
+            filtered = [msg for msg in filtered if msg.level in level_values]
+
+        # Filter by template ID (OR logic)
+        if self.templates:
+            template_ids = self.templates
+            filtered = [
+                msg for msg in filtered
+                if msg.template is not None and msg.template.id in template_ids]
+
+        # Filter by text
+        if self.substring:
+            text = self.substring
+            filtered = [
+                msg for msg in filtered
+                if text in msg.lower_msg or text in msg.name.lower()]
+
+        # Filter by fields (AND logic)
+        if self.predicates:
+            filtered = filter_by_fields(self.predicates, filtered, fields)
+
+        return filtered if filtered is not messages else list(messages)
+
+    def reset(self, messages: list):
+        """Replace the result set"""
+        self.messages = messages
+        self.positions = {msg.seq: i for i, msg in enumerate(messages)}
+        self.epoch += 1
+        self.trimmed = 0
+
+    def extend(self, messages: list, fields=None) -> int:
+        """Append the matching new messages; returns how many matched"""
+        matched = self.select(messages, fields=fields)
+        offset = len(self.messages)
+        self.messages.extend(matched)
+        positions = self.positions
+        for i, msg in enumerate(matched, offset):
+            positions[msg.seq] = i
+        return len(matched)
+
+    def discard_before(self, min_seq: int) -> bool:
+        """Drop results trimmed from the store; returns whether any were"""
+        if not self.messages or self.messages[0].seq >= min_seq:
+            return False
+        # Results are in seq order
+        cut = bisect_left(self.messages, min_seq, key=lambda msg: msg.seq)
+        self.messages = self.messages[cut:]
+        self.positions = {msg.seq: i for i, msg in enumerate(self.messages)}
+        self.trimmed += cut
+        return True
+
+    def clear(self):
+        """Drop the result set"""
+        self.reset([])
+
+    def copy(self, name: str) -> 'FilterView':
+        """New view with the same filters and result set"""
+        view = FilterView(name, self.nodes, self.levels, self.text,
+                          self.templates, self.time_from, self.time_to)
+        view.time_range = self.time_range
+        view.reset(list(self.messages))
+        return view
+
+    def to_dict(self) -> dict:
+        """Filter state for saving
+
+        Template IDs are only meaningful within a session, so the template
+        filter and the result set are not saved.
+        """
+        data = {'name': self.name}
+        if "ALL" not in self.nodes:
+            data['nodes'] = list(self.nodes)
+        if "ALL" not in self.levels:
+            data['levels'] = [int(v) for v in self.level_values()]
+        if self.text:
+            data['text'] = self.text
+        if self.time_from:
+            data['time_from'] = self.time_from
+        if self.time_to:
+            data['time_to'] = self.time_to
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FilterView':
+        """Create a view from saved filter state
+
+        Raises ValueError for fields of the wrong type and unknown levels.
+        Times are kept as entered, like in the time range inputs.
+        """
+        name = data.get('name')
+        if not isinstance(name, (str, int)) or isinstance(name, bool) or name == "":
+            raise ValueError(f"view name must be a string, got {name!r}")
+        name = str(name)
+        nodes = _string_list(name, 'nodes', data.get('nodes'))
+        levels = [_level_value(name, level) for level in
+                  _list(name, 'levels', data.get('levels'))]
+        strings = {}
+        for key in ('text', 'time_from', 'time_to'):
+            value = data.get(key, "")
+            if value is None:
+                value = ""
+            if not isinstance(value, str):
+                raise ValueError(f"view {name!r}: {key} must be a string, "
+                                 f"got {value!r}")
+            strings[key] = value
+        return cls(name=name, nodes=nodes, levels=levels, **strings)
+
+
+def _list(view: str, key: str, value) -> list:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"view {view!r}: {key} must be a list, got {value!r}")
+    return value
+
+
+def _string_list(view: str, key: str, value) -> list:
+    values = _list(view, key, value)
+    for item in values:
+        if not isinstance(item, str):
+            raise ValueError(f"view {view!r}: {key} must be a list of strings, "
+                             f"got {item!r}")
+    return values
+
+
+def _level_value(view: str, level) -> int:
+    """ROS2 level number for a saved level (number or name such as WARN)"""
+    if isinstance(level, str):
+        for value, name in LogLevel.NAMES.items():
+            if name == level.strip().upper():
+                return value
+        if level.strip().isdigit():
+            level = int(level)
+    if (isinstance(level, int) and not isinstance(level, bool)
+            and level in LogLevel.NAMES):
+        return level
+    raise ValueError(f"view {view!r}: unknown level {level!r} "
+                     f"(expected one of {', '.join(LogLevel.NAMES.values())})")
+
+
+def load_views(path: str) -> list:
+    """Load views from a YAML file; a missing file yields no views
+
+    Raises ValueError for malformed YAML or view entries.
+    """
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = yaml.safe_load(f) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"{path}: {e}") from e
+    entries = data.get('views', []) if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: 'views' must be a list")
+    views = []
+    for entry in entries:
+        if not isinstance(entry, dict) or 'name' not in entry:
+            raise ValueError(f"{path}: every view needs a name")
+        try:
+            views.append(FilterView.from_dict(entry))
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from e
+    return views
+
+
+def save_views(path: str, views: list):
+    """Save views to a YAML file"""
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    data = {'views': [view.to_dict() for view in views]}
+    with open(path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, sort_keys=False, allow_unicode=True)
+
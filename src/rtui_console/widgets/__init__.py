@@ -1,18 +1,32 @@
 """
 UI widgets for ROS2 Console Viewer
 """
+from .alert_panel import AlertPanel
+from .compare_panel import ComparePanel
 from .filter_tab_panel import FilterTabPanel
+from .history_panel import HistoryPanel
 from .log_detail import LogDetailPanel
 from .log_level_panel import LogLevelPanel
 from .log_table import LogTablePanel
+from .metrics_panel import MetricsPanel
 from .node_tree import NodeTreePanel
+from .query_panel import QueryPanel
+from .stats_panel import StatsPanel
+from .template_panel import TemplatePanel
 from .text_filter_panel import TextFilterPanel
 
 __all__ = [
+    "AlertPanel",
+    "ComparePanel",
     "FilterTabPanel",
+    "HistoryPanel",
     "NodeTreePanel",
     "LogTablePanel",
     "LogDetailPanel",
     "LogLevelPanel",
+    "MetricsPanel",
+    "QueryPanel",
+    "StatsPanel",
+    "TemplatePanel",
     "TextFilterPanel"
 ]
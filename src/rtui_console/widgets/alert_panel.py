@@ -0,0 +1,137 @@
+"""
+Alert rules and pinned alerts panel widget
+"""
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable
+from textual.widgets import Input
+from textual.widgets import Label
+from textual.widgets import Static
+
+from ..alerts import AlertManager
+from ..events import LogMessageSelected
+from ..models import LogLevel
+
+
+class AlertPanel(Static):
+    """Panel for editing watch patterns and browsing pinned alert hits
+
+    A pattern prefixed with ``!`` also rings the terminal bell. Selecting a
+    rule removes it; selecting a pinned hit shows it in the detail panel.
+    """
+
+    # Number of pinned hits listed, newest first
+    MAX_SHOWN_PINNED = 100
+
+    DEFAULT_CSS = """
+    AlertPanel {
+        padding: 0;
+        width: 100%;
+        height: 100%;
+    }
+
+    AlertPanel > Vertical {
+        height: 100%;
+    }
+
+    AlertPanel #alert_rules {
+        height: 1fr;
+    }
+
+    AlertPanel #alert_pinned {
+        height: 2fr;
+    }
+
+    .header-label {
+        width: 100%;
+        background: $accent;
+        color: $text;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(self, manager: AlertManager, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.manager = manager
+        self.pattern_input = Input(
+            placeholder="Watch pattern (!pattern rings the bell)...",
+            id="alert_pattern")
+        self.rules_table = DataTable(cursor_type="row", id="alert_rules")
+        self.pinned_table = DataTable(cursor_type="row", id="alert_pinned")
+        self.header = Label("🚨 Alerts (Enter on a rule to remove)",
+                            classes="header-label")
+        self._row_rules = []  # rules table row -> pattern
+        self._row_pinned = []  # pinned table row -> LogMessage
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield self.header
+            yield self.pattern_input
+            yield self.rules_table
+            yield self.pinned_table
+
+    def on_mount(self) -> None:
+        self.rules_table.add_columns("Pattern", "Hits", "Bell")
+        self.pinned_table.add_columns("Time", "Pattern", "Node", "Message")
+        self.refresh_alerts()
+
+    def refresh_alerts(self):
+        """Refresh both tables from the manager"""
+        if not self.is_attached:
+            return
+        self._refresh_rules()
+        self._refresh_pinned()
+
+    def _refresh_rules(self):
+        cursor_row = self.rules_table.cursor_row
+        self.rules_table.clear()
+        self._row_rules = []
+        for rule in self.manager.rules:
+            self.rules_table.add_row(rule.pattern.replace("[", "\\["),
+                                     str(rule.hits), "🔔" if rule.bell else "")
+            self._row_rules.append(rule.pattern)
+        if 0 <= cursor_row < len(self._row_rules):
+            self.rules_table.move_cursor(row=cursor_row, animate=False)
+
+    def _refresh_pinned(self):
+        cursor_row = self.pinned_table.cursor_row
+        self.pinned_table.clear()
+        self._row_pinned = []
+        pinned = list(self.manager.pinned)[-self.MAX_SHOWN_PINNED:]
+        for rule, msg in reversed(pinned):
+            level_color = LogLevel.COLORS.get(msg.level, "white")
+            text = msg.msg.replace("[", "\\[")
+            self.pinned_table.add_row(
+                msg.timestamp.strftime("%H:%M:%S"),
+                rule.pattern.replace("[", "\\["),
+                msg.name,
+                f"[{level_color}]{text}[/]",
+            )
+            self._row_pinned.append(msg)
+        if 0 <= cursor_row < len(self._row_pinned):
+            self.pinned_table.move_cursor(row=cursor_row, animate=False)
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Register a new watch pattern"""
+        event.stop()
+        text = event.value.strip()
+        bell = text.startswith("!")
+        if bell:
+            text = text[1:]
+        if self.manager.add(text, bell=bell) is None:
+            self.notify(f"Pattern '{text}' is empty or already watched",
+                        severity="warning")
+            return
+        self.pattern_input.value = ""
+        self._refresh_rules()
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        """Remove a rule or show a pinned hit"""
+        event.stop()
+        if event.data_table is self.rules_table:
+            if 0 <= event.cursor_row < len(self._row_rules):
+                self.manager.remove(self._row_rules[event.cursor_row])
+                self._refresh_rules()
+        elif 0 <= event.cursor_row < len(self._row_pinned):
+            self.post_message(
+                LogMessageSelected(self._row_pinned[event.cursor_row]))
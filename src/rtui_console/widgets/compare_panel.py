@@ -0,0 +1,121 @@
+"""
+Run comparison panel widget
+"""
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable
+from textual.widgets import Label
+from textual.widgets import Static
+
+from ..events import CompareEntrySelected
+from ..models import LogLevel
+
+STATUS_COLORS = {
+    "new": "red",
+    "gone": "blue",
+    "more": "yellow",
+    "less": "cyan",
+    "same": "white",
+}
+
+
+def _escape(text: str) -> str:
+    return text.replace("[", "\\[")
+
+
+class ComparePanel(Static):
+    """Ranked template diff of two runs; Enter shows an entry's rows"""
+
+    # Number of entries listed
+    MAX_ENTRIES = 1000
+
+    DEFAULT_CSS = """
+    ComparePanel {
+        padding: 0;
+        width: 100%;
+        height: 100%;
+    }
+
+    ComparePanel > Vertical {
+        height: 100%;
+    }
+
+    ComparePanel #compare_diff {
+        height: 3fr;
+    }
+
+    ComparePanel #compare_rows {
+        height: 2fr;
+    }
+
+    .header-label {
+        width: 100%;
+        background: $accent;
+        color: $text;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.diff_table = DataTable(id="compare_diff", cursor_type="row")
+        self.rows_table = DataTable(id="compare_rows", cursor_type="row")
+        self.header = Label("⚖ Run comparison", classes="header-label")
+        self.rows_header = Label("Rows (Enter on an entry)", classes="header-label")
+        self.entries = []
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield self.header
+            yield self.diff_table
+            yield self.rows_header
+            yield self.rows_table
+
+    def on_mount(self) -> None:
+        self.diff_table.add_columns(
+            "Status", "Baseline", "Current", "Change", "Level", "Node", "Template")
+        self.rows_table.add_columns("Run", "Time", "Level", "Node", "Message")
+
+    def set_title(self, text: str):
+        """Update the header line"""
+        self.header.update(_escape(text))
+
+    def set_entries(self, entries: list):
+        """Fill the diff table with ranked entries"""
+        self.entries = entries[:self.MAX_ENTRIES]
+        self.diff_table.clear()
+        for entry in self.entries:
+            color = STATUS_COLORS.get(entry.status, "white")
+            if entry.status in ("new", "gone"):
+                change = entry.status
+            else:
+                change = f"x{2 ** entry.change:.2g}"
+            self.diff_table.add_row(
+                f"[{color}]{entry.status}[/{color}]",
+                str(entry.baseline), str(entry.current), change,
+                LogLevel.NAMES.get(entry.level, "UNKNOWN"),
+                _escape(entry.node), _escape(entry.template))
+
+    def show_rows(self, entry, rows: list):
+        """Show (run, message) rows behind an entry"""
+        self.rows_header.update(
+            _escape(f"Rows of {entry.node}: {entry.template}"))
+        self.rows_table.clear()
+        for run, msg in rows:
+            color = LogLevel.COLORS.get(msg.level, "white")
+            level_name = LogLevel.NAMES.get(msg.level, "UNKNOWN")
+            self.rows_table.add_row(
+                run, msg.timestamp.strftime("%H:%M:%S.%f")[:-3],
+                f"[{color}]{level_name}[/{color}]",
+                _escape(msg.name), _escape(msg.msg))
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        """Request the rows of the selected entry"""
+        if event.data_table is not self.diff_table:
+            return
+        event.stop()
+        if 0 <= event.cursor_row < len(self.entries):
+            entry = self.entries[event.cursor_row]
+            self.rows_header.update(_escape(f"Loading rows of {entry.node}: "
+                                            f"{entry.template} ..."))
+            self.post_message(CompareEntrySelected(entry))
@@ -23,7 +23,7 @@ class FilterTabPanel(Static):
 
     .tab-buttons {
         layout: grid;
-        grid-size: 3 1;
+        grid-size: 6 1;
         height: 3;
         width: 100%;
         background: $boost;
@@ -65,12 +65,19 @@ class FilterTabPanel(Static):
         self.node_tree_panel = None
         self.log_level_panel = None
         self.text_filter_panel = None
+        self.template_panel = None
+        self.alert_panel = None
+        self.query_panel = None
 
-    def set_panels(self, node_tree_panel, log_level_panel, text_filter_panel):
+    def set_panels(self, node_tree_panel, log_level_panel, text_filter_panel,
+                   template_panel=None, alert_panel=None, query_panel=None):
         """Set the filter panels"""
         self.node_tree_panel = node_tree_panel
         self.log_level_panel = log_level_panel
         self.text_filter_panel = text_filter_panel
+        self.template_panel = template_panel
+        self.alert_panel = alert_panel
+        self.query_panel = query_panel
 
     def compose(self) -> ComposeResult:
         with Vertical():
@@ -78,11 +85,17 @@ class FilterTabPanel(Static):
                 yield Button("🔧 Nodes", id="tab-btn-nodes", classes="tab-button active")
                 yield Button("📊 Levels", id="tab-btn-levels", classes="tab-button")
                 yield Button("🔍 Text", id="tab-btn-text", classes="tab-button")
+                yield Button("🧩 Templates", id="tab-btn-templates", classes="tab-button")
+                yield Button("🚨 Alerts", id="tab-btn-alerts", classes="tab-button")
+                yield Button("📈 Query", id="tab-btn-query", classes="tab-button")
 
             with Vertical(classes="tab-content"):
                 yield Static(classes="tab-panel active", id="panel-nodes")
                 yield Static(classes="tab-panel", id="panel-levels")
                 yield Static(classes="tab-panel", id="panel-text")
+                yield Static(classes="tab-panel", id="panel-templates")
+                yield Static(classes="tab-panel", id="panel-alerts")
+                yield Static(classes="tab-panel", id="panel-query")
 
     def on_mount(self) -> None:
         """Mount panels after the widget is mounted"""
@@ -92,6 +105,12 @@ class FilterTabPanel(Static):
             self.query_one("#panel-levels").mount(self.log_level_panel)
         if self.text_filter_panel:
             self.query_one("#panel-text").mount(self.text_filter_panel)
+        if self.template_panel:
+            self.query_one("#panel-templates").mount(self.template_panel)
+        if self.alert_panel:
+            self.query_one("#panel-alerts").mount(self.alert_panel)
+        if self.query_panel:
+            self.query_one("#panel-query").mount(self.query_panel)
 
     @on(Button.Pressed, ".tab-button")
     def on_tab_button_pressed(self, event: Button.Pressed) -> None:
@@ -104,6 +123,12 @@ class FilterTabPanel(Static):
             self.switch_to_tab("levels")
         elif button_id == "tab-btn-text":
             self.switch_to_tab("text")
+        elif button_id == "tab-btn-templates":
+            self.switch_to_tab("templates")
+        elif button_id == "tab-btn-alerts":
+            self.switch_to_tab("alerts")
+        elif button_id == "tab-btn-query":
+            self.switch_to_tab("query")
 
     def switch_to_tab(self, tab_name: str):
         """Switch to the specified tab"""
@@ -111,7 +136,8 @@ class FilterTabPanel(Static):
             return
 
         # Update button states
-        for button_id in ["tab-btn-nodes", "tab-btn-levels", "tab-btn-text"]:
+        for button_id in ["tab-btn-nodes", "tab-btn-levels", "tab-btn-text",
+                          "tab-btn-templates", "tab-btn-alerts", "tab-btn-query"]:
             try:
                 button = self.query_one(f"#{button_id}", Button)
                 if button_id == f"tab-btn-{tab_name}":
@@ -125,7 +151,10 @@ class FilterTabPanel(Static):
         panels = {
             "nodes": "panel-nodes",
             "levels": "panel-levels",
-            "text": "panel-text"
+            "text": "panel-text",
+            "templates": "panel-templates",
+            "alerts": "panel-alerts",
+            "query": "panel-query"
         }
 
         for panel_name, panel_id in panels.items():
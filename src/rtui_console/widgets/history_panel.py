@@ -0,0 +1,95 @@
+"""
+History search results panel widget
+"""
+from datetime import datetime
+import os
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable
+from textual.widgets import Label
+from textual.widgets import Static
+
+
+def _escape(text: str) -> str:
+    return text.replace("[", "\\[")
+
+
+class HistoryPanel(Static):
+    """Search hits from log files in timestamp order"""
+
+    # Number of hits listed
+    MAX_ROWS = 5000
+
+    DEFAULT_CSS = """
+    HistoryPanel {
+        padding: 0;
+        width: 100%;
+        height: 100%;
+    }
+
+    HistoryPanel > Vertical {
+        height: 100%;
+    }
+
+    HistoryPanel DataTable {
+        height: 1fr;
+    }
+
+    HistoryPanel #history_detail {
+        height: auto;
+        max-height: 8;
+        padding: 0 1;
+        border-top: solid $primary;
+    }
+
+    .header-label {
+        width: 100%;
+        background: $accent;
+        color: $text;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.table = DataTable(cursor_type="row")
+        self.header = Label("🔎 History search", classes="header-label")
+        self.detail = Static("", id="history_detail")
+        self.hits = []
+        self._shown = None  # hits list in the table
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield self.header
+            yield self.table
+            yield self.detail
+
+    def on_mount(self) -> None:
+        self.table.add_columns("Time", "File", "Line")
+
+    def set_status(self, text: str):
+        """Update the header line"""
+        self.header.update(_escape(f"🔎 {text}"))
+
+    def update_hits(self, hits: list):
+        """Show the first hits; the table is rebuilt only for a new list"""
+        if hits is self._shown:
+            return
+        cursor_row = self.table.cursor_row
+        self._shown = hits
+        self.hits = hits[:self.MAX_ROWS]
+        self.table.clear()
+        for timestamp, path, _offset, line in self.hits:
+            time_str = datetime.fromtimestamp(timestamp).strftime(
+                "%Y-%m-%d %H:%M:%S.%f")[:-3] if timestamp else "-"
+            self.table.add_row(time_str, _escape(os.path.basename(path)),
+                               _escape(line))
+        if 0 <= cursor_row < len(self.hits):
+            self.table.move_cursor(row=cursor_row, animate=False)
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Show the file, offset and full line of the hit under the cursor"""
+        if 0 <= event.cursor_row < len(self.hits):
+            _timestamp, path, offset, line = self.hits[event.cursor_row]
+            self.detail.update(_escape(f"{path} @ byte {offset}\n{line}"))
@@ -2,6 +2,7 @@
 Log detail panel widget
 """
 import re
+from typing import Callable
 from typing import Optional
 
 from textual.widgets import Static
@@ -13,16 +14,32 @@ from ..models import LogMessage
 class LogDetailPanel(Static):
     """Bottom panel showing selected log message details"""
 
+    # Number of folded repeats listed under a collapsed message
+    MAX_SHOWN_REPEATS = 20
+
+    # Messages shown before and after the selected one
+    CONTEXT_SIZE = 5
+
     DEFAULT_CSS = """
     LogDetailPanel {
         height: 30%;
         padding: 1 2;
+        overflow-y: auto;
+    }
+
+    LogDetailPanel.hidden {
+        display: none;
     }
     """
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self.selected_message = None
+        # (message, count, all_nodes) -> (before, after); set by the app
+        self.context_provider: Optional[Callable] = None
+        self.context_all_nodes = False
+        # Set when an update was skipped while the panel was hidden
+        self._render_pending = False
 
     def set_message(self, log_message: LogMessage):
         """Set the message to display details for"""
@@ -45,7 +62,11 @@ class LogDetailPanel(Static):
         return sanitized
 
     def update_display(self):
-        """Update the detail display"""
+        """Update the detail display; deferred while the panel is hidden"""
+        if not self._is_shown():
+            self._render_pending = True
+            return
+        self._render_pending = False
         if self.selected_message is None:
             self.update("Select a log message to view details")
             return
@@ -73,9 +94,70 @@ class LogDetailPanel(Static):
   Function: {safe_function}
   Line: {safe_line}
 """
+        if msg.repeat_count > 1:
+            details += self._format_repeats(msg)
+        details += self._format_context(msg)
         self.update(details)
 
+    def _is_shown(self) -> bool:
+        return self.is_attached and not self.has_class("hidden")
+
+    def toggle(self) -> bool:
+        """Toggle visibility, returning the new state"""
+        self.toggle_class("hidden")
+        visible = not self.has_class("hidden")
+        if visible and self._render_pending:
+            self.update_display()
+        return visible
+
+    def set_context_scope(self, all_nodes: bool):
+        """Show context from all nodes or only the selected message's node"""
+        self.context_all_nodes = all_nodes
+        if self.selected_message is not None:
+            self.update_display()
+
+    def _format_context(self, msg: LogMessage) -> str:
+        """Format the messages around msg"""
+        if self.context_provider is None:
+            return ""
+        all_nodes = self.context_all_nodes
+        before, after = self.context_provider(
+            msg, self.CONTEXT_SIZE, all_nodes)
+        if not before and not after:
+            return ""
+        scope = "all nodes" if all_nodes else "same node"
+        lines = ["", f"[b]Context ({scope}, ±{self.CONTEXT_SIZE}):[/b]"]
+        for marker, context_msg in ([("  ", m) for m in before]
+                                    + [("▶ ", msg)]
+                                    + [("  ", m) for m in after]):
+            level_name = LogLevel.NAMES.get(context_msg.level, "UNKNOWN")
+            level_color = LogLevel.COLORS.get(context_msg.level, "white")
+            node = f"{self._sanitize_text(context_msg.name)}: " if all_nodes else ""
+            lines.append(
+                f"{marker}{context_msg.timestamp.strftime('%H:%M:%S.%f')[:-3]} "
+                f"[{level_color}]{level_name:<5}[/{level_color}] "
+                f"{node}{self._sanitize_text(context_msg.msg)}")
+        return "\n".join(lines) + "\n"
+
+    def _format_repeats(self, msg: LogMessage) -> str:
+        """Format the repeat summary and the most recent repeats"""
+        lines = [
+            "",
+            f"[b]Repeated:[/b] {msg.repeat_count} times "
+            f"({msg.repeat_rate:.1f}/s)",
+            f"  First: {msg.timestamp.isoformat()}",
+            f"  Last:  {msg.last_seen.isoformat()}",
+        ]
+        repeats = list(msg.repeats or [])[-self.MAX_SHOWN_REPEATS:]
+        if repeats:
+            lines.append(f"[b]Latest {len(repeats)} repeats:[/b]")
+            for timestamp, text in reversed(repeats):
+                lines.append(f"  {timestamp.strftime('%H:%M:%S.%f')[:-3]} "
+                             f"{self._sanitize_text(text)}")
+        return "\n".join(lines) + "\n"
+
     def clear_details(self):
         """Clear the details display"""
         self.selected_message = None
+        self._render_pending = False
         self.update("Logs cleared")
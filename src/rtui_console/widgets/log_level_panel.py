@@ -121,3 +121,16 @@ class LogLevelPanel(Static):
 
         # Send updated selection
         self.post_message(LevelFilterChanged(list(self.selected_levels)))
+
+    def set_selection(self, levels):
+        """Reflect a level selection made elsewhere without re-posting it"""
+        selected = set(levels) if levels else {"ALL"}
+        if selected == self.selected_levels:
+            return
+        self.selected_levels = selected
+        all_checkbox = self.query_one("#level_all", Checkbox)
+        with all_checkbox.prevent(Checkbox.Changed):
+            all_checkbox.value = "ALL" in selected
+        for level_value, checkbox in self.level_checkboxes.items():
+            with checkbox.prevent(Checkbox.Changed):
+                checkbox.value = level_value in selected
@@ -1,15 +1,138 @@
 """
 Log table panel widget
 """
+from bisect import bisect_left
+from bisect import bisect_right
+import itertools
 import re
 
+import numpy as np
+from textual import on
 from textual.app import ComposeResult
+from rich.cells import cell_len
+from rich.measure import Measurement
+from rich.text import Text
+from textual.binding import Binding
+from textual.geometry import Region
 from textual.widgets import DataTable
+from textual.widgets import Input
 from textual.widgets import Static
+from textual.widgets import Tab
+from textual.widgets import Tabs
 
+from ..coldstore import ColdStore
+from ..events import FilterViewChanged
 from ..events import LogMessageSelected
+from ..fields import FieldStore
+from ..fields import format_summary
+from ..indexes import NodeIndex
+from ..indexes import parse_timestamp
+from ..indexes import SortedOrder
+from ..indexes import SortKeys
+from ..indexes import TimeIndex
+from ..layout import is_multiline
+from ..layout import LayoutCache
+from ..layout import RowOffsets
+from ..metrics import METRICS
 from ..models import LogLevel
 from ..models import LogMessage
+from ..views import FilterView
+from ..views import load_views
+from ..views import save_views
+
+
+class _HighlightedCell:
+    """Table cell whose match highlighting is computed when it is drawn
+
+    DataTable only renders visible rows, so spans are looked up (and
+    cached by the panel) for those alone; measuring the column width uses
+    the plain text.
+    """
+
+    __slots__ = ("panel", "seq", "field", "text")
+
+    def __init__(self, panel, seq: int, field: str, text: str) -> None:
+        self.panel = panel
+        self.seq = seq
+        self.field = field
+        self.text = text
+
+    def __rich_measure__(self, console, options) -> Measurement:
+        if "\n" in self.text:
+            width = max(cell_len(line) for line in self.text.split("\n"))
+        else:
+            width = cell_len(self.text)
+        return Measurement(width, width)
+
+    def __rich_console__(self, console, options):
+        yield self.panel.highlight_matches(self.seq, self.field, self.text)
+
+
+# Private DataTable members _LogDataTable overrides or reads. These are
+# not public API, so with a Textual that lacks any of them the stock
+# DataTable is used (correct, but O(n) per lookup with multi-line rows).
+_DATATABLE_METHODS = ("_total_row_height", "_get_offsets", "_get_row_region",
+                      "_row_label_column_width", "ordered_rows",
+                      "is_valid_row_index")
+_DATATABLE_STATE = ("_update_count", "_row_locations", "_header_row_key")
+_HAS_DATATABLE_INTERNALS = all(
+    hasattr(DataTable, name) for name in _DATATABLE_METHODS)
+
+
+class _LogDataTable(DataTable):
+    """DataTable that locates rows in a prefix sum of row heights
+
+    DataTable sums the heights of all rows above to place a row and keeps
+    a list entry per line to find the row at a y offset; with multi-line
+    rows both are looked up in RowOffsets in O(log n) instead.
+    """
+
+    _row_offsets = None
+    _row_offsets_key = None
+
+    def _offsets(self) -> RowOffsets:
+        key = (self.row_count, self._update_count)
+        if key != self._row_offsets_key:
+            self._row_offsets = RowOffsets(
+                [row.height for row in self.ordered_rows])
+            self._row_offsets_key = key
+        return self._row_offsets
+
+    @property
+    def _total_row_height(self) -> int:
+        return self._offsets().total
+
+    def _get_offsets(self, y: int):
+        if self.show_header:
+            if y < self.header_height:
+                return self._header_row_key, y
+            y -= self.header_height
+        row, line = self._offsets().locate(y)
+        return self._row_locations.get_key(row), line
+
+    def _get_row_region(self, row_index: int) -> Region:
+        if not self.is_valid_row_index(row_index):
+            return Region(0, 0, 0, 0)
+        row_width = (
+            sum(column.get_render_width(self) for column in self.columns.values())
+            + self._row_label_column_width
+        )
+        offsets = self._offsets()
+        y = offsets.offset(row_index)
+        if self.show_header:
+            y += self.header_height
+        return Region(0, y, max(self.size.width, row_width),
+                      int(offsets.heights[row_index]))
+
+
+def _new_data_table(**kwargs) -> DataTable:
+    """_LogDataTable, or the stock DataTable if Textual's internals differ"""
+    if _HAS_DATATABLE_INTERNALS:
+        table = _LogDataTable(**kwargs)
+        # Instance attributes only exist once the table is constructed
+        if all(hasattr(table, name) for name in _DATATABLE_STATE):
+            return table
+    return DataTable(**kwargs)
 
 
 class LogTablePanel(Static):
@@ -20,98 +143,322 @@ class LogTablePanel(Static):
     MAX_DISPLAY_MESSAGES = 5000
     MAX_MESSAGE_LENGTH = 500
     MESSAGE_TRUNCATE_LENGTH = 497
+    # Lines shown for an expanded message
+    MAX_EXPANDED_LINES = 200
 
     DEFAULT_CSS = """
     LogTablePanel {
         height: 70%;
         border-bottom: inner $primary;
     }
+
+    LogTablePanel > .prompt {
+        dock: top;
+        display: none;
+    }
+
+    LogTablePanel > .prompt.visible {
+        display: block;
+    }
+
+    LogTablePanel > Tabs {
+        dock: top;
+    }
     """
     CSS_PATH = "../css/widgets/log_table.tcss"
 
+    BINDINGS = [
+        Binding("g", "jump_to_time", "Jump to Time", key_display="g"),
+        Binding("e", "next_level", "Next ≥Level", key_display="e"),
+        Binding("E", "previous_level", "Prev ≥Level", show=False),
+        Binding("L", "cycle_jump_level", "Jump Level", show=False),
+        Binding("slash", "search", "Search", key_display="/"),
+        Binding("n", "next_match", "Next Match", show=False),
+        Binding("N", "previous_match", "Prev Match", show=False),
+        Binding("escape", "close_prompt", "Close", show=False),
+        Binding("v", "save_view", "Save View", key_display="v"),
+        Binding("X", "delete_view", "Delete View", show=False),
+        Binding("F", "field_summary", "Field Summary", show=False),
+        Binding("x", "toggle_expand", "Expand Row", key_display="x"),
+        Binding("w", "toggle_expand_all", "Expand All", show=False),
+        Binding("right_square_bracket", "next_view", "Next View", show=False),
+        Binding("left_square_bracket", "previous_view", "Prev View", show=False),
+    ]
+
+    # Thresholds cycled by "L" for the e/E level jumps
+    JUMP_LEVELS = [LogLevel.WARN, LogLevel.ERROR, LogLevel.FATAL]
+
+    # Style of text filter and search hits in the Node and Message cells
+    MATCH_STYLE = "bold black on yellow"
+
+    # Table columns and the sort key of each
+    COLUMN_LABELS = ("Time", "Level", "Node", "Message")
+    SORT_COLUMNS = ("time", "level", "node", "message")
+
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
-        self.table = DataTable(cursor_type="row")
+        self.table = _new_data_table(cursor_type="row")
         self.log_messages = []
-        self.filtered_messages = []
-        self.selected_nodes = ["ALL"]
-        self.selected_levels = ["ALL"]
-        self.filter_text = ""
+        # Named filter views; the first one is the unsaved live view
+        self.views = [FilterView("Live")]
+        self.view = self.views[0]
+        self.views_file = None
+        self.view_tabs = Tabs(Tab("Live", id="view-0"))
+        self._tab_views = {"view-0": self.view}  # tab ID -> view
+        self._tab_ids = itertools.count(1)
+        self.time_index = TimeIndex()
+        self.node_index = NodeIndex()
+        # key=value / JSON fields, parsed when a filter first uses them
+        self.field_store = FieldStore(lambda: self.log_messages)
+        # Click-to-sort; None shows rows newest first in arrival order
+        self.sort_keys = SortKeys()
+        self.sort_column = None
+        self.sort_reverse = False
+        self._sorted = None  # SortedOrder of the active view
+        self._column_keys = []
+        # filtered_messages positions shown in each table row, and inverse
+        self._row_positions = range(0)
+        self._position_rows = None
+        self.jump_input = Input(
+            placeholder="Jump to time (HH:MM:SS.fff or ISO), Enter to jump, Esc to cancel",
+            id="jump_input",
+            classes="prompt"
+        )
+        self.search_input = Input(
+            placeholder="Search (n/N for next/previous match), Esc to cancel",
+            id="search_input",
+            classes="prompt"
+        )
+        self.view_name_input = Input(
+            placeholder="Save current filters as view (name), Esc to cancel",
+            id="view_name_input",
+            classes="prompt"
+        )
+        self.field_input = Input(
+            placeholder="Summarize fields (e.g. latency_ms battery), Esc to cancel",
+            id="field_input",
+            classes="prompt"
+        )
+        self.search_text = ""
+        self.jump_level = LogLevel.ERROR
+        # Match spans per (seq, cell), valid for the current highlight query
+        self._highlight_query = ()
+        self._match_spans = {}
+        # Posting lists over filtered_messages positions, built lazily per
+        # filter generation so ingestion does not pay for them
+        self._filter_generation = 0
+        self._level_postings = None
+        self._level_postings_generation = -1
+        self._search_postings = None
+        self._search_postings_key = None
+        # Sequence IDs of messages shown as multi-line rows, or all
+        # multi-line messages while expand_all is set
+        self.expanded = set()
+        self.expand_all = False
+        # Wrapped lines of expanded messages, for the Message column width
+        self.layout_cache = LayoutCache(self.MAX_EXPANDED_LINES)
         self._saved_scroll_x = 0
         self._selected_log = None  # 選択されたログメッセージを保存
+        self._seq_counter = itertools.count()
+        self._filter_time = METRICS.histogram("filter.apply_seconds")
+        self._render_time = METRICS.histogram("table.update_seconds")
+        self._trimmed = METRICS.counter("store.trimmed")
+        # Trimmed messages, compressed (disabled unless a profile sets a budget)
+        self.cold_store = ColdStore()
+        # Search matches found in cold storage, newest first; while
+        # _history_index >= 0 the search is browsing them
+        self._history_key = None
+        self._history_iter = None
+        self._history_matches = []
+        self._history_index = -1
 
     def compose(self) -> ComposeResult:
+        yield self.view_tabs
+        yield self.jump_input
+        yield self.search_input
+        yield self.view_name_input
+        yield self.field_input
         yield self.table
 
     def on_mount(self) -> None:
-        self.table.add_columns("Time", "Level", "Node", "Message")
+        self._column_keys = self.table.add_columns(*self.COLUMN_LABELS)
         # Set fixed height for the table to prevent scrollbar position changes
         self.table.styles.height = "100%"
 
+    # Filter state of the active view
+    @property
+    def filtered_messages(self) -> list:
+        return self.view.messages
+
+    @property
+    def _filtered_positions(self) -> dict:
+        """seq -> index in filtered_messages"""
+        return self.view.positions
+
+    @property
+    def selected_nodes(self) -> list:
+        return self.view.nodes
+
+    @property
+    def selected_levels(self) -> list:
+        return self.view.levels
+
+    @property
+    def filter_text(self) -> str:
+        return self.view.text
+
+    @property
+    def selected_templates(self) -> set:
+        return self.view.templates
+
+    @property
+    def time_range(self) -> tuple:
+        return self.view.time_range
+
     def add_log_message(self, log_msg: LogMessage):
         """Add a new log message"""
-        self.log_messages.append(log_msg)
+        self.add_log_messages([log_msg])
 
-        # Limit total messages to prevent memory issues
-        if len(self.log_messages) > self.MAX_TOTAL_MESSAGES:
-            self.log_messages = self.log_messages[-(
-                self.MAX_TOTAL_MESSAGES - 1000):]
+    def add_log_messages(self, log_msgs: list):
+        """Add a batch of log messages and refresh the view once
 
-        self.apply_filters()
+        Every view's result set is extended with its matching new messages
+        instead of being recomputed over the whole store.
+        """
+        for log_msg in log_msgs:
+            log_msg.seq = next(self._seq_counter)
+            self.time_index.add(log_msg.timestamp, log_msg.seq)
+        self.log_messages.extend(log_msgs)
+        self.sort_keys.add(log_msgs)
+        self.node_index.add(log_msgs)
+        self.field_store.add(log_msgs)
+
+        with self._filter_time.time():
+            for view in self.views:
+                view.extend(log_msgs, self.field_store)
+
+            # Limit total messages to prevent memory issues; trim in steps
+            # of a tenth so large stores are not sliced on every batch
+            if len(self.log_messages) > self.MAX_TOTAL_MESSAGES:
+                keep = self.MAX_TOTAL_MESSAGES - max(
+                    1000, self.MAX_TOTAL_MESSAGES // 10)
+                self._trimmed.inc(len(self.log_messages) - keep)
+                trimmed = self.log_messages[:-keep]
+                self.cold_store.extend(trimmed)
+                self.log_messages = self.log_messages[-keep:]
+                min_seq = self.log_messages[0].seq
+                self.time_index.discard_before(min_seq)
+                self.sort_keys.discard_before(min_seq)
+                self.node_index.discard_before(min_seq)
+                self.field_store.discard_before(min_seq)
+                for view in self.views:
+                    view.discard_before(min_seq)
+            self._filter_generation += 1
+
+        self.update_table()
 
     def set_node_filter(self, node_names):
         """Set node filter (multiple nodes supported)"""
-        self.selected_nodes = ([node_names] if isinstance(node_names, str)
-                               else list(node_names) if node_names else ["ALL"])
+        self.view.nodes = ([node_names] if isinstance(node_names, str)
+                           else list(node_names) if node_names else ["ALL"])
         self.apply_filters()
 
     def set_level_filter(self, levels):
         """Set level filter (multiple levels supported)"""
-        self.selected_levels = ([levels] if isinstance(levels, str)
-                                else list(levels) if levels else ["ALL"])
+        self.view.levels = ([levels] if isinstance(levels, str)
+                            else list(levels) if levels else ["ALL"])
         self.apply_filters()
 
     def set_text_filter(self, text: str):
         """Set text filter"""
-        self.filter_text = text.lower()
+        self.view.text = text.lower()
+        self.apply_filters()
+
+    def set_template_filter(self, template_ids):
+        """Set template filter (empty means all templates)"""
+        self.view.templates = set(template_ids) if template_ids else set()
+        self.apply_filters()
+
+    def set_time_range(self, start, end):
+        """Set time range filter; start/end are datetimes, strings or None"""
+        reference = self.log_messages[-1].timestamp if self.log_messages else None
+        if not isinstance(start, str):
+            start = start.isoformat() if start else ""
+        if not isinstance(end, str):
+            end = end.isoformat() if end else ""
+        self.view.set_time_range(start, end, reference)
         self.apply_filters()
 
+    def get_message_by_seq(self, seq: int):
+        """Look up a stored message by sequence ID in O(1)"""
+        if not self.log_messages:
+            return None
+        # Sequence IDs are contiguous in the store
+        i = seq - self.log_messages[0].seq
+        if 0 <= i < len(self.log_messages):
+            return self.log_messages[i]
+        return None
+
+    def get_context(self, msg: LogMessage, count: int,
+                    all_nodes: bool = False) -> tuple[list, list]:
+        """Up to count stored messages before and after msg, oldest first,
+        from the same node (or all nodes), ignoring the table filters"""
+        if msg.seq is None or self.get_message_by_seq(msg.seq) is not msg:
+            return [], []
+        if all_nodes:
+            # Sequence IDs are contiguous in the store
+            first = max(msg.seq - count, self.log_messages[0].seq)
+            before = range(first, msg.seq)
+            after = range(msg.seq + 1, msg.seq + 1 + count)
+        else:
+            before, after = self.node_index.neighbors(
+                msg.name, msg.seq, count, count)
+        lookup = self.get_message_by_seq
+        return ([lookup(seq) for seq in before],
+                [m for m in map(lookup, after) if m is not None])
+
+    def aggregate(self, query, template_text=None):
+        """Run an aggregation query over the store or the active view"""
+        from ..aggregate import run_aggregation
+        seqs = None
+        messages = self.log_messages
+        if query.in_view:
+            messages = self.filtered_messages
+            seqs = np.fromiter((m.seq for m in messages), dtype=np.int64,
+                               count=len(messages))
+        # Repeat counts keep growing after a row is stored, so they are
+        # read at query time rather than kept in SortKeys
+        weights = np.fromiter((m.repeat_count for m in messages),
+                              dtype=np.int64, count=len(messages))
+        return run_aggregation(query, self.sort_keys, seqs, template_text,
+                               weights)
+
     def apply_filters(self):
         """Apply all filters to log messages with OR logic for multi-selection"""
-        filtered = self.log_messages.copy()
-
-        # Filter by nodes (OR logic)
-        if self.selected_nodes and "ALL" not in self.selected_nodes:
-            filtered = [
-                msg for msg in filtered if msg.name in self.selected_nodes]
-
-        # Filter by levels (OR logic)
-        if self.selected_levels and "ALL" not in self.selected_levels:
-            level_values = []
-            for level_str in self.selected_levels:
-                try:
-                    level_values.append(int(level_str))
-                except (ValueError, TypeError):
-                    pass
-
-            if level_values:
-                filtered = [
-                    msg for msg in filtered if msg.level in level_values]
-
-        # Filter by text
-        if self.filter_text:
-            filtered = [
-                msg for msg in filtered
-                if self.filter_text in msg.msg.lower() or self.filter_text in msg.name.lower()
-            ]
-
-        self.filtered_messages = filtered
+        with self._filter_time.time():
+            self._apply_filters()
         self.update_table()
 
+    def _apply_filters(self):
+        """Recompute the active view's result set from its filter state"""
+        start, end = self.time_range
+        if start is None and end is None:
+            candidates = self.log_messages
+        else:
+            # Time range: take the matching slice of the time index
+            seqs = sorted(self.time_index.seqs_between(start, end))
+            candidates = [self.get_message_by_seq(seq) for seq in seqs]
+
+        self.view.reset(self.view.select(candidates, time_filtered=True,
+                                         fields=self.field_store))
+        self._filter_generation += 1
+
     def _sanitize_text_for_table(self, text):
         """Sanitize text for safe display in DataTable"""
         if not isinstance(text, str):
             text = str(text)
+        if "\n" in text:
+            text = text.rstrip("\n").replace("\n", " ⏎ ")
 
         # Replace control characters and non-printable characters
         # Keep only printable ASCII and common Unicode characters
@@ -125,28 +472,145 @@ class LogTablePanel(Static):
 
     def update_table(self):
         """Update table display"""
+        with self._render_time.time():
+            self._update_table()
+
+    def _sort_key_array(self, messages: list) -> np.ndarray:
+        """Sort keys of the current sort column for messages"""
+        count = len(messages)
+        if self.sort_column == "message":
+            return np.fromiter((m.lower_msg for m in messages),
+                               dtype=object, count=count)
+        seqs = np.fromiter((m.seq for m in messages), dtype=np.int64,
+                           count=count)
+        return self.sort_keys.keys(self.sort_column, seqs)
+
+    def _display_positions(self):
+        """filtered_messages positions to show, in table row order"""
+        count = len(self.filtered_messages)
+        if self.sort_column is None:
+            # Show latest messages first (reverse order)
+            return range(count - 1,
+                         max(count - self.MAX_DISPLAY_MESSAGES, 0) - 1, -1)
+        if self._sorted is None:
+            self._sorted = SortedOrder(self.sort_column)
+        order = self._sorted.update(self.view, self._sort_key_array)
+        if self.sort_reverse:
+            order = order[::-1]
+        return order[:self.MAX_DISPLAY_MESSAGES].tolist()
+
+    def _row_to_position(self, row: int):
+        """filtered_messages position shown in a table row, or None"""
+        if 0 <= row < len(self._row_positions):
+            return self._row_positions[row]
+        return None
+
+    def _position_to_row(self, position: int):
+        """Table row showing a filtered_messages position, or None"""
+        rows = self._row_positions
+        if isinstance(rows, range):
+            row = rows[0] - position if rows else -1
+            return row if 0 <= row < len(rows) else None
+        if self._position_rows is None:
+            self._position_rows = {p: r for r, p in enumerate(rows)}
+        return self._position_rows.get(position)
+
+    def sort_by(self, column, reverse: bool = False):
+        """Sort the table by a column ("time", "level", "node", "message");
+        None restores the default newest-first arrival order"""
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self._sorted = None
+        if self._column_keys:
+            for label, sort_column, key in zip(
+                    self.COLUMN_LABELS, self.SORT_COLUMNS, self._column_keys):
+                if sort_column == column:
+                    label += " ▼" if reverse else " ▲"
+                self.table.columns[key].label = Text(label)
+            self.table.refresh()
+        self.update_table()
+
+    def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
+        """Cycle ascending, descending and default order for a column"""
+        event.stop()
+        column = self.SORT_COLUMNS[event.column_index]
+        if column != self.sort_column:
+            self.sort_by(column)
+        elif not self.sort_reverse:
+            self.sort_by(column, reverse=True)
+        else:
+            self.sort_by(None)
+
+    def highlight_matches(self, seq: int, field: str, text: str) -> Text:
+        """Cell text with text filter and search hits highlighted"""
+        key = (seq, field)
+        cached = self._match_spans.get(key)
+        if cached is None or cached[0] != text:
+            folded = text.lower()
+            spans = []
+            for term in self._highlight_query:
+                start = folded.find(term)
+                while start != -1:
+                    spans.append((start, start + len(term)))
+                    start = folded.find(term, start + len(term))
+            cached = self._match_spans[key] = (text, spans)
+        result = Text(text, no_wrap=True, end="")
+        for start, end in cached[1]:
+            result.stylize(self.MATCH_STYLE, start, end)
+        return result
+
+    def _update_highlight_query(self) -> tuple:
+        """Current highlight terms; a new query drops the cached spans"""
+        query = tuple(term for term in (self.view.substring, self.search_text)
+                      if term)
+        if (query != self._highlight_query
+                or len(self._match_spans) > 4 * self.MAX_DISPLAY_MESSAGES):
+            self._highlight_query = query
+            self._match_spans = {}
+        return query
+
+    def _update_table(self):
+        """Rebuild the DataTable rows from filtered_messages"""
         # Save current scroll positions
         saved_scroll_x = getattr(self.table, 'scroll_x', 0)
         saved_scroll_y = getattr(self.table, 'scroll_y', 0)
 
         # Clear and rebuild table
         self.table.clear()
+        self._row_positions = self._display_positions()
+        self._position_rows = None
 
-        # Show latest messages first (reverse order)
-        for msg in reversed(self.filtered_messages[-self.MAX_DISPLAY_MESSAGES:]):
+        highlight = self._update_highlight_query()
+        messages = self.filtered_messages
+        for position in self._row_positions:
+            msg = messages[position]
             level_name = LogLevel.NAMES.get(msg.level, "UNKNOWN")
             level_color = LogLevel.COLORS.get(msg.level, "white")
             time_str = msg.timestamp.strftime("%H:%M:%S.%f")[:-3]
 
             # Sanitize text fields for safe display
             safe_node = self._sanitize_text_for_table(msg.name)
-            safe_message = self._sanitize_text_for_table(msg.msg)
+            lines = self._expanded_lines(msg) if (
+                self.expand_all or msg.seq in self.expanded) else None
+            if lines is None:
+                safe_message = self._sanitize_text_for_table(msg.msg)
+            else:
+                safe_message = "\n".join(lines)
+            if msg.repeat_count > 1:
+                safe_message = f"(×{msg.repeat_count}) {safe_message}"
+            if highlight:
+                safe_node = _HighlightedCell(self, msg.seq, "node", safe_node)
+                safe_message = _HighlightedCell(
+                    self, msg.seq, "message", safe_message)
+            elif lines is not None:
+                safe_message = Text(safe_message, no_wrap=True, end="")
 
             self.table.add_row(
                 time_str,
                 f"[{level_color}]{level_name}[/{level_color}]",
                 safe_node,
-                safe_message
+                safe_message,
+                height=1 if lines is None else len(lines)
             )
 
         # Restore scroll positions immediately after table is updated
@@ -159,50 +623,488 @@ class LogTablePanel(Static):
         if self._selected_log is not None:
             self._restore_selected_log_highlight()
 
+    def _message_width(self) -> int:
+        """Cells available to the Message column at the current table width"""
+        columns = self.table.ordered_columns[:-1]
+        used = sum(column.get_render_width(self.table) for column in columns)
+        # Cell padding of the Message column and the vertical scrollbar
+        return max(self.table.size.width - used - 2 * self.table.cell_padding - 2, 20)
+
+    def _expanded_lines(self, msg: LogMessage):
+        """Wrapped lines of a multi-line or long message, None for others"""
+        text = msg.msg
+        if not is_multiline(text) and len(text) <= self.MAX_MESSAGE_LENGTH:
+            return None
+        if not self.layout_cache.width:
+            self.layout_cache.set_width(self._message_width())
+        return self.layout_cache.lines(msg.seq, text)
+
+    def on_resize(self) -> None:
+        """Re-wrap expanded rows for the new width"""
+        self.call_after_refresh(self._rewrap)
+
+    def _rewrap(self):
+        if (self.layout_cache.set_width(self._message_width())
+                and (self.expanded or self.expand_all)):
+            self.update_table()
+
+    def action_toggle_expand(self) -> None:
+        """Expand or collapse the message under the cursor"""
+        position = self._cursor_position()
+        if position is None or position >= len(self.filtered_messages):
+            return
+        msg = self.filtered_messages[position]
+        if msg.seq in self.expanded:
+            self.expanded.discard(msg.seq)
+        elif self._expanded_lines(msg) is None:
+            self.notify("Message fits on one row", timeout=2)
+            return
+        else:
+            self.expanded.add(msg.seq)
+        self.update_table()
+        self._move_cursor_to_position(position)
+
+    def action_toggle_expand_all(self) -> None:
+        """Expand or collapse all multi-line and long messages"""
+        position = self._cursor_position()
+        self.expand_all = not self.expand_all
+        if not self.expand_all:
+            self.expanded.clear()
+        self.notify("Expand all: on" if self.expand_all else "Expand all: off",
+                    timeout=2)
+        self.update_table()
+        if position is not None:
+            self._move_cursor_to_position(position)
+
     def _restore_selected_log_highlight(self):
         """選択されたログのハイライトを復元"""
         if self._selected_log is None:
             return
 
-        # フィルタされたメッセージから選択されたログを探す
-        for i, msg in enumerate(self.filtered_messages):
-            if (msg.timestamp == self._selected_log.timestamp and
-                msg.level == self._selected_log.level and
-                msg.name == self._selected_log.name and
-                    msg.msg == self._selected_log.msg):
-                # テーブルの行インデックスを計算（逆順なので）
-                table_row = len(self.filtered_messages) - 1 - i
-                if 0 <= table_row < len(self.filtered_messages):
-                    # move_cursorメソッドを使用してカーソルを移動
-                    self.table.move_cursor(row=table_row, animate=False)
-                break
+        i = self._filtered_positions.get(self._selected_log.seq)
+        if i is None:
+            return
+
+        # テーブルの行インデックスを計算
+        table_row = self._position_to_row(i)
+        if table_row is not None and table_row < self.table.row_count:
+            # move_cursorメソッドを使用してカーソルを移動
+            self.table.move_cursor(row=table_row, animate=False)
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle row selection"""
-        if event.cursor_row < len(self.filtered_messages):
-            # Get the message (accounting for reverse order)
-            msg_index = len(self.filtered_messages) - 1 - event.cursor_row
-            if 0 <= msg_index < len(self.filtered_messages):
-                selected_msg = self.filtered_messages[msg_index]
-
-                # 同じログが既に選択されている場合は選択を解除
-                if (self._selected_log is not None and
-                    self._selected_log.timestamp == selected_msg.timestamp and
-                    self._selected_log.level == selected_msg.level and
-                    self._selected_log.name == selected_msg.name and
-                        self._selected_log.msg == selected_msg.msg):
-                    # 選択状態を解除
-                    self._selected_log = None
-                    self.post_message(LogMessageSelected(None))
-                else:
-                    # 新しいログを選択
-                    self._selected_log = selected_msg
-                    self.post_message(LogMessageSelected(selected_msg))
+        # Get the message (accounting for row order)
+        msg_index = self._row_to_position(event.cursor_row)
+        if msg_index is None or msg_index >= len(self.filtered_messages):
+            return
+        selected_msg = self.filtered_messages[msg_index]
+
+        # 同じログが既に選択されている場合は選択を解除
+        if (self._selected_log is not None and
+                self._selected_log.seq == selected_msg.seq):
+            # 選択状態を解除
+            self._selected_log = None
+            self.post_message(LogMessageSelected(None))
+        else:
+            # 新しいログを選択
+            self._selected_log = selected_msg
+            self.post_message(LogMessageSelected(selected_msg))
+
+    def action_jump_to_time(self) -> None:
+        """Show the jump-to-time prompt"""
+        self.jump_input.add_class("visible")
+        self.jump_input.focus()
+
+    def action_close_prompt(self) -> None:
+        """Hide the jump-to-time, search, view name and field prompts"""
+        self.jump_input.remove_class("visible")
+        self.search_input.remove_class("visible")
+        self.view_name_input.remove_class("visible")
+        self.field_input.remove_class("visible")
+        self.table.focus()
+
+    @on(Input.Submitted, "#jump_input")
+    def on_jump_input_submitted(self, event: Input.Submitted) -> None:
+        """Jump to the time entered in the prompt"""
+        event.stop()
+        reference = self.log_messages[-1].timestamp if self.log_messages else None
+        timestamp = parse_timestamp(event.value, reference)
+        if timestamp is None:
+            self.notify(f"Invalid time: {event.value}", severity="error")
+            return
+        self.action_close_prompt()
+        if not self.jump_to_time(timestamp):
+            self.notify("No visible message near that time", severity="warning")
+
+    def jump_to_time(self, timestamp) -> bool:
+        """Move the cursor to the first visible message at or after timestamp
+
+        Falls back to the last visible message before it.
+        """
+        index = self.time_index
+        positions = self._filtered_positions
+        start = index.seek(timestamp)
+
+        target = None
+        for p in range(start, len(index)):
+            target = positions.get(index.seq_at(p))
+            if target is not None:
+                break
+        if target is None:
+            for p in range(start - 1, -1, -1):
+                target = positions.get(index.seq_at(p))
+                if target is not None:
+                    break
+        if target is None:
+            return False
+
+        return self._move_cursor_to_position(target)
+
+    def _move_cursor_to_position(self, position: int) -> bool:
+        """Move the cursor to a filtered_messages position"""
+        table_row = self._position_to_row(position)
+        if table_row is None or table_row >= self.table.row_count:
+            return False
+        self.table.move_cursor(row=table_row, animate=False)
+        return True
+
+    def _cursor_position(self):
+        """filtered_messages position under the cursor, or None"""
+        return self._row_to_position(self.table.cursor_row)
+
+    def _get_level_postings(self) -> dict:
+        """Sorted filtered positions per level for the current filter generation"""
+        if self._level_postings_generation != self._filter_generation:
+            postings = {}
+            for i, msg in enumerate(self.filtered_messages):
+                postings.setdefault(msg.level, []).append(i)
+            self._level_postings = postings
+            self._level_postings_generation = self._filter_generation
+        return self._level_postings
+
+    def _get_search_postings(self) -> list:
+        """Sorted filtered positions matching the search text"""
+        key = (self._filter_generation, self.search_text)
+        if self._search_postings_key != key:
+            query = self.search_text
+            self._search_postings = [
+                i for i, msg in enumerate(self.filtered_messages)
+                if query in msg.lower_msg or query in msg.name.lower()
+            ]
+            self._search_postings_key = key
+        return self._search_postings
+
+    @staticmethod
+    def _neighbor(postings: list, position: int, older: bool):
+        """Nearest posting strictly older (lower) or newer (higher) than position"""
+        if older:
+            i = bisect_left(postings, position) - 1
+            return postings[i] if i >= 0 else None
+        i = bisect_right(postings, position)
+        return postings[i] if i < len(postings) else None
+
+    def jump_to_level(self, older: bool = True) -> bool:
+        """Move the cursor to the nearest message at or above jump_level
+
+        Older messages are further down the table (newest first).
+        """
+        position = self._cursor_position()
+        if position is None:
+            return False
+        candidates = [
+            self._neighbor(postings, position, older)
+            for level, postings in self._get_level_postings().items()
+            if level >= self.jump_level
+        ]
+        candidates = [c for c in candidates if c is not None]
+        if not candidates:
+            return False
+        target = max(candidates) if older else min(candidates)
+        return self._move_cursor_to_position(target)
+
+    def jump_to_match(self, older: bool = True) -> bool:
+        """Move the cursor to the nearest message matching the search text"""
+        position = self._cursor_position()
+        if not self.search_text or position is None:
+            return False
+        target = self._neighbor(self._get_search_postings(), position, older)
+        if target is None:
+            return False
+        return self._move_cursor_to_position(target)
+
+    def action_next_level(self) -> None:
+        """Jump down to the next message at or above the jump level"""
+        if not self.jump_to_level(older=True):
+            self._notify_no_level_hit()
+
+    def action_previous_level(self) -> None:
+        """Jump up to the previous message at or above the jump level"""
+        if not self.jump_to_level(older=False):
+            self._notify_no_level_hit()
+
+    def _notify_no_level_hit(self):
+        level_name = LogLevel.NAMES.get(self.jump_level, "UNKNOWN")
+        self.notify(f"No more {level_name}+ messages", timeout=2)
+
+    def action_cycle_jump_level(self) -> None:
+        """Cycle the level threshold used by e/E"""
+        levels = self.JUMP_LEVELS
+        i = levels.index(self.jump_level) if self.jump_level in levels else -1
+        self.jump_level = levels[(i + 1) % len(levels)]
+        level_name = LogLevel.NAMES.get(self.jump_level, "UNKNOWN")
+        self.notify(f"Jump level: {level_name}+", timeout=2)
+
+    def action_search(self) -> None:
+        """Show the search prompt"""
+        self.search_input.add_class("visible")
+        self.search_input.focus()
+
+    @on(Input.Submitted, "#search_input")
+    def on_search_input_submitted(self, event: Input.Submitted) -> None:
+        """Set the search text and jump to the first match"""
+        event.stop()
+        self.search_text = event.value.lower()
+        self.action_close_prompt()
+        self.update_table()
+        if self.search_text and not self.jump_to_match(older=True):
+            self.notify("No more matches", timeout=2)
+
+    def action_next_match(self) -> None:
+        """Jump down to the next search match, continuing into cold storage"""
+        if self._browsing_history() or not self.jump_to_match(older=True):
+            if not self._history_match(self._history_index + 1):
+                self.notify("No more matches", timeout=2)
+
+    def action_previous_match(self) -> None:
+        """Jump up to the previous search match"""
+        if self._browsing_history():
+            if self._history_index > 0:
+                self._history_match(self._history_index - 1)
+            else:
+                self._history_index = -1
+                self.notify("Back to the live table", timeout=2)
+            return
+        if not self.jump_to_match(older=False):
+            self.notify("No more matches", timeout=2)
+
+    def _browsing_history(self) -> bool:
+        """Whether n/N are stepping through cold storage matches"""
+        key = (id(self.view), self.view.epoch, self.search_text)
+        if key != self._history_key:
+            self._history_key = key
+            self._history_iter = None
+            self._history_matches = []
+            self._history_index = -1
+        return self._history_index >= 0
+
+    def _history_match(self, index: int) -> bool:
+        """Show the index-th newest cold storage match in the detail panel"""
+        if not self.search_text or not self.cold_store.enabled:
+            return False
+        self._browsing_history()
+        if self._history_iter is None:
+            self._history_iter = self.cold_store.search(self.view, self.search_text)
+        while len(self._history_matches) <= index:
+            msg = next(self._history_iter, None)
+            if msg is None:
+                return False
+            self._history_matches.append(msg)
+        self._history_index = index
+        msg = self._history_matches[index]
+        self.post_message(LogMessageSelected(msg))
+        self.notify(f"History match {index + 1}: "
+                    f"{msg.timestamp.strftime('%H:%M:%S')} {msg.name}",
+                    timeout=2)
+        return True
+
+    def history_messages(self) -> list:
+        """Messages of the active view in cold storage, oldest first"""
+        return list(self.cold_store.select(self.view))
+
+    def action_field_summary(self) -> None:
+        """Show the field summary prompt, prefilled with the filter's fields"""
+        if not self.field_input.value:
+            self.field_input.value = " ".join(
+                dict.fromkeys(p.field for p in self.view.predicates))
+        self.field_input.add_class("visible")
+        self.field_input.focus()
+
+    @on(Input.Submitted, "#field_input")
+    def on_field_input_submitted(self, event: Input.Submitted) -> None:
+        """Summarize the named fields over the current result set"""
+        event.stop()
+        self.action_close_prompt()
+        fields = event.value.replace(",", " ").split()
+        if not fields:
+            return
+        summaries = [
+            format_summary(self.field_store.summary(field, self.filtered_messages))
+            for field in fields]
+        self.notify("\n\n".join(summaries), title="Field summary",
+                    timeout=15, markup=False)
+
+    def load_views(self, path: str):
+        """Add the views saved in a YAML file as tabs; later saves go there"""
+        self.views_file = path
+        try:
+            views = load_views(path)
+        except (OSError, ValueError) as e:
+            self.notify(f"Error loading views: {e}", severity="error")
+            return
+        for view in views:
+            self._add_view(view)
+
+    def _save_views(self):
+        """Write the named views (all but the live view) to the views file"""
+        if not self.views_file:
+            return
+        try:
+            save_views(self.views_file, self.views[1:])
+        except OSError as e:
+            self.notify(f"Error saving views: {e}", severity="error")
+
+    def _add_view(self, view: FilterView):
+        """Add a view and its tab, filling its result set from the store
+
+        Returns an awaitable that completes once the tab is mounted.
+        """
+        if not view.messages and self.log_messages:
+            view.reset(view.select(self.log_messages, fields=self.field_store))
+        tab_id = f"view-{next(self._tab_ids)}"
+        self._tab_views[tab_id] = view
+        self.views.append(view)
+        return self.view_tabs.add_tab(Tab(view.name, id=tab_id))
+
+    def _tab_id(self, view: FilterView) -> str:
+        for tab_id, tab_view in self._tab_views.items():
+            if tab_view is view:
+                return tab_id
+        return "view-0"
+
+    def switch_view(self, view: FilterView):
+        """Show a view's result set without refiltering"""
+        if view is self.view:
+            return
+        self.view = view
+        self._sorted = None
+        self._filter_generation += 1
+        tab_id = self._tab_id(view)
+        try:
+            self.view_tabs.active = tab_id
+        except ValueError:
+            # The tab is still being mounted
+            self.call_after_refresh(setattr, self.view_tabs, "active", tab_id)
+        self.update_table()
+        self.post_message(FilterViewChanged(view))
+
+    def restore_filters(self, view_name: str, filters: dict):
+        """Apply saved filter state to the named view (the live view if it
+        no longer exists) and show it"""
+        view = next((v for v in self.views if v.name == view_name),
+                    self.views[0])
+        saved = FilterView.from_dict({**filters, 'name': view.name})
+        view.nodes = saved.nodes
+        view.levels = saved.levels
+        view.text = saved.text
+        reference = self.log_messages[-1].timestamp if self.log_messages else None
+        view.set_time_range(saved.time_from, saved.time_to, reference)
+        self.switch_view(view)
+        self.apply_filters()
+        self.post_message(FilterViewChanged(view))
+
+    @on(Tabs.TabActivated)
+    def on_view_tab_activated(self, event: Tabs.TabActivated) -> None:
+        """Switch to the view of the clicked tab"""
+        event.stop()
+        view = self._tab_views.get(event.tab.id)
+        if view is not None:
+            self.switch_view(view)
+
+    def action_save_view(self) -> None:
+        """Show the view name prompt"""
+        if self.view is not self.views[0]:
+            self.view_name_input.value = self.view.name
+        self.view_name_input.add_class("visible")
+        self.view_name_input.focus()
+
+    @on(Input.Submitted, "#view_name_input")
+    async def on_view_name_input_submitted(self, event: Input.Submitted) -> None:
+        """Save the current filters as a named view, replacing a same-named one"""
+        event.stop()
+        name = event.value.strip()
+        self.view_name_input.value = ""
+        self.action_close_prompt()
+        if not name or name == self.views[0].name:
+            self.notify("Invalid view name", severity="error")
+            return
+        existing = next((v for v in self.views[1:] if v.name == name), None)
+        if existing is self.view:
+            # Filters of the active view were edited in place
+            self._save_views()
+            self.notify(f"View '{name}' saved")
+            return
+        if existing is not None:
+            self._remove_view(existing)
+        view = self.view.copy(name)
+        await self._add_view(view)
+        self.switch_view(view)
+        self._save_views()
+        self.notify(f"View '{name}' saved")
+
+    def _remove_view(self, view: FilterView):
+        tab_id = self._tab_id(view)
+        self.views.remove(view)
+        del self._tab_views[tab_id]
+        self.view_tabs.remove_tab(tab_id)
+
+    def action_delete_view(self) -> None:
+        """Delete the active named view"""
+        view = self.view
+        if view is self.views[0]:
+            self.notify("The live view cannot be deleted", severity="warning")
+            return
+        index = self.views.index(view)
+        self.switch_view(self.views[index - 1])
+        self._remove_view(view)
+        self._save_views()
+        self.notify(f"View '{view.name}' deleted")
+
+    def _cycle_view(self, step: int):
+        index = self.views.index(self.view)
+        self.switch_view(self.views[(index + step) % len(self.views)])
+
+    def action_next_view(self) -> None:
+        """Switch to the next view tab"""
+        self._cycle_view(1)
+
+    def action_previous_view(self) -> None:
+        """Switch to the previous view tab"""
+        self._cycle_view(-1)
+
+    def apply_profile(self, profile):
+        """Use a performance profile's buffer and display limits
+
+        A smaller store is trimmed with the next batch.
+        """
+        self.MAX_TOTAL_MESSAGES = profile.max_total_messages
+        self.MAX_DISPLAY_MESSAGES = profile.max_display_messages
+        self.MAX_MESSAGE_LENGTH = profile.max_message_length
+        self.cold_store.set_max_bytes(int(profile.cold_storage_mb * (1 << 20)))
+        if self.is_attached:
+            self.update_table()
 
     def clear_logs(self):
         """Clear all log messages"""
         self.log_messages.clear()
-        self.filtered_messages.clear()
+        self.time_index.clear()
+        self.sort_keys.clear()
+        self.node_index.clear()
+        self.field_store.clear()
+        self.cold_store.clear()
+        for view in self.views:
+            view.clear()
+        self.expanded.clear()
+        self.layout_cache.clear()
         self._saved_scroll_x = 0  # Reset scroll position when clearing logs
         self._selected_log = None  # Reset selected log when clearing logs
         self.update_table()
@@ -214,3 +1116,7 @@ class LogTablePanel(Static):
     def get_total_count(self) -> int:
         """Get count of total messages"""
         return len(self.log_messages)
+
+    def get_raw_count(self) -> int:
+        """Get count of total messages including collapsed repeats"""
+        return sum(msg.repeat_count for msg in self.log_messages)
@@ -0,0 +1,68 @@
+"""
+Metrics overlay panel widget
+"""
+from textual.widgets import Static
+
+from ..metrics import format_duration
+from ..metrics import Metrics
+
+
+class MetricsPanel(Static):
+    """Footer overlay showing ingestion, filter and render metrics"""
+
+    DEFAULT_CSS = """
+    MetricsPanel {
+        dock: bottom;
+        height: auto;
+        padding: 0 1;
+        background: $boost;
+        border-top: inner $primary;
+        display: none;
+    }
+
+    MetricsPanel.visible {
+        display: block;
+    }
+    """
+
+    def __init__(self, metrics: Metrics, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.metrics = metrics
+
+    def toggle(self) -> bool:
+        """Toggle visibility, returning the new state"""
+        self.toggle_class("visible")
+        visible = self.has_class("visible")
+        if visible:
+            self.refresh_metrics()
+        return visible
+
+    def refresh_metrics(self):
+        """Redraw the panel from the current metric values"""
+        if not self.has_class("visible"):
+            return
+
+        m = self.metrics
+        received = m.counter("ingest.received").value
+        dropped = m.counter("ingest.dropped").value
+        processed = m.counter("ingest.processed").value
+        collapsed = m.counter("ingest.collapsed").value
+        queue_depth = m.gauge("ingest.queue_depth")
+        filter_hist = m.histogram("filter.apply_seconds")
+        table_hist = m.histogram("table.update_seconds")
+
+        cold_messages = m.gauge("store.cold_messages").value
+        cold_bytes = m.gauge("store.cold_bytes").value
+        drop_color = "red" if dropped else "green"
+        self.update(
+            f"[b]Ingest[/b] {m.rates.get('ingest.received', 0.0):.0f} msg/s "
+            f"recv={received} proc={processed} fold={collapsed} "
+            f"[{drop_color}]drop={dropped}[/{drop_color}] "
+            f"queue={queue_depth.value} (max {queue_depth.max_value})  "
+            f"[b]Filter[/b] p50={format_duration(filter_hist.percentile(50))} "
+            f"p99={format_duration(filter_hist.percentile(99))}  "
+            f"[b]Render[/b] p50={format_duration(table_hist.percentile(50))} "
+            f"p99={format_duration(table_hist.percentile(99))}"
+            + (f"  [b]Cold[/b] {cold_messages} msgs "
+               f"{cold_bytes / (1 << 20):.1f} MB" if cold_messages else "")
+        )
@@ -102,7 +102,8 @@ class NodeTreePanel(Static):
 
             # Keep full node name for horizontal scrolling
             display_name = node
-            checkbox = Checkbox(display_name, value=False, id=unique_id)
+            checkbox = Checkbox(display_name, value=node in self.selected_nodes,
+                                id=unique_id)
             checkbox.node_name = node  # Store full node name as attribute
             self.node_checkboxes[node] = checkbox
             container.mount(checkbox)
@@ -155,3 +156,16 @@ class NodeTreePanel(Static):
 
         # Send updated selection
         self.post_message(NodeSelected(list(self.selected_nodes)))
+
+    def set_selection(self, node_names):
+        """Reflect a node selection made elsewhere without re-posting it"""
+        selected = set(node_names) if node_names else {"ALL"}
+        if selected == self.selected_nodes:
+            return
+        self.selected_nodes = selected
+        all_checkbox = self.query_one("#node_all", Checkbox)
+        with all_checkbox.prevent(Checkbox.Changed):
+            all_checkbox.value = "ALL" in selected
+        for node_name, checkbox in self.node_checkboxes.items():
+            with checkbox.prevent(Checkbox.Changed):
+                checkbox.value = node_name in selected
@@ -0,0 +1,97 @@
+"""
+Aggregation query panel widget
+"""
+from textual import on
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable
+from textual.widgets import Input
+from textual.widgets import Label
+from textual.widgets import Static
+
+from ..events import AggregateQuerySubmitted
+from ..events import AggregateRowSelected
+
+
+class QueryPanel(Static):
+    """Aggregation query input and results; selecting a row filters on it"""
+
+    DEFAULT_CSS = """
+    QueryPanel {
+        padding: 0;
+        width: 100%;
+        height: 100%;
+    }
+
+    QueryPanel > Vertical {
+        height: 100%;
+    }
+
+    QueryPanel DataTable {
+        height: 1fr;
+    }
+
+    QueryPanel Input.-invalid {
+        border: tall $error;
+    }
+
+    .header-label {
+        width: 100%;
+        background: $accent;
+        color: $text;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.query_input = Input(
+            placeholder="count by node where level>=WARN last 5m | top 20 template where node=/planner",
+            id="query_input")
+        self.header = Label("📈 Query (Enter to run, select a row to filter)",
+                            classes="header-label")
+        self.table = DataTable(cursor_type="row")
+        self.query_text = ""
+        self._rows = []
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield self.header
+            yield self.query_input
+            yield self.table
+
+    def on_mount(self) -> None:
+        self.table.add_columns("Group", "Count", "Rate/s", "Share")
+
+    @on(Input.Submitted, "#query_input")
+    def on_query_input_submitted(self, event: Input.Submitted) -> None:
+        """Run the entered query"""
+        event.stop()
+        self.query_text = event.value.strip()
+        if self.query_text:
+            self.post_message(AggregateQuerySubmitted(self.query_text))
+
+    def show_result(self, result):
+        """Fill the table with the rows of an aggregation result"""
+        self.query_input.remove_class("-invalid")
+        self.header.update(f"📈 {result.summary()}")
+        cursor_row = self.table.cursor_row
+        self.table.clear()
+        self._rows = result.rows
+        for row in result.rows:
+            self.table.add_row(row.label.replace("[", "\\["), str(row.count),
+                               f"{row.rate:.2f}", f"{row.share:.1%}")
+        if 0 <= cursor_row < len(self._rows):
+            self.table.move_cursor(row=cursor_row, animate=False)
+
+    def show_error(self, message: str):
+        """Show why the query could not run"""
+        self.query_input.add_class("-invalid")
+        self.header.update(f"📈 {message}".replace("[", "\\["))
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        """Filter the log table to the selected group"""
+        event.stop()
+        if 0 <= event.cursor_row < len(self._rows):
+            row = self._rows[event.cursor_row]
+            self.post_message(AggregateRowSelected(row.column, row.value))
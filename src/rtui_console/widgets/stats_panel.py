@@ -0,0 +1,160 @@
+"""
+Per-node statistics panel widget
+"""
+from typing import Optional
+
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable
+from textual.widgets import Label
+from textual.widgets import Sparkline
+from textual.widgets import Static
+
+from ..events import NodeSelected
+from ..ingest import OverloadSampler
+from ..models import LogLevel
+from ..stats import LogStatistics
+
+
+class StatsPanel(Static):
+    """Panel showing per-node counts by level, rates and ERROR/WARN sparklines
+
+    Counts include messages the sampler discarded; the Sampled column
+    shows a node's current 1-in-N rate, or the share kept once sampling
+    has stopped.
+    """
+
+    # Number of busiest nodes listed
+    MAX_NODES = 50
+    # Buckets shown in each sparkline
+    SPARKLINE_BUCKETS = 60
+
+    DEFAULT_CSS = """
+    StatsPanel {
+        width: 35%;
+        height: 100%;
+        padding: 0 1;
+        border-left: inner $primary;
+    }
+
+    StatsPanel.hidden {
+        display: none;
+    }
+
+    StatsPanel > Vertical {
+        height: 100%;
+    }
+
+    StatsPanel Sparkline {
+        height: 1;
+        margin-bottom: 1;
+    }
+
+    StatsPanel #error_sparkline > .sparkline--max-color {
+        color: $error;
+    }
+
+    StatsPanel #warn_sparkline > .sparkline--max-color {
+        color: $warning;
+    }
+
+    StatsPanel DataTable {
+        height: 1fr;
+    }
+    """
+
+    def __init__(self, statistics: LogStatistics,
+                 sampler: Optional[OverloadSampler] = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.statistics = statistics
+        self.sampler = sampler
+        self.sampling_label = Label("", id="sampling_label")
+        self.table = DataTable(cursor_type="row")
+        self.error_label = Label("ERROR/s")
+        self.warn_label = Label("WARN/s")
+        self.error_sparkline = Sparkline([], id="error_sparkline")
+        self.warn_sparkline = Sparkline([], id="warn_sparkline")
+        self._row_nodes = []  # table row -> node name
+        self._selected_node = None
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield self.error_label
+            yield self.error_sparkline
+            yield self.warn_label
+            yield self.warn_sparkline
+            yield self.sampling_label
+            yield self.table
+
+    def on_mount(self) -> None:
+        self.table.add_columns(
+            "Node", "DEBUG", "INFO", "WARN", "ERROR", "FATAL", "Total", "Rate/s", "Sampled")
+
+    def refresh_stats(self):
+        """Redraw from the current statistics"""
+        if not self.is_attached or self.has_class("hidden"):
+            return
+        stats = self.statistics
+        stats.tick()
+
+        errors = stats.level_series(LogLevel.ERROR, self.SPARKLINE_BUCKETS)
+        errors = errors + stats.level_series(LogLevel.FATAL, self.SPARKLINE_BUCKETS)
+        warnings = stats.level_series(LogLevel.WARN, self.SPARKLINE_BUCKETS)
+        seconds = stats.bucket_seconds
+        self.error_sparkline.data = (errors / seconds).tolist()
+        self.warn_sparkline.data = (warnings / seconds).tolist()
+        self.error_label.update(
+            f"[red]ERROR+[/red] {errors[-stats.rate_window:].sum() / (stats.rate_window * seconds):.1f}/s "
+            f"(last {self.SPARKLINE_BUCKETS * seconds:.0f}s)")
+        self.warn_label.update(
+            f"[yellow]WARN[/yellow] {warnings[-stats.rate_window:].sum() / (stats.rate_window * seconds):.1f}/s")
+
+        strides = {}
+        if self.sampler is not None:
+            strides = self.sampler.strides()
+            self.sampling_label.update(f"Ingest: {self.sampler.summary()}")
+
+        cursor_row = self.table.cursor_row
+        self.table.clear()
+        self._row_nodes = []
+        for node, counts, total, rate, discarded in stats.node_rows(self.MAX_NODES):
+            name = node.replace("[", "\\[")
+            if node == self._selected_node:
+                name = f"[b]{name}[/b]"
+            if node in strides:
+                sampled = f"1 in {strides[node]}"
+            elif discarded:
+                sampled = f"{100 * (total - discarded) / total:.0f}% kept"
+            else:
+                sampled = ""
+            self.table.add_row(name, *map(str, counts), str(total), f"{rate:.1f}",
+                               sampled)
+            self._row_nodes.append(node)
+        if 0 <= cursor_row < len(self._row_nodes):
+            self.table.move_cursor(row=cursor_row, animate=False)
+
+    def toggle(self) -> bool:
+        """Toggle visibility, returning the new state"""
+        self.toggle_class("hidden")
+        visible = not self.has_class("hidden")
+        if visible:
+            self.refresh_stats()
+        return visible
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        """Filter the log table to the selected node (again to clear)"""
+        event.stop()
+        if not 0 <= event.cursor_row < len(self._row_nodes):
+            return
+        node = self._row_nodes[event.cursor_row]
+        if node == self._selected_node:
+            self._selected_node = None
+            self.post_message(NodeSelected(["ALL"]))
+        else:
+            self._selected_node = node
+            self.post_message(NodeSelected([node]))
+        self.refresh_stats()
+
+    def clear_selection(self):
+        """Forget the node selected from the stats table"""
+        self._selected_node = None
@@ -0,0 +1,105 @@
+"""
+Template group-by panel widget
+"""
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.widgets import DataTable
+from textual.widgets import Label
+from textual.widgets import Static
+
+from ..events import TemplateFilterChanged
+from ..templates import TemplateMiner
+
+
+class TemplatePanel(Static):
+    """Panel listing mined templates by count; selecting rows filters by template"""
+
+    # Number of templates listed
+    MAX_TEMPLATES = 200
+
+    DEFAULT_CSS = """
+    TemplatePanel {
+        padding: 0;
+        width: 100%;
+        height: 100%;
+    }
+
+    TemplatePanel > Vertical {
+        height: 100%;
+    }
+
+    TemplatePanel DataTable {
+        height: 1fr;
+    }
+
+    .header-label {
+        width: 100%;
+        background: $accent;
+        color: $text;
+        padding: 0 1;
+    }
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.table = DataTable(cursor_type="row")
+        self.header = Label("🧩 Templates (Enter to filter)",
+                            classes="header-label")
+        self.selected_templates = set()
+        self._row_templates = []  # table row -> template ID
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield self.header
+            yield self.table
+
+    def on_mount(self) -> None:
+        self.table.add_columns("", "ID", "Count", "Template")
+
+    def update_templates(self, miner: TemplateMiner):
+        """Refresh the table from the miner's clusters"""
+        if not self.is_attached:
+            return
+        cursor_row = self.table.cursor_row
+        self.table.clear()
+        self._row_templates = []
+        for cluster in miner.top(self.MAX_TEMPLATES):
+            if cluster.count == 0:
+                break
+            mark = "✓" if cluster.id in self.selected_templates else ""
+            self.table.add_row(
+                mark, str(cluster.id), str(cluster.count),
+                cluster.template.text.replace("[", "\\[")
+            )
+            self._row_templates.append(cluster.id)
+        if 0 <= cursor_row < len(self._row_templates):
+            self.table.move_cursor(row=cursor_row, animate=False)
+
+    def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
+        """Toggle the selected template in the filter"""
+        event.stop()
+        if not 0 <= event.cursor_row < len(self._row_templates):
+            return
+        template_id = self._row_templates[event.cursor_row]
+        if template_id in self.selected_templates:
+            self.selected_templates.discard(template_id)
+            mark = ""
+        else:
+            self.selected_templates.add(template_id)
+            mark = "✓"
+        self.table.update_cell_at((event.cursor_row, 0), mark)
+        self.post_message(TemplateFilterChanged(self.selected_templates))
+
+    def set_selection(self, template_ids):
+        """Reflect a template selection made elsewhere without re-posting it"""
+        self.selected_templates = set(template_ids)
+        for row, template_id in enumerate(self._row_templates):
+            mark = "✓" if template_id in self.selected_templates else ""
+            self.table.update_cell_at((row, 0), mark)
+
+    def clear_selection(self):
+        """Drop the template selection"""
+        self.selected_templates.clear()
+        self._row_templates = []
+        if self.is_attached:
+            self.table.clear()
@@ -4,11 +4,14 @@ Text filter panel widget
 from textual import on
 from textual.app import ComposeResult
 from textual.containers import Container
+from textual.containers import Horizontal
 from textual.widgets import Input
 from textual.widgets import Label
 from textual.widgets import Static
 
 from ..events import TextFilterChanged
+from ..events import TimeRangeChanged
+from ..indexes import parse_timestamp
 
 
 class TextFilterPanel(Static):
@@ -35,21 +38,63 @@ class TextFilterPanel(Static):
     Label {
         width: 100%;
     }
+
+    .time-range {
+        height: auto;
+        width: 100%;
+    }
+
+    .time-range Input {
+        width: 1fr;
+    }
+
+    Input.-invalid {
+        border: tall $error;
+    }
     """
 
     def __init__(self, **kwargs) -> None:
         super().__init__(**kwargs)
         self.filter_input = Input(
-            placeholder="Filter by message content or node name...",
+            placeholder="Filter by message content or node name (@latency_ms>50 for fields)...",
             id="text_filter_input"
         )
+        self.time_from_input = Input(
+            placeholder="From (HH:MM:SS.fff)", id="time_from_input")
+        self.time_to_input = Input(
+            placeholder="To (HH:MM:SS.fff)", id="time_to_input")
 
     def compose(self) -> ComposeResult:
         with Container(classes="filter-container"):
             yield Label("🔍 Text Filter", classes="filter-label")
             yield self.filter_input
+            yield Label("⏱ Time Range", classes="filter-label")
+            with Horizontal(classes="time-range"):
+                yield self.time_from_input
+                yield self.time_to_input
 
     @on(Input.Changed, "#text_filter_input")
     def on_filter_input_changed(self, event: Input.Changed) -> None:
         """Handle filter input change"""
         self.post_message(TextFilterChanged(event.value))
+
+    @on(Input.Changed, "#time_from_input, #time_to_input")
+    def on_time_range_input_changed(self, event: Input.Changed) -> None:
+        """Handle time range input change"""
+        value = event.value.strip()
+        valid = not value or parse_timestamp(value) is not None
+        event.input.set_class(not valid, "-invalid")
+        if not valid:
+            return
+        self.post_message(TimeRangeChanged(
+            self.time_from_input.value, self.time_to_input.value))
+
+    def set_filters(self, text: str, time_from: str, time_to: str):
+        """Reflect filters set elsewhere without re-posting them"""
+        for field, value in ((self.filter_input, text),
+                             (self.time_from_input, time_from),
+                             (self.time_to_input, time_to)):
+            if field.value != value:
+                with field.prevent(Input.Changed):
+                    field.value = value
+                field.remove_class("-invalid")
@@ -0,0 +1,28 @@
+"""Shared fixtures"""
+from datetime import datetime
+from datetime import timedelta
+
+import pytest
+
+from rtui_console.models import LogLevel
+from rtui_console.models import LogMessage
+from rtui_console.synthetic import SyntheticLogGenerator
+from rtui_console.templates import TemplateMiner
+
+
+@pytest.fixture
+def sample_messages() -> list:
+    """Synthetic messages plus edge cases: unicode, empty fields, repeats"""
+    messages = SyntheticLogGenerator(seed=2).generate(500)
+    TemplateMiner().process(messages)  # some are packed
+    start = datetime(2026, 1, 1, 12, 0, 0, 123456)
+    messages += [
+        LogMessage(timestamp=start, level=LogLevel.FATAL, name="/ノード",
+                   text="温度 81.5°C 🔥\nsecond line", file="", function="",
+                   line=0),
+        LogMessage(timestamp=start, level=LogLevel.DEBUG, name="/a", text=""),
+    ]
+    repeated = messages[-1]
+    repeated.repeat_count = 3
+    repeated.last_timestamp = start + timedelta(seconds=0.75)
+    return messages
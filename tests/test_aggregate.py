@@ -0,0 +1,58 @@
+"""Tests for aggregation queries"""
+from datetime import datetime
+from datetime import timedelta
+
+import numpy as np
+
+from rtui_console.aggregate import parse_aggregation
+from rtui_console.aggregate import run_aggregation
+from rtui_console.indexes import SortKeys
+from rtui_console.models import LogLevel
+from rtui_console.models import LogMessage
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _store():
+    """A storm folded into one row, and ten nodes logging once each"""
+    messages = [LogMessage(timestamp=T0, level=LogLevel.ERROR, name="/storm",
+                           text="overrun")]
+    messages[0].repeat_count = 5000
+    messages += [LogMessage(timestamp=T0 + timedelta(seconds=1 + i),
+                            level=LogLevel.INFO, name=f"/n{i}", text="ok")
+                 for i in range(10)]
+    for seq, msg in enumerate(messages):
+        msg.seq = seq
+    keys = SortKeys()
+    keys.add(messages)
+    weights = np.array([m.repeat_count for m in messages])
+    return keys, weights
+
+
+def test_counts_include_folded_repeats():
+    keys, weights = _store()
+
+    result = run_aggregation(parse_aggregation("count by node"), keys,
+                             weights=weights)
+
+    assert (result.rows[0].label, result.rows[0].count) == ("/storm", 5000)
+    assert result.matched == result.total == 5010
+    assert result.rows[0].share == 5000 / 5010
+
+
+def test_time_buckets_are_weighted():
+    keys, weights = _store()
+
+    result = run_aggregation(parse_aggregation("by second where level>=ERROR"),
+                             keys, weights=weights)
+
+    assert [row.count for row in result.rows] == [5000]
+
+
+def test_unweighted_counts_rows():
+    keys, _weights = _store()
+
+    result = run_aggregation(parse_aggregation("count by level"), keys)
+
+    assert [(row.label, row.count) for row in result.rows] == [
+        ("INFO", 10), ("ERROR", 1)]
@@ -0,0 +1,28 @@
+"""Tests for the alert automaton"""
+import random
+
+from rtui_console.alerts import AhoCorasick
+
+
+def _naive(patterns, text):
+    text = text.lower()
+    return {i for i, pattern in enumerate(patterns) if pattern in text}
+
+
+def test_matches_naive_substring_search():
+    rng = random.Random(0)
+    alphabet = "abAB c"
+    for _ in range(200):
+        patterns = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 4)))
+                    for _ in range(rng.randint(1, 8))]
+        automaton = AhoCorasick(patterns)
+        for _ in range(20):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            assert automaton.search(text) == _naive(automaton.patterns, text)
+
+
+def test_patterns_are_deduplicated_case_insensitively():
+    automaton = AhoCorasick(["Timeout", "timeout", "", "out"])
+    assert automaton.patterns == ["timeout", "out"]
+    assert automaton.search("Lidar TIMEOUT") == {0, 1}
+    assert automaton.search("no match") == set()
@@ -0,0 +1,39 @@
+"""Tests for the broker client"""
+import queue
+import socket
+import time
+
+from rtui_console.broker import BrokerClient
+from rtui_console.broker import encode_frame
+from rtui_console.broker import FRAME_HELLO
+
+
+def _wait_for_status(client: BrokerClient, prefix: str) -> bool:
+    deadline = time.monotonic() + 5
+    while not client.status.startswith(prefix):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def test_malformed_hello_is_retried(tmp_path):
+    address = str(tmp_path / "broker.sock")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(address)
+    server.listen()
+    server.settimeout(5)
+    client = BrokerClient(queue.Queue(), address, retry_interval=0.2)
+    client.start_subscriber()
+    try:
+        for _ in range(2):
+            conn, _ = server.accept()
+            with conn:
+                conn.sendall(encode_frame(FRAME_HELLO, b"[1, 2]"))
+                assert _wait_for_status(client, "Broker sent a malformed frame")
+        assert client.thread.is_alive()
+    finally:
+        client.stop_subscriber()
+        client.thread.join(timeout=5)
+        server.close()
+    assert not client.thread.is_alive()
@@ -0,0 +1,31 @@
+"""Tests for the batch codec"""
+import struct
+
+import pytest
+
+from rtui_console.codec import decode_messages
+from rtui_console.codec import encode_messages
+
+
+def _fields(messages: list) -> list:
+    return [(m.timestamp, m.level, m.name, m.msg, m.file, m.function, m.line,
+             m.repeat_count, m.last_seen) for m in messages]
+
+
+def test_round_trip(sample_messages):
+    decoded = decode_messages(encode_messages(sample_messages))
+    assert _fields(decoded) == _fields(sample_messages)
+
+
+def test_empty_batch():
+    assert decode_messages(encode_messages([])) == []
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:5],  # shorter than the batch header
+    lambda data: data[:8 + struct.unpack_from("<I", data, 4)[0] + 1],  # truncated records
+    lambda data: struct.pack("<II", 1, 0) + data[8:],  # empty string table
+])
+def test_corrupt_batch_raises_value_error(sample_messages, corrupt):
+    with pytest.raises(ValueError):
+        decode_messages(corrupt(encode_messages(sample_messages)))
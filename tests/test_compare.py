@@ -0,0 +1,35 @@
+"""Tests for run comparison inputs"""
+import json
+import sqlite3
+
+import pytest
+
+from rtui_console.compare import TemplateTable
+from rtui_console.models import LogLevel
+
+
+def test_jsonl_levels_by_name_or_number(tmp_path):
+    path = tmp_path / "run.jsonl"
+    lines = [{'node': "/a", 'message': "lidar timeout 3", 'level': level}
+             for level in (20, "INFO", "warning", "40", "LOUD", None)]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\nnot json\n")
+
+    table = TemplateTable.load(str(path))
+
+    # Unknown levels are skipped like malformed lines
+    assert table.total == 4
+    ((_node, _template, level, _example),) = table.info.values()
+    assert level == LogLevel.ERROR
+
+
+@pytest.mark.parametrize("content", [b"garbage" * 100, None])
+def test_db3_that_is_not_a_bag_raises_value_error(tmp_path, content):
+    path = tmp_path / "run.db3"
+    if content is None:
+        # A valid SQLite file without the rosbag2 tables
+        with sqlite3.connect(path) as connection:
+            connection.execute("CREATE TABLE other (id INTEGER)")
+    else:
+        path.write_bytes(content)
+    with pytest.raises(ValueError, match="run.db3"):
+        TemplateTable.load(str(path))
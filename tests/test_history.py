@@ -0,0 +1,56 @@
+"""Tests for the chunked log file search"""
+import gzip
+
+from rtui_console.history import compile_query
+from rtui_console.history import plan_chunks
+from rtui_console.history import search_chunk
+
+LINES = [
+    b"2026-01-01T12:00:00.000 [WARN] /lidar: timeout 1",
+    b"",
+    b"2026-01-01T12:00:01.000 [INFO] /planner: ok",
+    b"2026-01-01T12:00:02.000 [WARN] /lidar: timeout 2 timeout again",
+    b"x",
+    b"2026-01-01T12:00:03.000 [ERROR] /lidar: TIMEOUT 3",
+    b"2026-01-01T12:00:04.000 [INFO] /lidar: no newline at the end timeout",
+]
+
+
+def _search(path: str, chunk_size: int, pattern) -> tuple[int, list]:
+    matches = 0
+    hits = []
+    for chunk in plan_chunks([path], chunk_size):
+        count, chunk_hits = search_chunk(*chunk, pattern)
+        matches += count
+        hits += chunk_hits
+    return matches, hits
+
+
+def test_lines_across_chunk_edges_count_once(tmp_path):
+    path = str(tmp_path / "run.log")
+    data = b"\n".join(LINES)
+    with open(path, 'wb') as f:
+        f.write(data)
+    pattern = compile_query("timeout")
+    expected = [(data.index(line), line.decode()) for line in LINES
+                if b"timeout" in line.lower()]
+
+    # Every chunk size puts a chunk edge at every byte, including right
+    # after a newline and inside a match
+    for chunk_size in range(1, len(data) + 2):
+        matches, hits = _search(path, chunk_size, pattern)
+        assert matches == len(expected), chunk_size
+        assert [(offset, line) for _ts, _path, offset, line in hits] == expected
+
+
+def test_gzip_is_one_chunk(tmp_path):
+    path = str(tmp_path / "run.log.gz")
+    with gzip.open(path, 'wb') as f:
+        f.write(b"\n".join(LINES) + b"\n")
+
+    chunks = plan_chunks([path], 1)
+    matches, hits = search_chunk(*chunks[0], compile_query("timeout"))
+
+    assert chunks == [(path, 0, -1)]
+    assert matches == 4
+    assert hits[0][0] > 0  # timestamp parsed
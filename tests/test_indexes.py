@@ -0,0 +1,36 @@
+"""Tests for SortedOrder"""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from rtui_console.indexes import SortedOrder
+
+
+def _keys(messages):
+    return np.array([key for key, _arrival in messages], dtype=np.float64)
+
+
+def test_incremental_merge_matches_stable_sort():
+    rng = random.Random(0)
+    view = SimpleNamespace(messages=[], epoch=0, trimmed=0)
+    order = SortedOrder("time")
+    arrival = 0
+    for step in range(300):
+        action = rng.random()
+        if action < 0.6:
+            # Few distinct keys, so stability on ties is exercised
+            for _ in range(rng.randint(0, 20)):
+                view.messages.append((rng.randint(0, 9), arrival))
+                arrival += 1
+        elif action < 0.9:
+            cut = rng.randint(0, len(view.messages))
+            del view.messages[:cut]
+            view.trimmed += cut
+        else:
+            view.epoch += 1
+
+        result = order.update(view, _keys)
+
+        expected = np.argsort(_keys(view.messages), kind="stable")
+        assert result.tolist() == expected.tolist(), step
@@ -0,0 +1,153 @@
+"""Tests for the ingestion stages"""
+from datetime import datetime
+from datetime import timedelta
+import queue
+import random
+from types import SimpleNamespace
+
+from rtui_console import ingest
+from rtui_console.alerts import AlertManager
+from rtui_console.ingest import OverloadSampler
+from rtui_console.ingest import RepeatCollapser
+from rtui_console.metrics import METRICS
+from rtui_console.models import LogLevel
+from rtui_console.models import LogMessage
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _message(seconds, text="lidar timeout 3", name="/lidar",
+             level=LogLevel.WARN):
+    return LogMessage(timestamp=T0 + timedelta(seconds=seconds), level=level,
+                      name=name, text=text)
+
+
+def test_fair_strides_sample_heaviest_nodes_only():
+    arrivals = {"/a": [1000, 0], "/b": [100, 0], "/c": [10, 5]}
+    # 5 WARN+ kept, then 295 shared: /c and /b fit, /a gets the rest
+    assert OverloadSampler._fair_strides(arrivals, 300) == {"/a": 6}
+    assert OverloadSampler._fair_strides(arrivals, 2000) == {}
+    assert OverloadSampler._fair_strides({"/a": [0, 50]}, 10) == {}
+
+
+def test_fair_strides_keep_within_capacity():
+    rng = random.Random(0)
+    for _ in range(200):
+        arrivals = {f"/n{i}": [rng.randint(0, 500), rng.randint(0, 20)]
+                    for i in range(rng.randint(1, 20))}
+        capacity = rng.randint(1, 3000)
+        strides = OverloadSampler._fair_strides(arrivals, capacity)
+        kept = sum(-(-low // strides.get(node, 1)) + high
+                   for node, (low, high) in arrivals.items())
+        high = sum(high for _low, high in arrivals.values())
+        nodes = sum(1 for low, _high in arrivals.values() if low)
+        # At least one DEBUG/INFO per node is kept, and WARN+ always
+        assert kept <= max(capacity, high + nodes) + len(strides)
+        assert all(stride > 1 for stride in strides.values())
+
+
+def test_sampler_accounting_is_exact(monkeypatch):
+    # 1000 messages/s against a budget of 300
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(ingest, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    rng = random.Random(0)
+    log_queue = queue.Queue(maxsize=50)
+    sampler = OverloadSampler(budget=300)
+    sampled = METRICS.counter("ingest.sampled").value
+    dropped = METRICS.counter("ingest.dropped").value
+    kept = {}
+    for _ in range(20000):
+        clock.now += 0.001
+        msg = _message(0, name=f"/n{min(int(rng.expovariate(0.5)), 9)}",
+                       level=rng.choice(list(LogLevel.NAMES)))
+        sampler.offer(log_queue, msg)
+        if rng.random() < 0.3:
+            try:
+                queued = log_queue.get_nowait()
+            except queue.Empty:
+                continue
+            key = (queued.name, queued.level)
+            kept[key] = kept.get(key, 0) + 1
+    while not log_queue.empty():
+        queued = log_queue.get_nowait()
+        key = (queued.name, queued.level)
+        kept[key] = kept.get(key, 0) + 1
+
+    # Both discard paths were taken
+    assert METRICS.counter("ingest.sampled").value > sampled
+    assert METRICS.counter("ingest.dropped").value > dropped
+    for key, received in sampler.received.items():
+        assert received == kept.get(key, 0) + sampler.discarded.get(key, 0), key
+    assert sampler.drain() == sampler.discarded
+    assert sampler.totals() == (20000, sum(kept.values()))
+
+
+def test_alert_matches_are_never_sampled_out(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(ingest, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    alerts = AlertManager(["motor fault"])
+    log_queue = queue.Queue(maxsize=100)
+    sampler = OverloadSampler(budget=100, exempt=alerts.matches)
+    kept = []
+    faults = 0
+    for i in range(10000):
+        clock.now += 0.001
+        text = "motor fault 7" if i % 50 == 0 else f"tick {i}"
+        faults += text.startswith("motor")
+        if sampler.offer(log_queue, _message(0, text, level=LogLevel.INFO)):
+            kept.append(i)
+        if i % 5 == 0:
+            while not log_queue.empty():
+                log_queue.get_nowait()
+
+    assert len(kept) < 5000  # INFO was sampled
+    assert sum(1 for i in kept if i % 50 == 0) == faults
+
+
+def test_collapser_window_is_inclusive():
+    collapser = RepeatCollapser(window=1.0)
+    first, at_edge, past_edge = _message(0), _message(1.0), _message(2.000001)
+
+    assert collapser.process([first, at_edge]) == [first]
+    assert first.repeat_count == 2
+    assert first.last_seen == at_edge.timestamp
+
+    assert collapser.process([past_edge]) == [past_edge]
+    assert past_edge.repeat_count == 1
+
+
+def test_collapser_window_spans_batches():
+    collapser = RepeatCollapser(window=1.0)
+    first = _message(0)
+    assert collapser.process([first]) == [first]
+    # Another key's message moves time on without expiring the group
+    other = _message(0.5, name="/planner")
+    assert collapser.process([other]) == [other]
+    assert collapser.process([_message(0.9)]) == []
+    assert first.repeat_count == 2
+    # Once the window after the last repeat has closed the group is forgotten
+    assert len(collapser.process([_message(2.0, name="/camera")])) == 1
+    late = _message(2.1)
+    assert collapser.process([late]) == [late]
+
+
+def test_collapser_window_slides_with_repeats():
+    collapser = RepeatCollapser(window=1.0)
+    storm = [_message(i * 0.8) for i in range(5)]
+    assert collapser.process(storm) == [storm[0]]
+    assert storm[0].repeat_count == 5
+    assert storm[0].last_seen == storm[-1].timestamp
+
+
+def test_collapser_keys_on_node_level_and_template():
+    collapser = RepeatCollapser(window=1.0)
+    messages = [
+        _message(0, "lidar timeout 3"),
+        _message(0.1, "lidar timeout 7"),  # same template, numbers differ
+        _message(0.2, "lidar timeout 7", level=LogLevel.ERROR),
+        _message(0.3, "lidar timeout 7", name="/camera"),
+        _message(0.4, "lidar restarted"),
+    ]
+    rows = collapser.process(messages)
+    assert rows == [messages[0]] + messages[2:]
+    assert messages[0].repeat_count == 2
@@ -0,0 +1,42 @@
+"""Tests for LogDetailPanel"""
+import asyncio
+
+from textual.app import App
+
+from rtui_console.models import LogMessage
+from rtui_console.widgets import LogDetailPanel
+
+
+class DetailApp(App):
+    def compose(self):
+        yield LogDetailPanel(id="log_detail")
+
+
+def test_hidden_panel_skips_context_lookup():
+    calls = []
+
+    def provider(msg, count, all_nodes):
+        calls.append(msg)
+        return [], []
+
+    async def run():
+        app = DetailApp()
+        async with app.run_test(headless=True) as pilot:
+            panel = app.query_one(LogDetailPanel)
+            panel.context_provider = provider
+            msg = LogMessage(name="/a", text="hello")
+
+            panel.set_message(msg)
+            assert len(calls) == 1
+
+            assert panel.toggle() is False
+            await pilot.pause()
+            panel.set_message(msg)
+            panel.set_context_scope(True)
+            assert len(calls) == 1
+
+            assert panel.toggle() is True
+            await pilot.pause()
+            assert len(calls) == 2
+
+    asyncio.run(run())
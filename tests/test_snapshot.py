@@ -0,0 +1,78 @@
+"""Tests for session snapshots"""
+import json
+import struct
+
+import pytest
+
+from rtui_console.snapshot import MAGIC
+from rtui_console.snapshot import read_snapshot
+from rtui_console.snapshot import SnapshotError
+from rtui_console.snapshot import write_snapshot
+
+
+def _fields(messages: list) -> list:
+    return [(m.timestamp, m.level, m.name, m.msg, m.file, m.function, m.line,
+             m.repeat_count, m.last_seen) for m in messages]
+
+
+def test_round_trip(tmp_path, sample_messages):
+    path = str(tmp_path / "session.snap")
+    filters = {'text': "timeout", 'views': [{'name': "lidar"}]}
+    write_snapshot(path, sample_messages, filters)
+
+    restored, restored_filters = read_snapshot(path)
+
+    assert _fields(restored) == _fields(sample_messages)
+    assert restored_filters == filters
+
+
+def test_limit_reads_newest(tmp_path, sample_messages):
+    path = str(tmp_path / "session.snap")
+    write_snapshot(path, sample_messages)
+
+    restored, _filters = read_snapshot(path, limit=10)
+
+    assert _fields(restored) == _fields(sample_messages[-10:])
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "session.snap"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(path))
+
+
+VALID_HEADER = {'version': 1, 'count': 0, 'nodes': [], 'files': [],
+                'functions': [], 'filters': {}}
+
+
+@pytest.mark.parametrize("header", [
+    [1, 2],
+    {'version': 1},
+    dict(VALID_HEADER, count="3"),
+    dict(VALID_HEADER, count=-1),
+    dict(VALID_HEADER, count=10),  # truncated
+    dict(VALID_HEADER, nodes=None),
+    dict(VALID_HEADER, files=[1]),
+    dict(VALID_HEADER, filters=[]),
+])
+def test_rejects_malformed_headers(tmp_path, header):
+    path = tmp_path / "session.snap"
+    data = json.dumps(header).encode('utf-8')
+    path.write_bytes(MAGIC + struct.pack("<I", len(data)) + data)
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(path))
+
+
+def test_rejects_out_of_range_string_indexes(tmp_path, sample_messages):
+    path = tmp_path / "session.snap"
+    write_snapshot(str(path), sample_messages)
+    data = path.read_bytes()
+    (length,) = struct.unpack_from("<I", data, len(MAGIC))
+    start = len(MAGIC) + 4
+    header = json.loads(data[start:start + length])
+    header['nodes'] = header['nodes'][:1]
+    patched = json.dumps(header).encode('utf-8').ljust(length)
+    path.write_bytes(data[:start] + patched + data[start + length:])
+    with pytest.raises(SnapshotError):
+        read_snapshot(str(path))
@@ -0,0 +1,44 @@
+"""Tests for TemplateMiner"""
+import random
+
+from rtui_console.models import LogMessage
+from rtui_console.synthetic import SyntheticLogGenerator
+from rtui_console.templates import PARAM_SEPARATOR
+from rtui_console.templates import TemplateMiner
+
+
+def test_packed_text_renders_original():
+    messages = []
+    for shape in ("random", "templated"):
+        messages += SyntheticLogGenerator(seed=1, shape=shape).generate(2000)
+    messages += [
+        LogMessage(name="/a", text=text) for text in (
+            "", " ", "two  spaces", "trailing ", " leading",
+            "battery 11.8 v", "battery 11.7 v", "battery 9.1 v",
+            "Motor OK Left", "Motor FAULT Left", "Motor FAULT Right",
+            f"has{PARAM_SEPARATOR}separator 1", f"has{PARAM_SEPARATOR}separator 2",
+        )
+    ]
+    originals = [msg.msg for msg in messages]
+
+    TemplateMiner().process(messages)
+
+    assert any(msg._params is not None for msg in messages)
+    assert [msg.msg for msg in messages] == originals
+    assert [msg.lower_msg for msg in messages] == [t.lower() for t in originals]
+    assert all(msg.template is not None for msg in messages)
+
+
+def test_literal_wildcard_text_renders_original():
+    rng = random.Random(0)
+    messages = [
+        LogMessage(name="/a", text=" ".join(
+            rng.choice(("<*>", "a", "b", "c")) for _ in range(5)))
+        for _ in range(5000)
+    ]
+    originals = [msg.msg for msg in messages]
+
+    TemplateMiner().process(messages)
+
+    assert any(msg._params is not None for msg in messages)
+    assert [msg.msg for msg in messages] == originals
@@ -0,0 +1,51 @@
+"""Tests for filter views files"""
+import pytest
+
+from rtui_console.models import LogLevel
+from rtui_console.views import FilterView
+from rtui_console.views import load_views
+from rtui_console.views import save_views
+
+
+def test_missing_file_has_no_views(tmp_path):
+    assert load_views(str(tmp_path / "views.yaml")) == []
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "views.yaml")
+    view = FilterView("lidar", nodes=["/lidar"], levels={LogLevel.WARN},
+                      text="timeout")
+    save_views(path, [view])
+
+    (loaded,) = load_views(path)
+
+    assert loaded.to_dict() == view.to_dict()
+
+
+def test_levels_by_name_or_number(tmp_path):
+    path = tmp_path / "views.yaml"
+    path.write_text("views:\n  - name: errors\n    levels: [warn, 40, '50']\n")
+
+    (view,) = load_views(str(path))
+
+    assert sorted(view.level_values()) == [LogLevel.WARN, LogLevel.ERROR,
+                                           LogLevel.FATAL]
+
+
+@pytest.mark.parametrize("content", [
+    "views: [name: {",  # YAML syntax error
+    "views: lidar",
+    "views:\n  - nodes: [/lidar]",
+    "views:\n  - name: ''",
+    "views:\n  - name: lidar\n    nodes: /lidar",
+    "views:\n  - name: lidar\n    nodes: [1]",
+    "views:\n  - name: lidar\n    levels: [LOUD]",
+    "views:\n  - name: lidar\n    levels: [33]",
+    "views:\n  - name: lidar\n    text: [timeout]",
+    "views:\n  - name: lidar\n    time_from: {at: 1}",
+])
+def test_malformed_file_raises_value_error(tmp_path, content):
+    path = tmp_path / "views.yaml"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        load_views(str(path))